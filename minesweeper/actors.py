@@ -0,0 +1,217 @@
+"""
+Single writer actors for cooperative boards.
+
+When the `MINESWEEPER_BOARD_ACTORS` setting is enabled every cooperative board
+played in the process has an actor: a thread that
+keeps the board decoded in memory and runs the operations sent by the players
+one by one, so the players do not compete for the database row. The board is
+persisted every `MINESWEEPER_ACTOR_SNAPSHOT_EVERY` operations, every
+`MINESWEEPER_ACTOR_SNAPSHOT_SECONDS` seconds with pending operations, when the
+game finishes and when the actor stops after `MINESWEEPER_ACTOR_IDLE_SECONDS`
+seconds without operations.
+
+The actors keep the board in the memory of a process, so the setting can only
+be enabled when all the requests for a cooperative board are served by the
+same process (for example routing by board id). Otherwise the operations of
+cooperative boards run in the request with the board row locked. The actors
+still running are stopped, and their boards saved, when the process exits.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from . import models
+
+
+logger = logging.getLogger(__name__)
+
+# seconds a caller waits for the result of an operation
+CALL_TIMEOUT = 30
+
+_STOP = object()
+
+
+def enabled() -> bool:
+    "Returns if the operations of cooperative boards are run by actors."
+    return getattr(settings, 'MINESWEEPER_BOARD_ACTORS', False)
+
+
+class ActorStopped(Exception):
+    "The actor stopped before running the operation."
+
+
+class BoardActor:
+    def __init__(self, board_id: int, registry: 'ActorRegistry'):
+        self.board_id = board_id
+        self.registry = registry
+        self.snapshot_every = getattr(settings, 'MINESWEEPER_ACTOR_SNAPSHOT_EVERY', 20)
+        self.snapshot_seconds = getattr(settings, 'MINESWEEPER_ACTOR_SNAPSHOT_SECONDS', 5)
+        self.idle_seconds = getattr(settings, 'MINESWEEPER_ACTOR_IDLE_SECONDS', 60)
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f'board-actor-{board_id}', daemon=True)
+        self._board: Optional[models.Board] = None
+        self._stopped = False
+        self._pending = 0
+        self._last_snapshot = time.monotonic()
+
+    def start(self):
+        self._thread.start()
+
+    def call(self, function: Callable[[models.Board], Any], mutates: bool = False,
+            render: Optional[Callable[[models.Board], Any]] = None) -> Any:
+        """
+        Runs `function` with the board of the actor in the actor thread and
+        returns its result. Use `mutates=True` for operations that modify the
+        board, so the version and the modification date are updated when the
+        operation succeeds. `render`, when given, is called with the updated
+        board and its result is returned instead.
+        """
+        future: Future = Future()
+        with self.registry._lock:
+            if self._stopped:
+                raise ActorStopped(self.board_id)
+            self._queue.put((function, mutates, render, future))
+        return future.result(CALL_TIMEOUT)
+
+    def stop(self):
+        "Persists the pending operations and stops the actor."
+        self._queue.put(_STOP)
+        self._thread.join(CALL_TIMEOUT)
+
+    def snapshot(self):
+        "Saves the in-memory board in the database."
+        board = self._board
+        if board is None or not self._pending:
+            return
+        # the moves are stored with the board, so their numbers follow its move count
+        with transaction.atomic():
+            models.Board.objects.filter(pk=board.pk).update(
+                board_json=models.encode_board_json(board.get_layout()),
+                finished=board.finished,
+                finished_at=board.finished_at,
+                version=board.version,
+                move_count=board.move_count,
+                undo_history=board.undo_history,
+                modified=board.modified,
+            )
+            board.save_moves()
+        self._pending = 0
+        self._last_snapshot = time.monotonic()
+
+    def _handle(self, function, mutates: bool, render, future: Future):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            if self._board is None:
+                self._board = models.Board.objects.get(pk=self.board_id)
+            result = function(self._board)
+            if mutates:
+                # failed operations do not change the version
+                self._board.version += 1
+                self._board.modified = timezone.now()
+                self._pending += 1
+            if render is not None:
+                result = render(self._board)
+            if self._board.finished or self._pending >= self.snapshot_every:
+                self.snapshot()
+        except BaseException as error:
+            future.set_exception(error)
+            return
+        future.set_result(result)
+
+    def _run(self):
+        last_operation = time.monotonic()
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=min(self.snapshot_seconds, self.idle_seconds))
+                except queue.Empty:
+                    if self._pending and time.monotonic() - self._last_snapshot >= self.snapshot_seconds:
+                        self.snapshot()
+                    if time.monotonic() - last_operation >= self.idle_seconds and self.registry._remove(self):
+                        break
+                    continue
+                if item is _STOP:
+                    self.registry._remove(self, force=True)
+                    break
+                close_old_connections()
+                self._handle(*item)
+                last_operation = time.monotonic()
+        except Exception:
+            logger.exception("board actor %s failed", self.board_id)
+            self.registry._remove(self, force=True)
+        finally:
+            try:
+                self.snapshot()
+            finally:
+                # operations queued before a stop request
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not _STOP:
+                        item[-1].set_exception(ActorStopped(self.board_id))
+                connection.close()
+
+
+class ActorRegistry:
+    "Actors of the boards played in the process."
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._actors: Dict[int, BoardActor] = {}
+
+    def get(self, board_id: int) -> Optional[BoardActor]:
+        return self._actors.get(board_id)
+
+    def get_or_create(self, board_id: int) -> BoardActor:
+        with self._lock:
+            actor = self._actors.get(board_id)
+            if actor is None:
+                actor = self._actors[board_id] = BoardActor(board_id, self)
+                actor.start()
+            return actor
+
+    def call(self, board_id: int, function: Callable[[models.Board], Any], mutates: bool = False,
+            render: Optional[Callable[[models.Board], Any]] = None) -> Any:
+        "Runs `function` in the actor of the board, starting the actor if it is not running."
+        while True:
+            try:
+                return self.get_or_create(board_id).call(function, mutates, render)
+            except ActorStopped:
+                # the operation did not run, it is sent to a new actor
+                continue
+
+    def _remove(self, actor: BoardActor, force: bool = False) -> bool:
+        """
+        Removes the actor from the registry. Unless `force` is used the actor
+        is only removed when it has no queued operations. Returns if the actor
+        was removed. Removed actors do not accept operations.
+        """
+        with self._lock:
+            if not force and not actor._queue.empty():
+                return False
+            actor._stopped = True
+            if self._actors.get(actor.board_id) is actor:
+                del self._actors[actor.board_id]
+            return True
+
+    def stop_all(self):
+        "Persists the pending operations of the actors and stops them."
+        actors = list(self._actors.values())
+        # the actors save their boards at the same time
+        for actor in actors:
+            actor._queue.put(_STOP)
+        for actor in actors:
+            actor._thread.join(CALL_TIMEOUT)
+
+
+registry = ActorRegistry()
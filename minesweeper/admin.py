@@ -1,11 +1,94 @@
-import pprint
+import math
+from typing import List
 
-from django.utils.translation import ugettext_lazy as _
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.http import QueryDict, StreamingHttpResponse
+from django.utils.functional import cached_property
+from django.utils.html import format_html, format_html_join
+from django.utils.translation import ugettext_lazy as _
 
+from . import exporting
 from . import models
 
 
+# count of board rows displayed on each page of the board preview
+PREVIEW_PAGE_ROWS = 50
+# boards with more rows or columns are also displayed as a compressed overview
+PREVIEW_OVERVIEW_SIZE = 100
+# tables with more rows use the estimated count of the database statistics
+ESTIMATED_COUNT_THRESHOLD = 100000
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that uses the row estimate of the PostgreSQL statistics for
+    unfiltered querysets of big tables instead of running `COUNT(*)`.
+    """
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        connection = connections[self.object_list.db]
+        if connection.vendor == 'postgresql' and not query.where:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT reltuples FROM pg_class WHERE relname = %s",
+                    [self.object_list.model._meta.db_table])
+                row = cursor.fetchone()
+            if row and row[0] > ESTIMATED_COUNT_THRESHOLD:
+                return int(row[0])
+        return super().count
+
+
+class BoardChangeList(ChangeList):
+    def get_queryset(self, request):
+        # the changelist does not display the layout of the boards.
+        return super().get_queryset(request).defer('board_json')
+
+
+def render_overview(display: List[List[str]], size: int = PREVIEW_OVERVIEW_SIZE) -> str:
+    """
+    Returns a compressed view of the board where each character summarizes a
+    block of cells: `*` a block with a revealed mine, `!` a block where every
+    cell is flagged or marked with a question, `#` other blocks with hidden or
+    marked cells and `.` a block where every cell is revealed.
+    """
+    rows = len(display)
+    columns = len(display[0]) if rows else 0
+    block = max(math.ceil(rows / size), math.ceil(columns / size), 1)
+    lines = []
+    for block_row in range(0, rows, block):
+        line = []
+        for block_col in range(0, columns, block):
+            cells = {value for display_row in display[block_row:block_row + block]
+                for value in display_row[block_col:block_col + block]}
+            if '*' in cells or '**' in cells:
+                line.append('*')
+            elif cells <= {'!', '?'}:
+                line.append('!')
+            elif ' ' in cells or '!' in cells or '?' in cells:
+                line.append('#')
+            else:
+                line.append('.')
+        lines.append(''.join(line))
+    return '\n'.join(lines)
+
+
+PREVIEW_CHARACTERS = {' ': '#', '0': '.', '**': 'X'}
+
+
+def render_page(display: List[List[str]], page: int, page_rows: int = PREVIEW_PAGE_ROWS) -> str:
+    """
+    Returns the rows of the page with one character per cell. Hidden cells are
+    displayed as `#`, cells without adjacent mines as `.` and the exploded mine as `X`.
+    """
+    lines = []
+    for display_row in display[page * page_rows:(page + 1) * page_rows]:
+        lines.append(''.join(PREVIEW_CHARACTERS.get(value, value) for value in display_row))
+    return '\n'.join(lines)
+
+
 @admin.register(models.BoardTemplate)
 class BoardTemplateAdmin(admin.ModelAdmin):
     list_display = ('rows', 'columns', 'mines')
@@ -14,14 +97,158 @@ class BoardTemplateAdmin(admin.ModelAdmin):
 @admin.register(models.Board)
 class BoardAdmin(admin.ModelAdmin):
     list_display = ('rows', 'columns', 'mines', 'finished', 'user', 'created', 'modified')
-    fields = ('rows', 'columns', 'mines', 'get_board_json', 'finished', 'user', 'created', 'modified')
-    readonly_fields = ('get_board_json', 'finished', 'user', 'created', 'modified')
+    list_select_related = ('user',)
+    list_filter = ('finished', 'pending')
+    date_hierarchy = 'created'
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    fields = ('rows', 'columns', 'mines', 'get_board_preview', 'finished', 'user', 'created', 'modified')
+    readonly_fields = ('get_board_preview', 'finished', 'user', 'created', 'modified')
+    actions = ('export_jsonl', 'export_csv')
+
+    def get_changelist(self, request, **kwargs):
+        return BoardChangeList
+
+    def get_object(self, request, object_id, from_field=None):
+        obj = super().get_object(request, object_id, from_field)
+        if obj is not None:
+            try:
+                obj._preview_page = max(int(request.GET.get('preview_page', 0)), 0)
+            except ValueError:
+                obj._preview_page = 0
+            # the paging links keep the other parameters, like the filters of the changelist
+            obj._preview_query = request.GET.copy()
+        return obj
 
     def save_model(self, request, obj, form, change):
         if not change:
             obj.user = request.user
         return super().save_model(request, obj, form, change)
 
-    def get_board_json(self, obj):
-        return pprint.pformat(obj.board_json, indent=4, width=400)
-    get_board_json.short_description = _("Board JSON")
+    def get_board_preview(self, obj):
+        if obj.pk is None:
+            return '-'
+        if obj.pending:
+            # the layout is still being generated by the job of the board
+            return _("Pending")
+        page = getattr(obj, '_preview_page', 0)
+        pages = max(math.ceil(obj.rows / PREVIEW_PAGE_ROWS), 1)
+        page = min(page, pages - 1)
+        query = getattr(obj, '_preview_query', None) or QueryDict()
+        links = []
+        for target, label in [(page - 1, _("Previous")), (page + 1, _("Next"))]:
+            if 0 <= target < pages:
+                link_query = query.copy()
+                link_query['preview_page'] = target
+                links.append(format_html('<a href="?{}">{}</a>', link_query.urlencode(), label))
+        # only the rows of the page are rendered
+        window = obj.display_window(page * PREVIEW_PAGE_ROWS, 0, PREVIEW_PAGE_ROWS, obj.columns)
+        result = format_html('<p>{} {}/{} {}</p><pre>{}</pre>',
+            _("Rows page"), page + 1, pages, format_html_join(' ', '{}', ((link,) for link in links)),
+            render_page(window, 0))
+        if obj.rows > PREVIEW_OVERVIEW_SIZE or obj.columns > PREVIEW_OVERVIEW_SIZE:
+            # the overview summarizes every cell of the board
+            display = obj.display_board()
+            result += format_html('<p>{}</p><pre>{}</pre>', _("Overview"), render_overview(display))
+        return result
+    get_board_preview.short_description = _("Board")
+
+    def _export(self, queryset, format: str):
+        response = StreamingHttpResponse(exporting.export_boards(queryset, format),
+            content_type=exporting.CONTENT_TYPES[format])
+        response['Content-Disposition'] = f'attachment; filename="boards.{format}"'
+        return response
+
+    def export_jsonl(self, request, queryset):
+        return self._export(queryset, 'jsonl')
+    export_jsonl.short_description = _("Export selected boards as JSON lines")
+
+    def export_csv(self, request, queryset):
+        return self._export(queryset, 'csv')
+    export_csv.short_description = _("Export selected boards as CSV")
+
+
+@admin.register(models.ArchivedBoard)
+class ArchivedBoardAdmin(admin.ModelAdmin):
+    list_display = ('board_id', 'rows', 'columns', 'mines', 'won', 'user', 'created', 'modified', 'archived')
+    list_filter = ('won', 'suspicious')
+    list_select_related = ('user',)
+    exclude = ('data', 'history')
+    readonly_fields = ('board_id', 'rows', 'columns', 'mines', 'won', 'user', 'created', 'modified', 'archived',
+        'suspicious', 'analysis')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer('data', 'history')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(models.InfiniteBoard)
+class InfiniteBoardAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'density', 'revealed', 'finished', 'created', 'modified')
+    list_filter = ('finished',)
+    list_select_related = ('user',)
+    readonly_fields = ('user', 'seed', 'chunk_size', 'revealed', 'finished', 'version', 'created', 'modified')
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(models.BoardAnalysis)
+class BoardAnalysisAdmin(admin.ModelAdmin):
+    list_display = ('board', 'suspicious', 'moves', 'duration', 'max_click_rate', 'guesses',
+        'survival_probability', 'analyzed')
+    list_filter = ('suspicious',)
+    raw_id_fields = ('board',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(models.DailyStats)
+class DailyStatsAdmin(admin.ModelAdmin):
+    list_display = ('date', 'user', 'rows', 'columns', 'mines', 'played', 'won', 'seconds')
+    list_filter = ('date',)
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(models.PlayerStats)
+class PlayerStatsAdmin(admin.ModelAdmin):
+    list_display = ('user', 'played', 'won', 'average_seconds', 'current_streak', 'best_streak', 'last_finished')
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+    ordering = ('-played',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(models.Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'user', 'created', 'started', 'finished', 'attempts')
+    list_filter = ('status', 'kind')
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
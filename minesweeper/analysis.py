@@ -0,0 +1,129 @@
+"""
+Detection of implausible games from their move history.
+
+The functions of this module do not use the database, so they can run in the
+worker processes of `anticheat.analyze_finished_boards`. A game is given as a
+dictionary with the size of the board, its layout before the first move
+(encoded with `minesweeper.encode_board`) and its moves as
+(operation, row, column, timestamp) tuples.
+
+Two patterns are flagged:
+
+* click rate: the fastest sequence of `CLICK_WINDOW` moves is faster than a
+  person can play.
+* lucky guesses: reveals of cells that may have a mine according to the
+  solver, using only what the player could see, that never fail. The
+  probability of surviving all of them by chance is too low.
+"""
+from typing import Any, Dict, List, Sequence, Tuple
+
+from . import minesweeper
+from . import solver
+
+
+# count of consecutive moves used to measure the click rate
+CLICK_WINDOW = 10
+
+# reveals with a lower probability of having a mine are not guesses
+GUESS_PROBABILITY = 0.01
+
+# a lucky game needs at least this count of guesses
+MIN_GUESSES = 3
+
+DEFAULT_MAX_CLICK_RATE = 10.0
+DEFAULT_MIN_SURVIVAL = 0.001
+
+Move = Tuple[str, int, int, float]
+
+# value of `models.MoveOperation.REVEAL_CELL`, the models are not imported by the workers
+REVEAL_CELL = 'reveal_cell'
+
+
+def max_click_rate(timestamps: Sequence[float], window: int = CLICK_WINDOW) -> float:
+    "Returns the highest count of moves per second of `window` consecutive moves."
+    window = min(window, len(timestamps))
+    if window < 2:
+        return 0.0
+    shortest = min(timestamps[index + window - 1] - timestamps[index]
+        for index in range(len(timestamps) - window + 1))
+    # the moves of the window can have the same timestamp
+    return (window - 1) / max(shortest, 0.001)
+
+
+def guess_probabilities(rows: int, columns: int, mines: int, layout: str, moves: List[Move],
+        max_steps: int = solver.MAX_STEPS) -> List[float]:
+    """
+    Replays the moves and returns the probability of having a mine of each
+    guessed cell that did not have a mine, at the moment it was revealed. The
+    first reveal of the game is not a guess, every player makes it blind. The
+    reveals whose probabilities take more than `max_steps` steps of the solver
+    are not counted, approximate probabilities could flag safe cells as guesses.
+    """
+    board = minesweeper.Board(rows, columns, mines)
+    board.board = minesweeper.decode_board(layout, rows, columns)
+    started = any(board.is_revealed(row, column) for row in range(rows) for column in range(columns))
+    probabilities = []
+    for operation, row, column, _timestamp in moves:
+        if operation != REVEAL_CELL:
+            board.mark_cell(row, column)
+            continue
+        if not board.is_empty(row, column) and not board.has_bomb(row, column):
+            continue
+        if board.is_type(row, column, minesweeper.CellType.FLAG|minesweeper.CellType.QUESTION):
+            continue
+        probability = 0.0
+        if started:
+            try:
+                cells, default = solver.mine_probabilities(board.get_display_board(), mines, max_steps,
+                    approximate=False)
+            except solver.StepLimitExceeded:
+                pass
+            else:
+                probability = cells.get((row, column), default)
+        started = True
+        try:
+            board.reveal(row, column)
+        except minesweeper.MineExplossionError:
+            # failed guesses end the game, only the survived ones are returned
+            break
+        if probability >= GUESS_PROBABILITY:
+            probabilities.append(probability)
+    return probabilities
+
+
+def analyze_game(game: Dict[str, Any], max_rate: float = DEFAULT_MAX_CLICK_RATE,
+        min_survival: float = DEFAULT_MIN_SURVIVAL) -> Dict[str, Any]:
+    """
+    Returns the fields of `models.BoardAnalysis` for the game.
+
+    Parameters
+    ----------
+    game: dict
+        With the keys `board_id`, `rows`, `columns`, `mines`, `layout` and `moves`.
+    max_rate: float
+        Games with a faster click rate are suspicious.
+    min_survival: float
+        Games whose guesses had a lower probability of surviving are suspicious.
+    """
+    moves = game['moves']
+    timestamps = [move[3] for move in moves]
+    guesses = guess_probabilities(game['rows'], game['columns'], game['mines'], game['layout'], moves)
+    survival = 1.0
+    for probability in guesses:
+        survival *= 1 - probability
+    rate = max_click_rate(timestamps)
+    reasons = []
+    if rate > max_rate:
+        reasons.append('click_rate')
+    if len(guesses) >= MIN_GUESSES and survival < min_survival:
+        reasons.append('lucky_guesses')
+    return {
+        'board_id': game['board_id'],
+        'moves': len(moves),
+        'duration': timestamps[-1] - timestamps[0] if timestamps else 0.0,
+        'max_click_rate': rate,
+        'guesses': len(guesses),
+        'survival_probability': survival,
+        'suspicious': bool(reasons),
+        'reasons': reasons,
+    }
@@ -0,0 +1,117 @@
+"""
+Batch analysis of the move histories of finished boards.
+
+Each run analyzes the boards finished since the last board analyzed by the
+previous run, ordered by finish date and id, so runs are incremental and a run
+that stops is resumed by the next one. The games of each batch are analyzed in
+parallel by a pool of processes with `analysis.analyze_game` and the results are
+written to the board analyses table.
+"""
+import datetime
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import analysis
+from . import models
+
+
+DEFAULT_BATCH_SIZE = 500
+
+# boards finished in this period are left for the next run, so boards saved in
+# transactions that were not committed when the run started are not skipped.
+DEFAULT_DELAY = datetime.timedelta(seconds=60)
+
+
+def load_games(boards: List[tuple]) -> List[Dict]:
+    """
+    Returns the games of the boards with their initial layout and moves, read
+    with two queries. `boards` are (pk, rows, columns, mines, ...) tuples.
+    Boards without moves are skipped.
+    """
+    ids = [board[0] for board in boards]
+    layouts = dict(models.BoardCheckpoint.objects.filter(board_id__in=ids, number=0).values_list(
+        'board_id', 'data'))
+    moves: Dict[int, list] = {}
+    for board_id, operation, row, column, created in models.BoardMove.objects.filter(
+            board_id__in=ids).order_by('board_id', 'number').values_list(
+            'board_id', 'operation', 'row', 'column', 'created'):
+        moves.setdefault(board_id, []).append((operation, row, column, created.timestamp()))
+    return [
+        {'board_id': pk, 'rows': rows, 'columns': columns, 'mines': mines,
+            'layout': layouts[pk], 'moves': moves.get(pk, [])}
+        for pk, rows, columns, mines, *_rest in boards if pk in layouts
+    ]
+
+
+def _save(results: List[Dict]):
+    with transaction.atomic():
+        models.BoardAnalysis.objects.filter(board_id__in=[result['board_id'] for result in results]).delete()
+        models.BoardAnalysis.objects.bulk_create(models.BoardAnalysis(**result) for result in results)
+
+
+def analyze_finished_boards(batch_size: int = DEFAULT_BATCH_SIZE, workers: Optional[int] = None,
+        delay: datetime.timedelta = DEFAULT_DELAY) -> models.AnalysisRun:
+    """
+    Analyzes the boards finished since the previous run and returns the run.
+    Boards without move history and practice boards are skipped.
+
+    Parameters
+    ----------
+    batch_size: int
+        Count of boards read from the database and analyzed at once.
+    workers: int
+        Count of worker processes, the count of CPUs by default. With 0 or 1
+        the games are analyzed in the current process.
+    delay: datetime.timedelta
+        Boards finished in this period before the run are not analyzed.
+    """
+    previous = models.AnalysisRun.objects.order_by('-pk').first()
+    run = models.AnalysisRun.objects.create(
+        last_finished_at=previous.last_finished_at if previous else None,
+        last_board_id=previous.last_board_id if previous else None,
+    )
+    analyze = functools.partial(analysis.analyze_game,
+        max_rate=getattr(settings, 'MINESWEEPER_ANALYSIS_MAX_CLICK_RATE', analysis.DEFAULT_MAX_CLICK_RATE),
+        min_survival=getattr(settings, 'MINESWEEPER_ANALYSIS_MIN_SURVIVAL', analysis.DEFAULT_MIN_SURVIVAL))
+    workers = os.cpu_count() if workers is None else workers
+    executor = None
+    if workers > 1:
+        # the workers do not use the database, they must not share the connections.
+        connections.close_all()
+        executor = ProcessPoolExecutor(workers)
+    # practice boards can undo moves and the moves of cooperative boards merge the clicks of
+    # several players, they are not analyzed
+    queryset = models.Board.objects.filter(finished=True, practice=False, cooperative=False,
+        finished_at__lte=timezone.now() - delay)
+    try:
+        while True:
+            boards = queryset
+            if run.last_finished_at is not None:
+                boards = boards.filter(Q(finished_at__gt=run.last_finished_at)
+                    | Q(finished_at=run.last_finished_at, pk__gt=run.last_board_id))
+            boards = list(boards.order_by('finished_at', 'pk').values_list(
+                'pk', 'rows', 'columns', 'mines', 'finished_at')[:batch_size])
+            if not boards:
+                break
+            games = load_games(boards)
+            if executor is not None:
+                results = list(executor.map(analyze, games, chunksize=max(len(games) // (workers * 4), 1)))
+            else:
+                results = [analyze(game) for game in games]
+            _save(results)
+            run.boards += len(results)
+            run.last_board_id, run.last_finished_at = boards[-1][0], boards[-1][4]
+            run.save(update_fields=['boards', 'last_board_id', 'last_finished_at'])
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    run.completed = timezone.now()
+    run.save(update_fields=['completed'])
+    return run
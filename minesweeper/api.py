@@ -1,15 +1,47 @@
-from django.db.models import query
+import time
+from typing import Dict, Iterator, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.db import transaction
+from django.utils.cache import quote_etag
 from django.utils.decorators import method_decorator
-from requests.api import put
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_headers
 
 from rest_framework.serializers import ModelSerializer
-from rest_framework import generics
+from rest_framework import generics, status
+from rest_framework.exceptions import APIException, PermissionDenied, ValidationError
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.authentication import SessionAuthentication as BaseSessionAuthentication, BasicAuthentication
 
+from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
+from . import actors
+from . import broadcast
+from . import jobs
 from . import models
+from . import replay
 from . import serializers
+from . import stats
+from . import throttling
+from . import tokens
+
+
+# seconds between keep alive comments of the spectator event streams
+SPECTATOR_HEARTBEAT = 15
+
+# open spectator event streams of the process
+spectator_streams = broadcast.StreamLimit()
+
+# chunks of an infinite board returned by a viewport request at most
+MAX_VIEWPORT_CHUNKS = 64
 
 
 class SessionAuthentication(BaseSessionAuthentication):
@@ -17,37 +49,626 @@ class SessionAuthentication(BaseSessionAuthentication):
         return
 
 
+API_AUTHENTICATION = (SessionAuthentication, tokens.SignedTokenAuthentication, BasicAuthentication)
+
+
+class BoardPending(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The board is being generated, try again later."
+    default_code = 'board_pending'
+
+
+def check_ready(board: models.Board) -> models.Board:
+    "Raises `BoardPending` when the layout of the board is not generated yet."
+    if board.pending:
+        raise BoardPending()
+    return board
+
+
+display_format_parameter = openapi.Parameter('display_format', openapi.IN_QUERY,
+    description="Format of `display_board`. It can also be requested with a `display_format` "
+                "parameter of the Accept header, for example `application/json; display_format=rle`.",
+    type=openapi.TYPE_STRING, enum=serializers.DisplayFormat.values, default=serializers.DisplayFormat.GRID)
+
+
+window_parameters = [
+    openapi.Parameter(name, openapi.IN_QUERY, description=description, type=openapi.TYPE_INTEGER)
+    for name, description in [
+        ('row', "First row of the displayed window of the board."),
+        ('column', "First column of the displayed window of the board."),
+        ('height', "Rows of the displayed window of the board (32 by default)."),
+        ('width', "Columns of the displayed window of the board (32 by default)."),
+    ]
+]
+
+
+def get_window(request) -> Optional[tuple]:
+    """
+    Returns the rectangle of the board requested by the query string as
+    (row, column, height, width), or None when the whole board is requested.
+    """
+    if not any(name in request.query_params for name in ('row', 'column', 'height', 'width')):
+        return None
+    serializer = serializers.ViewportSerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    return data['row'], data['column'], data['height'], data['width']
+
+
+def media_type_params(media_type: str) -> Dict[str, str]:
+    "Returns the parameters of a media type like `application/json; display_format=rle`."
+    params = {}
+    for param in media_type.split(';')[1:]:
+        key, separator, value = param.partition('=')
+        if separator:
+            params[key.strip().lower()] = value.strip().strip('"')
+    return params
+
+
+def get_display_format(request) -> str:
+    "Returns the format of the display board requested by the query string or the Accept header."
+    value = request.query_params.get('display_format')
+    if value is None and getattr(request, 'accepted_media_type', None):
+        value = media_type_params(request.accepted_media_type).get('display_format')
+    if value in serializers.DisplayFormat.values:
+        return value
+    return serializers.DisplayFormat.GRID
+
+
+class DisplayFormatMixin:
+    "Passes the requested format and window of the display board to the serializers."
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['display_format'] = get_display_format(self.request)
+        context['window'] = get_window(self.request)
+        return context
+
+
+def _board_state(request, pk: int) -> Optional[tuple]:
+    """
+    Returns the version and the modification date of the board without loading
+    the board JSON. The result is kept in the request because it is used by the
+    ETag and the Last-Modified functions. The state of cooperative boards is
+    read from their actor when they have one.
+    """
+    if not request.user.is_authenticated:
+        return None
+    states = request.__dict__.setdefault('_board_states', {})
+    if pk not in states:
+        state = models.Board.objects.for_user(request.user).filter(pk=pk).values_list(
+            'version', 'modified', 'cooperative').first()
+        if state is not None and state[2] and actors.enabled():
+            state = actors.registry.call(pk, lambda board: (board.version, board.modified))
+        states[pk] = state[:2] if state else None
+    return states[pk]
+
+
+def _etag(request, pk: int, version: int) -> str:
+    etag = f'{pk}-{version}'
+    display_format = get_display_format(request)
+    if display_format != serializers.DisplayFormat.GRID:
+        etag += f'-{display_format}'
+    window = get_window(request)
+    if window is not None:
+        etag += '-{}.{}.{}.{}'.format(*window)
+    return etag
+
+
+def board_etag(request, pk: int, *args, **kwargs) -> Optional[str]:
+    state = _board_state(request, pk)
+    return _etag(request, pk, state[0]) if state else None
+
+
+def board_last_modified(request, pk: int, *args, **kwargs):
+    state = _board_state(request, pk)
+    return state[1] if state else None
+
+
+def publish_board(board: models.Board) -> broadcast.Message:
+    "Publishes the spectator view of the board to its channel and returns the message."
+    message = JSONRenderer().render(serializers.SpectatorBoardSerializer(board).data)
+    seq = broadcast.get_backend().publish(broadcast.board_channel(board.pk), message)
+    return seq, message
+
+
+def _shared_board_id(token: str) -> int:
+    board_id = models.Board.objects.filter(share_token=token).values_list('pk', flat=True).first()
+    if board_id is None:
+        raise Http404
+    return board_id
+
+
+def _spectator_message(board_id: int) -> broadcast.Message:
+    "Returns the latest message of the board channel, publishing the board when the channel is empty."
+    message = broadcast.get_backend().get(broadcast.board_channel(board_id))
+    if message is None:
+        message = publish_board(models.Board.objects.get(pk=board_id))
+    return message
+
+
 class ListBoardTemplateView(generics.ListAPIView):
     serializer_class = serializers.BoardTemplateSerializer
     queryset = models.BoardTemplate.objects.all()
 
 
-class ListCreateBoardView(generics.ListCreateAPIView):
-    serializer_class = serializers.BoardSerializer
+class TokenView(generics.GenericAPIView):
+    """
+    Returns a signed token of the user, valid for `MINESWEEPER_TOKEN_MAX_AGE`
+    seconds. The token is sent in the `Authorization: Bearer <token>` header of
+    the next requests and is checked without reading the database. Tokens are
+    requested with basic or session authentication, not with another token.
+    """
+    serializer_class = serializers.TokenSerializer
     authentication_classes = (SessionAuthentication, BasicAuthentication)
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request, *args, **kwargs):
+        token, expires = tokens.create_token(request.user)
+        return Response(self.get_serializer({'token': token, 'expires': expires}).data)
+
+
+class ListCreateBoardView(DisplayFormatMixin, generics.ListCreateAPIView):
+    serializer_class = serializers.BoardSerializer
+    authentication_classes = API_AUTHENTICATION
 
     def get_queryset(self):
-        return models.Board.objects.filter(user=self.request.user)
+        if getattr(self, 'swagger_fake_view', False):
+            return models.Board.objects.none()
+        return models.Board.objects.for_user(self.request.user)
 
     def perform_create(self, serializer: ModelSerializer):
-        serializer.save(user=self.request.user)
+        # big layouts are generated by a job, the board is returned pending
+        data = serializer.validated_data
+        if data['rows'] * data['columns'] >= jobs.async_board_cells():
+            jobs.create_pending_board(serializer, self.request.user)
+        else:
+            serializer.save(user=self.request.user)
 
+    @swagger_auto_schema(manual_parameters=[display_format_parameter])
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
 
-class ReadUpdateDeleteBoardView(generics.RetrieveUpdateDestroyAPIView):
-    authentication_classes = (SessionAuthentication, BasicAuthentication)
+    @swagger_auto_schema(manual_parameters=[display_format_parameter])
+    def post(self, request, *args, **kwargs):
+        return super().post(request, *args, **kwargs)
+
+
+class ReadUpdateDeleteBoardView(DisplayFormatMixin, generics.RetrieveUpdateDestroyAPIView):
+    """
+    Cooperative boards are read and updated in their actor, so the moves of
+    the players are applied one by one on the board kept in memory.
+    """
+    authentication_classes = API_AUTHENTICATION
+
+    # set while the board is updated in a transaction
+    lock_board = False
+    # set while the board is read without its layout, the actors of cooperative boards keep it
+    defer_layout = False
+    # set when the board bucket of the request was charged
+    board_throttle_checked = False
+    # model typing the path parameters of the schema, the rows come from `get_queryset`
+    queryset = models.Board.objects.none()
 
     def get_queryset(self):
-        return models.Board.objects.filter(user=self.request.user)
+        if getattr(self, 'swagger_fake_view', False):
+            return models.Board.objects.none()
+        queryset = models.Board.objects.for_user(self.request.user)
+        if self.lock_board:
+            queryset = queryset.select_for_update()
+        if self.defer_layout:
+            queryset = queryset.defer('board_json')
+        return queryset
+
+    def get_board(self, defer_layout: bool) -> models.Board:
+        "Returns the board of the request, without loading its layout when `defer_layout` is true."
+        self.defer_layout = defer_layout
+        try:
+            return self.get_object()
+        finally:
+            self.defer_layout = False
 
     def get_serializer_class(self):
         if self.request.method in ['POST', 'PUT', 'PATCH']:
             return serializers.UpdateCellSerializer
         return serializers.BoardSerializer
 
+    def get_throttles(self):
+        throttles = super().get_throttles()
+        if self.request.method in ['PUT', 'PATCH']:
+            throttles.append(throttling.UserCellUpdateThrottle())
+        return throttles
+
+    def check_object_permissions(self, request, obj):
+        super().check_object_permissions(request, obj)
+        # the bucket of the board is charged once the user bucket allowed the
+        # request and the board was found for the user, so other users cannot
+        # drain it
+        if request.method in ['PUT', 'PATCH'] and not self.board_throttle_checked:
+            self.board_throttle_checked = True
+            throttle = throttling.BoardCellUpdateThrottle()
+            if not throttle.allow_request(request, self):
+                self.throttled(request, throttle.wait())
+
+    @swagger_auto_schema(manual_parameters=[display_format_parameter, *window_parameters])
+    @method_decorator(vary_on_headers('Accept'))
+    @method_decorator(cache_control(private=True, no_cache=True))
+    @method_decorator(condition(etag_func=board_etag, last_modified_func=board_last_modified))
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        # the layout of the boards that are not cooperative is loaded when they are serialized
+        instance: models.Board = self.get_board(defer_layout=actors.enabled())
+        if not instance.cooperative or not actors.enabled():
+            return Response(self.get_serializer(instance).data)
+        context = self.get_serializer_context()
+        data = actors.registry.call(instance.pk,
+            lambda board: serializers.BoardSerializer(board, context=context).data)
+        return Response(data)
+
+    def update(self, request, *args, **kwargs):
+        # only the actor path uses this instance, the other paths read the board again
+        instance: models.Board = self.get_board(defer_layout=True)
+        if not instance.cooperative:
+            return super().update(request, *args, **kwargs)
+        if not actors.enabled():
+            # the players can be served by other processes, their moves wait for the board row
+            with transaction.atomic():
+                self.lock_board = True
+                return super().update(request, *args, **kwargs)
+        serializer = self.get_serializer(instance, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        context = self.get_serializer_context()
+
+        def apply(board: models.Board):
+            serializers.apply_cell_update(board, serializer.validated_data, save=False)
+
+        def render(board: models.Board):
+            if instance.share_token:
+                publish_board(board)
+            return serializers.BoardSerializer(board, context=context).data
+
+        return Response(actors.registry.call(instance.pk, apply, mutates=True, render=render))
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        if serializer.instance.share_token:
+            publish_board(serializer.instance)
+
+    def perform_destroy(self, instance: models.Board):
+        if instance.user_id != self.request.user.pk:
+            raise PermissionDenied("Only the owner can delete the board.")
+        super().perform_destroy(instance)
+        actor = actors.registry.get(instance.pk)
+        if actor is not None:
+            actor.stop()
+
     @swagger_auto_schema(auto_schema=None)
     def patch(self, request, *args, **kwargs):
         return super().patch(request, *args, **kwargs)
 
-    @swagger_auto_schema(responses={200: serializers.BoardSerializer})
+    @swagger_auto_schema(responses={200: serializers.BoardSerializer},
+        manual_parameters=[display_format_parameter, *window_parameters])
     def put(self, request, *args, **kwargs):
-        return super().put(request, *args, **kwargs)
\ No newline at end of file
+        response = super().put(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = quote_etag(_etag(request, kwargs['pk'], response.data['version']))
+        return response
+
+
+class BoardProbabilitiesView(generics.RetrieveAPIView):
+    "Returns the probability of having a mine for the hidden cells of the board."
+    serializer_class = serializers.BoardProbabilitiesSerializer
+    authentication_classes = API_AUTHENTICATION
+    queryset = models.Board.objects.none()
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return models.Board.objects.none()
+        # the board is only decoded when the probabilities are not cached.
+        return models.Board.objects.for_user(self.request.user).defer('board_json')
+
+    def retrieve(self, request, *args, **kwargs):
+        instance: models.Board = check_ready(self.get_object())
+        if instance.cooperative and actors.enabled():
+            probabilities = actors.registry.call(instance.pk, lambda board: board.mine_probabilities())
+        else:
+            probabilities = instance.mine_probabilities()
+        serializer = self.get_serializer(probabilities)
+        return Response(serializer.data)
+
+
+class BoardReplayView(DisplayFormatMixin, generics.GenericAPIView):
+    "Returns the state of the board after a move of its history."
+    serializer_class = serializers.ReplayStateSerializer
+    authentication_classes = API_AUTHENTICATION
+    queryset = models.Board.objects.none()
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return models.Board.objects.none()
+        return models.Board.objects.for_user(self.request.user).defer('board_json')
+
+    @swagger_auto_schema(query_serializer=serializers.ReplaySerializer,
+        manual_parameters=[display_format_parameter])
+    def get(self, request, *args, **kwargs):
+        board: models.Board = check_ready(self.get_object())
+        query = serializers.ReplaySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        move = query.validated_data.get('move', board.move_count)
+        try:
+            engine = replay.state_at(board, move)
+        except ValueError as error:
+            raise ValidationError({'move': [str(error)]})
+        serializer = self.get_serializer({
+            'move': move, 'move_count': board.move_count, 'board': engine,
+            'finished': engine.is_exploded() or engine.is_finished(),
+        })
+        return Response(serializer.data)
+
+
+class BoardReplayStreamView(generics.GenericAPIView):
+    """
+    Streams the replay of the board as JSON lines. The first line has the
+    board after the `start` move with the `rows` display format and the next
+    lines have the cells changed by each move until the `end` move.
+    """
+    authentication_classes = API_AUTHENTICATION
+    queryset = models.Board.objects.none()
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return models.Board.objects.none()
+        return models.Board.objects.for_user(self.request.user).defer('board_json')
+
+    @swagger_auto_schema(query_serializer=serializers.ReplayStreamSerializer,
+        responses={200: "JSON lines with the replay of the board."})
+    def get(self, request, *args, **kwargs):
+        board: models.Board = check_ready(self.get_object())
+        query = serializers.ReplayStreamSerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        try:
+            diffs = replay.iter_diffs(board, query.validated_data['start'], query.validated_data.get('end'))
+        except ValueError as error:
+            raise ValidationError({'start': [str(error)]})
+        lines = (JSONRenderer().render(diff) + b'\n' for diff in diffs)
+        return StreamingHttpResponse(lines, content_type='application/x-ndjson')
+
+
+class ShareBoardView(generics.GenericAPIView):
+    "Shares a read only live view of the board with spectators."
+    serializer_class = serializers.ShareBoardSerializer
+    authentication_classes = API_AUTHENTICATION
+    queryset = models.Board.objects.none()
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return models.Board.objects.none()
+        return models.Board.objects.filter(user=self.request.user)
+
+    def post(self, request, *args, **kwargs):
+        board: models.Board = check_ready(self.get_object())
+        board.share()
+        if board.cooperative and actors.enabled():
+            actors.registry.call(board.pk, publish_board)
+        else:
+            publish_board(board)
+        return Response(self.get_serializer(board).data)
+
+    def delete(self, request, *args, **kwargs):
+        board: models.Board = self.get_object()
+        board.unshare()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class BoardPlayersView(generics.GenericAPIView):
+    """
+    Players of a cooperative board. The owner adds players sending their
+    username and the board becomes cooperative.
+    """
+    serializer_class = serializers.PlayerSerializer
+    authentication_classes = API_AUTHENTICATION
+    queryset = models.Board.objects.none()
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return models.Board.objects.none()
+        return models.Board.objects.filter(user=self.request.user)
+
+    @swagger_auto_schema(responses={200: serializers.PlayerSerializer(many=True)})
+    def get(self, request, *args, **kwargs):
+        board: models.Board = self.get_object()
+        serializer = self.get_serializer(board.players.order_by('username'), many=True)
+        return Response(serializer.data)
+
+    def post(self, request, *args, **kwargs):
+        # the actors of cooperative boards need the layout
+        board: models.Board = check_ready(self.get_object())
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = get_user_model().objects.filter(username=serializer.validated_data['username']).first()
+        if user is None:
+            raise ValidationError({'username': ["Unknown user."]})
+        if user.pk != board.user_id:
+            board.add_player(user)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class StatsView(generics.GenericAPIView):
+    """
+    Returns the statistics of the finished games of the user and of all the
+    users, read from rollups updated when each game finishes. Practice boards
+    are not counted.
+    """
+    serializer_class = serializers.StatsSerializer
+    authentication_classes = API_AUTHENTICATION
+    permission_classes = (IsAuthenticated,)
+
+    @swagger_auto_schema(query_serializer=serializers.StatsQuerySerializer)
+    def get(self, request, *args, **kwargs):
+        query = serializers.StatsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        days = query.validated_data['days']
+        return Response(self.get_serializer({
+            'days': days,
+            'player': stats.player_stats(request.user),
+            'sizes': stats.size_stats(request.user, days),
+            'global_sizes': stats.size_stats(None, days),
+        }).data)
+
+
+class ListJobView(generics.ListAPIView):
+    "Lists the jobs of the user, the newest first."
+    serializer_class = serializers.JobSerializer
+    authentication_classes = API_AUTHENTICATION
+    permission_classes = (IsAuthenticated,)
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return models.Job.objects.none()
+        return models.Job.objects.filter(user=self.request.user)
+
+
+class ReadJobView(generics.RetrieveAPIView):
+    "Returns the status of a job of the user and its result when it finishes."
+    serializer_class = serializers.JobSerializer
+    authentication_classes = API_AUTHENTICATION
+    permission_classes = (IsAuthenticated,)
+    queryset = models.Job.objects.none()
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return models.Job.objects.none()
+        return models.Job.objects.filter(user=self.request.user)
+
+
+class ListCreateInfiniteBoardView(generics.ListCreateAPIView):
+    serializer_class = serializers.InfiniteBoardSerializer
+    authentication_classes = API_AUTHENTICATION
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return models.InfiniteBoard.objects.none()
+        return models.InfiniteBoard.objects.filter(user=self.request.user)
+
+    def perform_create(self, serializer: ModelSerializer):
+        serializer.save(user=self.request.user)
+
+
+class ReadUpdateDeleteInfiniteBoardView(generics.RetrieveUpdateDestroyAPIView):
+    "Infinite boards are started revealing the cell (0, 0), which never has a mine."
+    authentication_classes = API_AUTHENTICATION
+    queryset = models.InfiniteBoard.objects.none()
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return models.InfiniteBoard.objects.none()
+        return models.InfiniteBoard.objects.filter(user=self.request.user)
+
+    def get_serializer_class(self):
+        if self.request.method in ['PUT', 'PATCH']:
+            return serializers.UpdateInfiniteCellSerializer
+        return serializers.InfiniteBoardSerializer
+
+    @swagger_auto_schema(auto_schema=None)
+    def patch(self, request, *args, **kwargs):
+        return super().patch(request, *args, **kwargs)
+
+    @swagger_auto_schema(responses={200: serializers.InfiniteBoardSerializer})
+    def put(self, request, *args, **kwargs):
+        return super().put(request, *args, **kwargs)
+
+
+class InfiniteBoardChunksView(generics.GenericAPIView):
+    """
+    Returns the chunks of an infinite board with cells in the viewport given by
+    the `row`, `column`, `height` and `width` query parameters.
+    """
+    serializer_class = serializers.BoardChunkSerializer
+    authentication_classes = API_AUTHENTICATION
+    queryset = models.InfiniteBoard.objects.none()
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return models.InfiniteBoard.objects.none()
+        return models.InfiniteBoard.objects.filter(user=self.request.user)
+
+    @swagger_auto_schema(query_serializer=serializers.ViewportSerializer,
+        responses={200: serializers.BoardChunkSerializer(many=True)})
+    def get(self, request, *args, **kwargs):
+        board: models.InfiniteBoard = self.get_object()
+        viewport = serializers.ViewportSerializer(data=request.query_params)
+        viewport.is_valid(raise_exception=True)
+        try:
+            keys = board.viewport_chunks(**viewport.validated_data, limit=MAX_VIEWPORT_CHUNKS)
+        except ValueError as error:
+            raise ValidationError(str(error))
+        serializer = self.get_serializer(board.display_chunks(keys), many=True)
+        return Response(serializer.data)
+
+
+class SpectateBoardView(APIView):
+    """
+    Returns the latest state of a shared board. The state is read from the
+    broadcast channel of the board, so the board is not decoded on each request.
+    """
+    authentication_classes = ()
+    permission_classes = (AllowAny,)
+
+    @swagger_auto_schema(responses={200: serializers.SpectatorBoardSerializer})
+    def get(self, request, token: str):
+        seq, message = _spectator_message(_shared_board_id(token))
+        return HttpResponse(message, content_type='application/json')
+
+
+class SpectateBoardEventsView(APIView):
+    """
+    Server sent events stream with the state of a shared board after each
+    update. The stream is closed after `MINESWEEPER_SPECTATOR_STREAM_SECONDS`
+    and clients reconnect sending the `Last-Event-ID` header.
+
+    Each open stream holds a thread of the server, so a process serves at most
+    `MINESWEEPER_SPECTATOR_MAX_STREAMS` streams. Over the limit the stream only
+    asks the client to reconnect after the heartbeat interval.
+    """
+    authentication_classes = ()
+    permission_classes = (AllowAny,)
+
+    def _events(self, board_id: int, message: broadcast.Message, last_seq: int) -> Iterator[bytes]:
+        backend = broadcast.get_backend()
+        channel = broadcast.board_channel(board_id)
+        deadline = time.monotonic() + getattr(settings, 'MINESWEEPER_SPECTATOR_STREAM_SECONDS', 300)
+        # counted when the stream starts, the counter is released when the response closes it
+        if not spectator_streams.acquire(getattr(settings, 'MINESWEEPER_SPECTATOR_MAX_STREAMS', 100)):
+            yield b'retry: %d\n\n' % (SPECTATOR_HEARTBEAT * 1000)
+            return
+        try:
+            seq, data = message
+            if seq != last_seq:
+                yield b'id: %d\ndata: %s\n\n' % (seq, data)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                message = backend.wait(channel, seq, min(SPECTATOR_HEARTBEAT, remaining))
+                if message is None:
+                    yield b': keep-alive\n\n'
+                    continue
+                seq, data = message
+                yield b'id: %d\ndata: %s\n\n' % (seq, data)
+        finally:
+            spectator_streams.release()
+
+    @swagger_auto_schema(auto_schema=None)
+    def get(self, request, token: str):
+        board_id = _shared_board_id(token)
+        try:
+            last_seq = int(request.META.get('HTTP_LAST_EVENT_ID', 0))
+        except ValueError:
+            last_seq = 0
+        message = _spectator_message(board_id)
+        response = StreamingHttpResponse(self._events(board_id, message, last_seq),
+            content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
@@ -4,7 +4,21 @@ from . import api
 
 
 urlpatterns = [
+    path('token/', api.TokenView.as_view()),
     path('board-templates/', api.ListBoardTemplateView.as_view()),
     path('boards/', api.ListCreateBoardView.as_view()),
-    path('boards/<int:pk>/', api.ReadUpdateDeleteBoardView.as_view())
+    path('boards/<int:pk>/', api.ReadUpdateDeleteBoardView.as_view()),
+    path('boards/<int:pk>/probabilities/', api.BoardProbabilitiesView.as_view()),
+    path('boards/<int:pk>/replay/', api.BoardReplayView.as_view()),
+    path('boards/<int:pk>/replay/stream/', api.BoardReplayStreamView.as_view()),
+    path('boards/<int:pk>/share/', api.ShareBoardView.as_view()),
+    path('boards/<int:pk>/players/', api.BoardPlayersView.as_view()),
+    path('stats/', api.StatsView.as_view()),
+    path('jobs/', api.ListJobView.as_view()),
+    path('jobs/<int:pk>/', api.ReadJobView.as_view()),
+    path('infinite-boards/', api.ListCreateInfiniteBoardView.as_view()),
+    path('infinite-boards/<int:pk>/', api.ReadUpdateDeleteInfiniteBoardView.as_view()),
+    path('infinite-boards/<int:pk>/chunks/', api.InfiniteBoardChunksView.as_view()),
+    path('spectate/<str:token>/', api.SpectateBoardView.as_view()),
+    path('spectate/<str:token>/events/', api.SpectateBoardEventsView.as_view()),
 ]
@@ -1,5 +1,16 @@
+import atexit
+
 from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
 
 
 class MinesweeperConfig(AppConfig):
     name = 'minesweeper'
+
+    def ready(self):
+        from . import actors, db
+        request_started.connect(db.check_connections, dispatch_uid='minesweeper.db.check_connections')
+        connection_created.connect(db.set_statement_timeout, dispatch_uid='minesweeper.db.set_statement_timeout')
+        # the boards of the running actors are saved when the process exits
+        atexit.register(actors.registry.stop_all)
@@ -0,0 +1,48 @@
+"""
+Retention of finished boards.
+
+Finished boards that were not modified for a while are moved to the archived
+boards table in batches, so the boards table only holds recent and active games.
+The moves and the analysis of each board are copied to its archived board
+before the moves, checkpoints and analysis rows are deleted with the board.
+"""
+import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import anticheat
+from . import models
+
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def archive_finished_boards(older_than: datetime.timedelta, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Moves the finished boards not modified in the `older_than` period to the
+    archived boards table.
+
+    Returns
+    -------
+    result: int
+        Count of archived boards.
+    """
+    cutoff = timezone.now() - older_than
+    queryset = models.Board.objects.filter(finished=True, modified__lt=cutoff).order_by('pk')
+    count = 0
+    while True:
+        with transaction.atomic():
+            boards = list(queryset[:batch_size])
+            if not boards:
+                break
+            ids = [board.pk for board in boards]
+            games = {game['board_id']: game for game in anticheat.load_games(
+                [(board.pk, board.rows, board.columns, board.mines) for board in boards])}
+            analyses = models.BoardAnalysis.objects.in_bulk(ids, field_name='board_id')
+            models.ArchivedBoard.objects.bulk_create([
+                models.ArchivedBoard.from_board(board, games.get(board.pk), analyses.get(board.pk))
+                for board in boards])
+            models.Board.objects.filter(pk__in=ids).delete()
+        count += len(boards)
+    return count
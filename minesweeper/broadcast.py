@@ -0,0 +1,187 @@
+"""
+Publish/subscribe of board updates for spectators.
+
+A channel keeps only its latest message and a sequence number. Publishers
+store the message once and every subscriber waiting on the channel reads the
+same message, so the cost of an update does not grow with the count of
+spectators. Slow subscribers skip intermediate messages and get the latest one.
+
+The backend is chosen with the `MINESWEEPER_BROADCAST_BACKEND` setting:
+
+* `minesweeper.broadcast.LocalBroadcastBackend`: in-process channels. Publishers
+  and subscribers must run in the same process. Channels without new messages
+  or subscribers for an hour are dropped.
+* `minesweeper.broadcast.CacheBroadcastBackend`: channels stored in the Django
+  cache, shared by all the processes using the same cache server.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+
+Message = Tuple[int, bytes]
+
+
+class BaseBroadcastBackend:
+    def publish(self, channel: str, message: bytes) -> int:
+        "Stores `message` as the latest message of the channel and returns its sequence number."
+        raise NotImplementedError
+
+    def get(self, channel: str) -> Optional[Message]:
+        "Returns the sequence number and the latest message of the channel."
+        raise NotImplementedError
+
+    def wait(self, channel: str, seq: int, timeout: float) -> Optional[Message]:
+        """
+        Waits for a message newer than `seq` and returns it. Returns `None` when
+        there is no new message after `timeout` seconds.
+        """
+        raise NotImplementedError
+
+
+class _LocalChannel:
+    def __init__(self, updated: float):
+        self.condition = threading.Condition()
+        self.message: Optional[Message] = None
+        self.updated = updated
+        self.waiters = 0
+
+
+class LocalBroadcastBackend(BaseBroadcastBackend):
+    """
+    In-process channels. Channels without messages or waiting subscribers for
+    `timeout` seconds are dropped when other channels are used.
+    """
+    timeout = 3600
+    timer = time.monotonic
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # ordered by the last update, the oldest first
+        self._channels: 'OrderedDict[str, _LocalChannel]' = OrderedDict()
+
+    def _channel(self, channel: str, waiting: bool = False) -> _LocalChannel:
+        "Returns the channel, marked as updated now. Expired channels are dropped."
+        with self._lock:
+            now = self.timer()
+            state = self._channels.get(channel)
+            if state is None:
+                state = self._channels[channel] = _LocalChannel(now)
+            else:
+                state.updated = now
+                self._channels.move_to_end(channel)
+            state.waiters += waiting
+            limit = now - self.timeout
+            while True:
+                name, oldest = next(iter(self._channels.items()))
+                if oldest.updated >= limit:
+                    break
+                if oldest.waiters:
+                    # channels with subscribers are kept
+                    oldest.updated = now
+                    self._channels.move_to_end(name)
+                else:
+                    del self._channels[name]
+            return state
+
+    def publish(self, channel: str, message: bytes) -> int:
+        state = self._channel(channel)
+        with state.condition:
+            seq = (state.message[0] if state.message else 0) + 1
+            state.message = (seq, message)
+            state.condition.notify_all()
+        return seq
+
+    def get(self, channel: str) -> Optional[Message]:
+        with self._lock:
+            state = self._channels.get(channel)
+        return state.message if state is not None else None
+
+    def wait(self, channel: str, seq: int, timeout: float) -> Optional[Message]:
+        state = self._channel(channel, waiting=True)
+        is_new = lambda: state.message is not None and state.message[0] > seq
+        try:
+            with state.condition:
+                if state.condition.wait_for(is_new, timeout):
+                    return state.message
+            return None
+        finally:
+            with self._lock:
+                state.waiters -= 1
+
+
+class CacheBroadcastBackend(BaseBroadcastBackend):
+    "Channels stored in the Django cache. Subscribers poll the cache, not the database."
+    poll_interval = 0.5
+    timeout = 3600
+
+    def _key(self, channel: str) -> str:
+        return f'minesweeper:broadcast:{channel}'
+
+    def publish(self, channel: str, message: bytes) -> int:
+        seq_key = self._key(channel) + ':seq'
+        cache.add(seq_key, 0, self.timeout)
+        try:
+            seq = cache.incr(seq_key)
+        except ValueError:
+            # the counter expired between add and incr
+            cache.set(seq_key, 1, self.timeout)
+            seq = 1
+        cache.set(self._key(channel), (seq, message), self.timeout)
+        return seq
+
+    def get(self, channel: str) -> Optional[Message]:
+        return cache.get(self._key(channel))
+
+    def wait(self, channel: str, seq: int, timeout: float) -> Optional[Message]:
+        deadline = time.monotonic() + timeout
+        while True:
+            message = self.get(channel)
+            if message is not None and message[0] > seq:
+                return message
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(self.poll_interval, remaining))
+
+
+class StreamLimit:
+    "Count of the open subscriber streams of the process, limited by the caller."
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def acquire(self, limit: int) -> bool:
+        "Counts a new stream and returns `True`, or returns `False` when `limit` streams are open."
+        with self._lock:
+            if self.count >= limit:
+                return False
+            self.count += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.count -= 1
+
+
+_backend: Optional[BaseBroadcastBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> BaseBroadcastBackend:
+    "Returns the backend configured in the `MINESWEEPER_BROADCAST_BACKEND` setting."
+    global _backend
+    with _backend_lock:
+        path = getattr(settings, 'MINESWEEPER_BROADCAST_BACKEND', 'minesweeper.broadcast.LocalBroadcastBackend')
+        if _backend is None or f'{type(_backend).__module__}.{type(_backend).__name__}' != path:
+            _backend = import_string(path)()
+        return _backend
+
+
+def board_channel(board_id: int) -> str:
+    return f'board:{board_id}'
@@ -0,0 +1,207 @@
+"""
+Boards of unbounded size split in chunks.
+
+The cells are grouped in square chunks of `chunk_size` cells. The mines of a
+chunk are generated from the seed of the board and the coordinates of the
+chunk, so chunks are only created when the game reaches them and only the
+chunks changed by the players need to be stored. Memory and storage grow with
+the explored area, not with the size of the board. Cell coordinates can be
+negative.
+"""
+import random
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .minesweeper import CellType, MineExplossionError
+
+
+DEFAULT_CHUNK_SIZE = 32
+
+# cells revealed by a single reveal at most. With low mine densities the empty
+# areas can be unbounded, the cells at the border of the limit stay hidden.
+MAX_REVEAL_CELLS = 10000
+
+ChunkKey = Tuple[int, int]
+Chunk = List[List[int]]
+ChunkLoader = Callable[[List[ChunkKey]], Dict[ChunkKey, Chunk]]
+
+
+def generate_chunk(seed: int, chunk_row: int, chunk_column: int, size: int, density: float) -> Chunk:
+    """
+    Returns the cells of a chunk that has never been played. The same seed and
+    coordinates always return the same mines. The cells around the origin do not
+    have mines so the game can start revealing the cell (0, 0).
+    """
+    rng = random.Random(f'{seed}:{chunk_row}:{chunk_column}')
+    chunk = [[CellType.BOMB if rng.random() < density else CellType.EMPTY for column in range(size)]
+        for row in range(size)]
+    for row in (-1, 0, 1):
+        for column in (-1, 0, 1):
+            key_row, cell_row = divmod(row, size)
+            key_column, cell_column = divmod(column, size)
+            if (key_row, key_column) == (chunk_row, chunk_column):
+                chunk[cell_row][cell_column] = CellType.EMPTY
+    return [[int(value) for value in row] for row in chunk]
+
+
+class ChunkedBoard:
+    "Mine sweeper logic for boards of unbounded size."
+
+    def __init__(self, seed: int, density: float, chunk_size: int = DEFAULT_CHUNK_SIZE,
+            chunks: Optional[Dict[ChunkKey, Chunk]] = None, loader: Optional[ChunkLoader] = None):
+        """
+        Parameters
+        ----------
+        seed: int
+            Seed used to generate the mines of the chunks.
+        density: float
+            Probability of a cell having a mine.
+        chunk_size: int
+            Count of rows and columns of the chunks.
+        chunks: dict
+            Chunks already played by (chunk row, chunk column).
+        loader: callable
+            Called with a list of chunk keys that are not in memory. Returns the
+            stored chunks; the missing chunks are generated.
+        """
+        if not 0 < density < 1:
+            raise ValueError("the density must be between 0 and 1")
+        if chunk_size < 1:
+            raise ValueError("the chunk size must be positive")
+        self.seed = seed
+        self.density = density
+        self.chunk_size = chunk_size
+        self._chunks: Dict[ChunkKey, Chunk] = dict(chunks or {})
+        self._loader = loader
+        # chunks modified since they were loaded.
+        self.changed_chunks: Set[ChunkKey] = set()
+
+    def chunk_key(self, row: int, column: int) -> ChunkKey:
+        return row // self.chunk_size, column // self.chunk_size
+
+    def load_chunks(self, keys: Iterable[ChunkKey]):
+        "Makes the chunks available in memory, loading the missing ones with a single loader call."
+        missing = [key for key in keys if key not in self._chunks]
+        if not missing:
+            return
+        loaded = self._loader(missing) if self._loader is not None else {}
+        for key in missing:
+            chunk = loaded.get(key)
+            if chunk is None:
+                chunk = generate_chunk(self.seed, key[0], key[1], self.chunk_size, self.density)
+            self._chunks[key] = chunk
+
+    def get_chunk(self, key: ChunkKey) -> Chunk:
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            self.load_chunks([key])
+            chunk = self._chunks[key]
+        return chunk
+
+    def __getitem__(self, cell_pos: Tuple[int, int]) -> int:
+        chunk_row, row = divmod(cell_pos[0], self.chunk_size)
+        chunk_column, column = divmod(cell_pos[1], self.chunk_size)
+        return self.get_chunk((chunk_row, chunk_column))[row][column]
+
+    def __setitem__(self, cell_pos: Tuple[int, int], value: int):
+        chunk_row, row = divmod(cell_pos[0], self.chunk_size)
+        chunk_column, column = divmod(cell_pos[1], self.chunk_size)
+        self.get_chunk((chunk_row, chunk_column))[row][column] = int(value)
+        self.changed_chunks.add((chunk_row, chunk_column))
+
+    def is_type(self, row: int, column: int, cell_type: int) -> bool:
+        return bool(self[row, column] & cell_type)
+
+    def add_type(self, row: int, column: int, cell_type: int):
+        self[row, column] = self[row, column] | cell_type
+
+    def delete_type(self, row: int, column: int, cell_type: int):
+        self[row, column] = (self[row, column] | cell_type) ^ cell_type
+
+    def has_bomb(self, row: int, column: int) -> bool:
+        return self.is_type(row, column, CellType.BOMB)
+
+    def is_revealed(self, row: int, column: int) -> bool:
+        return self.is_type(row, column, CellType.REVEALED)
+
+    def mark_cell(self, row: int, column: int):
+        if self.is_type(row, column, CellType.REVEALED):
+            return
+        if self.is_type(row, column, CellType.QUESTION):
+            self.delete_type(row, column, CellType.QUESTION)
+        elif self.is_type(row, column, CellType.FLAG):
+            self.delete_type(row, column, CellType.FLAG)
+            self.add_type(row, column, CellType.QUESTION)
+        else:
+            self.add_type(row, column, CellType.FLAG)
+
+    def adjacent_mines_count(self, row: int, column: int) -> int:
+        count = 0
+        for near_row in (row - 1, row, row + 1):
+            for near_column in (column - 1, column, column + 1):
+                if (near_row, near_column) != (row, column) and self[near_row, near_column] & CellType.BOMB:
+                    count += 1
+        return count
+
+    def reveal(self, row: int, column: int, max_cells: int = MAX_REVEAL_CELLS) -> int:
+        """
+        Reveals the cell and the empty area around it. Returns the count of
+        revealed cells. Raises `MineExplossionError` when the cell has a mine.
+        """
+        if self.is_type(row, column, CellType.FLAG|CellType.QUESTION|CellType.REVEALED|CellType.KABOOM):
+            return 0
+        if self.has_bomb(row, column):
+            self.add_type(row, column, CellType.KABOOM|CellType.REVEALED)
+            raise MineExplossionError((row, column))
+        chunk_row, chunk_column = self.chunk_key(row, column)
+        self.load_chunks([(chunk_row + diff_row, chunk_column + diff_column)
+            for diff_row in (-1, 0, 1) for diff_column in (-1, 0, 1)])
+
+        revealed = 0
+        processed = {(row, column)}
+        queue = deque(processed)
+        while queue and revealed < max_cells:
+            cell = queue.popleft()
+            if self[cell] != CellType.EMPTY:
+                continue
+            self.add_type(cell[0], cell[1], CellType.REVEALED)
+            revealed += 1
+            if self.adjacent_mines_count(*cell):
+                continue
+            for near_row in (cell[0] - 1, cell[0], cell[0] + 1):
+                for near_column in (cell[1] - 1, cell[1], cell[1] + 1):
+                    near = (near_row, near_column)
+                    if near not in processed:
+                        processed.add(near)
+                        queue.append(near)
+        return revealed
+
+    def display_cell(self, row: int, column: int) -> str:
+        "Returns the character displayed for the cell, with the codes of `minesweeper.display_rows`."
+        value = self[row, column]
+        if value & CellType.QUESTION:
+            return '?'
+        if value & CellType.FLAG:
+            return '!'
+        if value & CellType.KABOOM:
+            return 'X'
+        if value & CellType.REVEALED:
+            if value & CellType.BOMB:
+                return '*'
+            return str(self.adjacent_mines_count(row, column))
+        return ' '
+
+    def display_chunk(self, key: ChunkKey) -> List[str]:
+        "Returns the rows of the chunk as displayed to the player, a string per row."
+        chunk = self.get_chunk(key)
+        first_row = key[0] * self.chunk_size
+        first_column = key[1] * self.chunk_size
+        result = []
+        for row, values in enumerate(chunk, first_row):
+            if not any(value & (CellType.REVEALED|CellType.FLAG|CellType.QUESTION) for value in values):
+                # rows without visible cells do not need the neighbour chunks
+                result.append(' ' * self.chunk_size)
+                continue
+            result.append(''.join(self.display_cell(row, column)
+                for column in range(first_column, first_column + self.chunk_size)))
+        return result
@@ -0,0 +1,52 @@
+"""
+Database connection helpers for deployments with persistent connections.
+
+With `CONN_MAX_AGE` the connections are reused between requests. A reused
+connection can be broken (for example after a restart of the database server
+or of the pooler) and Django only finds it out when the first query of the
+request fails. With the `MINESWEEPER_DB_HEALTH_CHECKS` setting the connections
+reused by a request are checked when the request starts and reopened when they
+are not usable.
+
+Transaction poolers like PgBouncer reject the startup options of the
+connections, so behind a pooler the statement timeout of the web processes is
+set with a query when Django creates each connection.
+"""
+from django.conf import settings
+from django.db import connections
+
+
+def check_connections(**kwargs):
+    "Closes the persistent connections that are not usable. Receiver of `request_started`."
+    if not getattr(settings, 'MINESWEEPER_DB_HEALTH_CHECKS', False):
+        return
+    for connection in connections.all():
+        if connection.connection is not None and not connection.is_usable():
+            connection.close()
+
+
+def set_statement_timeout(sender, connection, **kwargs):
+    """
+    Sets the `MINESWEEPER_DB_STATEMENT_TIMEOUT` milliseconds of the new
+    PostgreSQL connections. Receiver of `connection_created`.
+    """
+    timeout = getattr(settings, 'MINESWEEPER_DB_STATEMENT_TIMEOUT', 0)
+    if not timeout or connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('SET statement_timeout = %s', [timeout])
+
+
+def database_status() -> dict:
+    "Runs a query on each database and returns if it succeeded by database alias."
+    status = {}
+    for connection in connections.all():
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+        except Exception:
+            status[connection.alias] = False
+        else:
+            status[connection.alias] = True
+    return status
@@ -0,0 +1,153 @@
+"""
+Streaming export of boards.
+
+Boards are read from the database in chunks and every step of the pipeline is a
+generator, so exports of big tables use constant memory. Boards and archived
+boards are exported with the same fields. The move history is exported only
+when it is requested, with the moves of each chunk of boards read in one query.
+"""
+import csv
+import itertools
+import json
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from django.db.models import QuerySet
+
+from . import models
+
+
+EXPORT_FIELDS = (
+    'id', 'user', 'username', 'rows', 'columns', 'mines', 'finished',
+    'created', 'modified', 'board_json',
+)
+
+# moves in the format of `analysis.analyze_game`: [operation, row, column, timestamp]
+MOVES_FIELD = 'moves'
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def export_fields(moves: bool = False) -> Tuple[str, ...]:
+    "Returns the exported fields, with the move history when `moves` is true."
+    return EXPORT_FIELDS + (MOVES_FIELD,) if moves else EXPORT_FIELDS
+
+
+def _iter_chunks(rows: Iterable[tuple], chunk_size: int) -> Iterator[List[tuple]]:
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            break
+        yield chunk
+
+
+def _load_moves(ids: List[int]) -> Dict[int, list]:
+    "Returns the moves of the boards by board id, read with one query."
+    moves: Dict[int, list] = {pk: [] for pk in ids}
+    for board_id, operation, row, column, created in models.BoardMove.objects.filter(
+            board_id__in=ids).order_by('board_id', 'number').values_list(
+            'board_id', 'operation', 'row', 'column', 'created'):
+        moves[board_id].append([operation, row, column, created.timestamp()])
+    return moves
+
+
+def iter_board_records(queryset: QuerySet, chunk_size: int = DEFAULT_CHUNK_SIZE,
+        moves: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Returns an iterator of dictionaries with the exported fields of the boards
+    in `queryset`, and their moves when `moves` is true.
+    """
+    rows = queryset.order_by('pk').values_list(
+        'id', 'user_id', 'user__username', 'rows', 'columns', 'mines', 'finished',
+        'created', 'modified', 'board_json',
+    ).iterator(chunk_size=chunk_size)
+    for chunk in _iter_chunks(rows, chunk_size):
+        board_moves = _load_moves([values[0] for values in chunk]) if moves else {}
+        for values in chunk:
+            record = dict(zip(EXPORT_FIELDS, values))
+            record['created'] = record['created'].isoformat()
+            record['modified'] = record['modified'].isoformat()
+            record['board_json'] = models.decode_board_json(record['board_json'], record['rows'], record['columns'])
+            if moves:
+                record[MOVES_FIELD] = board_moves[record['id']]
+            yield record
+
+
+def iter_archived_board_records(queryset: QuerySet, chunk_size: int = DEFAULT_CHUNK_SIZE,
+        moves: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Returns an iterator of dictionaries with the exported fields of the
+    archived boards in `queryset`. The id is the id of the original board and
+    the moves are `None` for the boards archived without their history.
+    """
+    fields = ['board_id', 'user_id', 'user__username', 'rows', 'columns', 'mines', 'created', 'modified', 'data']
+    if moves:
+        fields.append('history')
+    rows = queryset.order_by('pk').values_list(*fields).iterator(chunk_size=chunk_size)
+    for values in rows:
+        archived = dict(zip(fields, values))
+        record = {
+            'id': archived['board_id'], 'user': archived['user_id'], 'username': archived['user__username'],
+            'rows': archived['rows'], 'columns': archived['columns'], 'mines': archived['mines'],
+            'finished': True, 'created': archived['created'].isoformat(), 'modified': archived['modified'].isoformat(),
+            'board_json': json.loads(zlib.decompress(archived['data'])),
+        }
+        if moves:
+            history = archived['history']
+            record[MOVES_FIELD] = json.loads(zlib.decompress(history))['moves'] if history is not None else None
+        yield record
+
+
+def iter_jsonl(records: Iterable[Dict[str, Any]], fields: Sequence[str] = EXPORT_FIELDS) -> Iterator[str]:
+    "Returns an iterator of JSON lines with the `fields` of the records."
+    for record in records:
+        yield json.dumps({field: record[field] for field in fields}, separators=(',', ':')) + '\n'
+
+
+class _Echo:
+    "File-like object that returns the written value instead of storing it."
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv(records: Iterable[Dict[str, Any]], fields: Sequence[str] = EXPORT_FIELDS) -> Iterator[str]:
+    "Returns an iterator of CSV lines with the `fields` of the records. The first line is the header."
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for record in records:
+        record['board_json'] = json.dumps(record['board_json'], separators=(',', ':'))
+        if MOVES_FIELD in record:
+            record[MOVES_FIELD] = json.dumps(record[MOVES_FIELD], separators=(',', ':'))
+        yield writer.writerow([record[field] for field in fields])
+
+
+FORMATS: Dict[str, Callable[[Iterable[Dict[str, Any]], Sequence[str]], Iterator[str]]] = {
+    'jsonl': iter_jsonl,
+    'csv': iter_csv,
+}
+
+CONTENT_TYPES = {
+    'jsonl': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def export_boards(queryset: QuerySet, format: str = 'jsonl', chunk_size: int = DEFAULT_CHUNK_SIZE,
+        moves: bool = False) -> Iterator[str]:
+    """
+    Returns an iterator of lines with the boards in `queryset` in the given format.
+
+    Parameters
+    ----------
+    queryset: QuerySet
+        Boards or archived boards to export.
+    format: str
+        One of the keys of `FORMATS`.
+    chunk_size: int
+        Count of boards fetched from the database on each round trip.
+    moves: bool
+        Adds the move history of the boards in the `moves` field.
+    """
+    iter_records = iter_archived_board_records if queryset.model is models.ArchivedBoard else iter_board_records
+    return FORMATS[format](iter_records(queryset, chunk_size, moves), export_fields(moves))
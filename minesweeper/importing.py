@@ -0,0 +1,134 @@
+"""
+Bulk import of boards and board templates.
+
+Boards are read in the format written by `minesweeper.exporting` and inserted in
+batches with `bulk_create`. Layouts present in the records are used as they are,
+mine layouts are only generated for records without one.
+"""
+import csv
+import itertools
+import json
+from typing import Any, Dict, Iterable, Iterator, List, TextIO
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import minesweeper
+from . import models
+
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def read_jsonl(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_csv(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    for row in csv.DictReader(stream):
+        record: Dict[str, Any] = dict(row)
+        for field in ('rows', 'columns', 'mines'):
+            record[field] = int(record[field])
+        record['finished'] = record.get('finished') == 'True'
+        record['board_json'] = json.loads(record['board_json']) if record.get('board_json') else None
+        yield record
+
+
+FORMATS = {
+    'jsonl': read_jsonl,
+    'csv': read_csv,
+}
+
+
+def _resolve_users(usernames: Iterable[str]) -> Dict[str, Any]:
+    "Returns the users with the given usernames by username. Missing users are created."
+    User = get_user_model()
+    usernames = set(usernames)
+    users = {user.username: user for user in User.objects.filter(username__in=usernames)}
+    missing = []
+    for username in usernames - set(users):
+        user = User(username=username)
+        user.set_unusable_password()
+        missing.append(user)
+    if missing:
+        User.objects.bulk_create(missing)
+        created = User.objects.filter(username__in=[user.username for user in missing])
+        users.update((user.username, user) for user in created)
+    return users
+
+
+def _build_board(record: Dict[str, Any], user) -> models.Board:
+    board_json = record.get('board_json')
+    if not board_json:
+        board_json = minesweeper.Board(record['rows'], record['columns'], record['mines']).board
+    created = parse_datetime(record['created']) if record.get('created') else timezone.now()
+    modified = parse_datetime(record['modified']) if record.get('modified') else created
+    return models.Board(
+        user=user,
+        rows=record['rows'],
+        columns=record['columns'],
+        mines=record['mines'],
+        finished=bool(record.get('finished')),
+        board_json=board_json,
+        created=created,
+        modified=modified,
+    )
+
+
+def import_boards(records: Iterable[Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE, user=None) -> int:
+    """
+    Creates boards from exported records.
+
+    Parameters
+    ----------
+    records: Iterable[Dict[str, Any]]
+        Records with the fields written by `minesweeper.exporting`.
+    batch_size: int
+        Count of boards inserted on each query.
+    user: Optional[User]
+        Owner of all the imported boards. When it is not given the owner is
+        looked up by the username of the record and created if it does not exist.
+
+    Returns
+    -------
+    result: int
+        Count of imported boards.
+    """
+    records = iter(records)
+    count = 0
+    while True:
+        batch: List[Dict[str, Any]] = list(itertools.islice(records, batch_size))
+        if not batch:
+            break
+        with transaction.atomic():
+            users: Dict[str, Any] = {}
+            if user is None:
+                users = _resolve_users(record['username'] for record in batch)
+            boards = [_build_board(record, user or users[record['username']]) for record in batch]
+            # `bulk_create` does not call `Board.save`, the dates of the records are kept
+            models.Board.objects.bulk_create(boards, batch_size=batch_size)
+        count += len(boards)
+    return count
+
+
+def import_templates(records: Iterable[Dict[str, Any]]) -> int:
+    """
+    Creates board templates. Records can use the fixture format or be plain
+    dictionaries with the rows, columns and mines. Existing templates are skipped.
+
+    Returns
+    -------
+    result: int
+        Count of templates in the records.
+    """
+    templates = []
+    for record in records:
+        fields: Dict[str, Any] = record.get('fields', record)
+        templates.append(models.BoardTemplate(rows=fields['rows'], columns=fields['columns'], mines=fields['mines']))
+    models.BoardTemplate.objects.bulk_create(templates, ignore_conflicts=True)
+    return len(templates)
+
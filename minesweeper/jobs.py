@@ -0,0 +1,198 @@
+"""
+Operations too heavy for a request, run out of it as jobs.
+
+A job is a row of `models.Job` with the name of a task registered with `task`
+and its parameters. `submit` saves the job and sends its id to the backend
+when the transaction commits, and the backend calls `run_job` in a worker,
+which stores the status and the result of the task in the job. Clients poll
+the job, or the object it changes, until it finishes.
+
+The backend is chosen with the `MINESWEEPER_JOB_BACKEND` setting:
+
+* `minesweeper.jobs.ThreadJobBackend`: pool of `MINESWEEPER_JOB_WORKERS`
+  threads of the web process. The jobs still waiting when the process stops
+  stay pending and can be run with the `run_jobs` command.
+* `minesweeper.jobs.DatabaseJobBackend`: the jobs wait in the database until a
+  worker process started with `run_jobs --loop` runs them.
+* `minesweeper.jobs.ImmediateJobBackend`: the jobs are run by the process
+  submitting them, for the tests.
+
+A backend for a message broker only needs to send the id of the job to a
+worker calling `run_job`.
+
+A job whose worker stops while running it stays running. `run_pending_jobs`
+sends back to pending the jobs running for more than `MINESWEEPER_JOB_TIMEOUT`
+seconds, and fails them after `MAX_ATTEMPTS` runs.
+"""
+import datetime
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import models
+
+
+logger = logging.getLogger(__name__)
+
+TASKS: Dict[str, Callable[..., Any]] = {}
+
+# seconds a job can run before it is considered lost with its worker
+DEFAULT_JOB_TIMEOUT = 600
+# runs of a job, lost with their workers, before it fails
+MAX_ATTEMPTS = 3
+
+
+def task(name: str):
+    "Registers the decorated function as the task of the jobs of kind `name`."
+    def register(function):
+        TASKS[name] = function
+        return function
+    return register
+
+
+class BaseJobBackend:
+    def enqueue(self, job_id: int):
+        "Schedules the job to be run by `run_job`."
+        raise NotImplementedError
+
+
+class ImmediateJobBackend(BaseJobBackend):
+    def enqueue(self, job_id: int):
+        run_job(job_id)
+
+
+class DatabaseJobBackend(BaseJobBackend):
+    def enqueue(self, job_id: int):
+        # the pending jobs are run by the `run_jobs` command
+        pass
+
+
+class ThreadJobBackend(BaseJobBackend):
+    def __init__(self):
+        workers = getattr(settings, 'MINESWEEPER_JOB_WORKERS', 2)
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix='minesweeper-job')
+
+    def enqueue(self, job_id: int):
+        self._executor.submit(self._run, job_id)
+
+    @staticmethod
+    def _run(job_id: int):
+        try:
+            run_job(job_id)
+        except Exception:
+            logger.exception("Job %s could not be run", job_id)
+        finally:
+            # the connection of the thread is not closed by the request cycle
+            connection.close()
+
+
+_backend: Optional[BaseJobBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> BaseJobBackend:
+    "Returns the backend configured in the `MINESWEEPER_JOB_BACKEND` setting."
+    global _backend
+    with _backend_lock:
+        path = getattr(settings, 'MINESWEEPER_JOB_BACKEND', 'minesweeper.jobs.ThreadJobBackend')
+        if _backend is None or f'{type(_backend).__module__}.{type(_backend).__name__}' != path:
+            _backend = import_string(path)()
+        return _backend
+
+
+def submit(kind: str, params: Optional[dict] = None, user=None) -> models.Job:
+    """
+    Saves a pending job and sends it to the backend. The workers read the job
+    from the database, so it is sent when the current transaction commits.
+    """
+    if kind not in TASKS:
+        raise ValueError(f"unknown job kind {kind}")
+    job = models.Job.objects.create(kind=kind, params=params or {}, user=user)
+    transaction.on_commit(lambda: get_backend().enqueue(job.pk))
+    return job
+
+
+def run_job(job_id: int) -> Optional[models.Job]:
+    """
+    Runs a pending job and returns it with its result or its error. Returns
+    `None` when the job is not pending, already run by another worker.
+    """
+    # the status changes in a single update, so each job is run once
+    claimed = models.Job.objects.filter(pk=job_id, status=models.JobStatus.PENDING).update(
+        status=models.JobStatus.RUNNING, started=timezone.now(), attempts=F('attempts') + 1)
+    if not claimed:
+        return None
+    job = models.Job.objects.get(pk=job_id)
+    try:
+        job.result = TASKS[job.kind](**job.params)
+        job.status = models.JobStatus.DONE
+    except Exception as error:
+        logger.exception("Job %s failed", job_id)
+        job.error = str(error) or type(error).__name__
+        job.status = models.JobStatus.FAILED
+    job.finished = timezone.now()
+    job.save(update_fields=['status', 'result', 'error', 'finished'])
+    return job
+
+
+def recover_stale_jobs(timeout: Optional[float] = None) -> int:
+    """
+    Sends back to pending the jobs running for more than `timeout` seconds,
+    `MINESWEEPER_JOB_TIMEOUT` by default, whose worker stopped without
+    finishing them. The jobs already run `MAX_ATTEMPTS` times fail. Returns the
+    count of recovered jobs.
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'MINESWEEPER_JOB_TIMEOUT', DEFAULT_JOB_TIMEOUT)
+    now = timezone.now()
+    stale = models.Job.objects.filter(status=models.JobStatus.RUNNING,
+        started__lt=now - datetime.timedelta(seconds=timeout))
+    failed = stale.filter(attempts__gte=MAX_ATTEMPTS).update(status=models.JobStatus.FAILED, finished=now,
+        error=f"The job did not finish in {MAX_ATTEMPTS} attempts")
+    requeued = stale.update(status=models.JobStatus.PENDING, started=None)
+    if failed or requeued:
+        logger.warning("Recovered %s stale jobs, %s failed", failed + requeued, failed)
+    return failed + requeued
+
+
+def run_pending_jobs(limit: Optional[int] = None) -> int:
+    """
+    Recovers the stale jobs with `recover_stale_jobs`, runs the pending jobs,
+    the oldest first, and returns the count of jobs run.
+    """
+    recover_stale_jobs()
+    pending = models.Job.objects.filter(status=models.JobStatus.PENDING).order_by('created', 'pk')
+    ids = pending.values_list('pk', flat=True)
+    if limit is not None:
+        ids = ids[:limit]
+    return sum(run_job(job_id) is not None for job_id in list(ids))
+
+
+@task('generate_board')
+def generate_board(board_id: int) -> dict:
+    "Generates the layout of a pending board."
+    board = models.Board.objects.get(pk=board_id)
+    if board.pending:
+        board.generate_layout()
+    return {'board_id': board_id}
+
+
+def async_board_cells() -> int:
+    "Boards with this count of cells or more are created pending and generated by a job."
+    return getattr(settings, 'MINESWEEPER_ASYNC_BOARD_CELLS', 40_000)
+
+
+def create_pending_board(serializer, user) -> models.Board:
+    "Saves the board of the serializer without a layout and submits the job generating it."
+    with transaction.atomic():
+        board = serializer.save(user=user, pending=True, board_json=[])
+        board.job = submit('generate_board', {'board_id': board.pk}, user=user)
+        models.Board.objects.filter(pk=board.pk).update(job=board.job)
+    return board
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from ... import anticheat
+
+
+class Command(BaseCommand):
+    help = ("Analyzes the moves of the boards finished since the last run and flags games with "
+            "implausible click rates or guesses.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=anticheat.DEFAULT_BATCH_SIZE,
+            help="Count of boards analyzed at once.")
+        parser.add_argument('--workers', type=int, default=None,
+            help="Count of worker processes. The count of CPUs by default.")
+
+    def handle(self, *args, **options):
+        run = anticheat.analyze_finished_boards(options['batch_size'], options['workers'])
+        self.stdout.write(f"Analyzed {run.boards} boards")
@@ -0,0 +1,22 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ... import archiving
+
+
+class Command(BaseCommand):
+    help = ("Moves finished boards older than the retention period to the archived boards table. "
+        "Their moves and analyses are kept compressed in the archived boards.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int,
+            default=getattr(settings, 'MINESWEEPER_ARCHIVE_AFTER_DAYS', 30),
+            help="Archive finished boards not modified in this count of days.")
+        parser.add_argument('--batch-size', type=int, default=archiving.DEFAULT_BATCH_SIZE,
+            help="Count of boards moved on each transaction.")
+
+    def handle(self, *args, **options):
+        count = archiving.archive_finished_boards(datetime.timedelta(days=options['days']), options['batch_size'])
+        self.stdout.write(f"Archived {count} boards")
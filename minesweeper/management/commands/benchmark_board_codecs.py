@@ -0,0 +1,56 @@
+import json
+import random
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from ... import minesweeper
+
+
+class Command(BaseCommand):
+    help = ("Compares size and encode/decode time of the nested list JSON format and the run "
+            "length encoding for boards and display boards at several stages of a game.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=16)
+        parser.add_argument('--columns', type=int, default=30)
+        parser.add_argument('--mines', type=int, default=99)
+        parser.add_argument('--repeat', type=int, default=200, help="Runs of each measure.")
+        parser.add_argument('--seed', type=int, default=0)
+
+    def _measure(self, name: str, value, encode, decode, repeat: int):
+        encoded = encode(value)
+        encode_time = timeit.timeit(lambda: encode(value), number=repeat) / repeat
+        decode_time = timeit.timeit(lambda: decode(encoded), number=repeat) / repeat
+        self.stdout.write(f"  {name:<12} {len(encoded):>9} {encode_time * 1e6:>12.1f} {decode_time * 1e6:>12.1f}")
+
+    def _stages(self, options):
+        "Returns boards at the start, in the middle and at the end of a game."
+        random.seed(options['seed'])
+        board = minesweeper.Board(options['rows'], options['columns'], options['mines'])
+        yield 'new', board
+        safe_cells = [(row, col) for row in range(board.rows) for col in range(board.columns)
+            if not board.has_bomb(row, col)]
+        random.shuffle(safe_cells)
+        for row, col in safe_cells[:len(safe_cells) // 2]:
+            if not board.is_revealed(row, col):
+                board.reveal(row, col)
+        yield 'mid-game', board
+        board.reveal_board()
+        yield 'revealed', board
+
+    def handle(self, *args, **options):
+        rows, columns, repeat = options['rows'], options['columns'], options['repeat']
+        dumps = lambda value: json.dumps(value, separators=(',', ':'))
+        for stage, board in self._stages(options):
+            self.stdout.write(f"{stage} board {rows}x{columns}")
+            self.stdout.write(f"  {'format':<12} {'bytes':>9} {'encode (us)':>12} {'decode (us)':>12}")
+            self._measure('board json', board.board, dumps, json.loads, repeat)
+            self._measure('board rle', board.board, minesweeper.encode_board,
+                lambda data: minesweeper.decode_board(data, rows, columns), repeat)
+            display = board.get_display_board()
+            self._measure('display json', display, dumps, json.loads, repeat)
+            self._measure('display rows', display, lambda value: dumps(minesweeper.display_rows(value)),
+                json.loads, repeat)
+            self._measure('display rle', display, minesweeper.encode_display_rle,
+                lambda data: minesweeper.decode_display_rle(data, columns), repeat)
@@ -0,0 +1,19 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from ... import schema
+
+
+class Command(BaseCommand):
+    help = ("Writes the OpenAPI schema of the API as swagger.json and swagger.yaml. Outside debug "
+            "mode the schema endpoints serve these files.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-dir', type=Path, default=None,
+            help="Directory of the files. MINESWEEPER_SCHEMA_DIR by default.")
+
+    def handle(self, *args, **options):
+        paths = schema.write_schema(options['output_dir'] or schema.schema_dir())
+        for path in paths:
+            self.stdout.write(f"Wrote {path}")
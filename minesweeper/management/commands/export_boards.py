@@ -0,0 +1,40 @@
+import gzip
+
+from django.core.management.base import BaseCommand
+
+from ... import exporting
+from ... import models
+
+
+class Command(BaseCommand):
+    help = "Exports boards as JSON lines or CSV without loading the whole table in memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(exporting.FORMATS), default='jsonl')
+        parser.add_argument('--output', default='-',
+            help="Path of the output file. Paths ending with .gz are compressed. Standard output by default.")
+        parser.add_argument('--chunk-size', type=int, default=exporting.DEFAULT_CHUNK_SIZE,
+            help="Count of boards fetched from the database on each round trip.")
+        parser.add_argument('--finished', action='store_true', help="Export only finished boards.")
+        parser.add_argument('--archived', action='store_true',
+            help="Export the archived boards instead of the boards. Archived boards are always finished.")
+        parser.add_argument('--moves', action='store_true', help="Export the move history of the boards.")
+
+    def handle(self, *args, **options):
+        if options['archived']:
+            queryset = models.ArchivedBoard.objects.all()
+        else:
+            queryset = models.Board.objects.all()
+            if options['finished']:
+                queryset = queryset.filter(finished=True)
+        lines = exporting.export_boards(queryset, options['format'], options['chunk_size'], moves=options['moves'])
+        output = options['output']
+        if output == '-':
+            for line in lines:
+                self.stdout.write(line, ending='')
+        elif output.endswith('.gz'):
+            with gzip.open(output, 'wt', encoding='utf-8', newline='') as stream:
+                stream.writelines(lines)
+        else:
+            with open(output, 'w', encoding='utf-8', newline='') as stream:
+                stream.writelines(lines)
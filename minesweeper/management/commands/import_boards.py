@@ -0,0 +1,61 @@
+import contextlib
+import gzip
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from ... import importing
+
+
+class Command(BaseCommand):
+    help = "Imports boards exported with export_boards using bulk inserts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default=None,
+            help="File with the boards. Paths ending with .gz are decompressed. Use - for the standard input.")
+        parser.add_argument('--format', choices=sorted(importing.FORMATS),
+            help="Format of the boards file. Guessed from the extension by default.")
+        parser.add_argument('--batch-size', type=int, default=importing.DEFAULT_BATCH_SIZE,
+            help="Count of boards inserted on each query.")
+        parser.add_argument('--user',
+            help="Username of the owner of all the imported boards. By default the owners are "
+                 "looked up by the username of each board and created when missing.")
+        parser.add_argument('--templates',
+            help="JSON file with board templates in fixture format to import before the boards.")
+
+    @contextlib.contextmanager
+    def _open(self, path: str):
+        if path == '-':
+            # the standard input is left open for the rest of the process
+            yield sys.stdin
+        elif path.endswith('.gz'):
+            with gzip.open(path, 'rt', encoding='utf-8', newline='') as stream:
+                yield stream
+        else:
+            with open(path, encoding='utf-8', newline='') as stream:
+                yield stream
+
+    def handle(self, *args, **options):
+        if options['templates']:
+            with self._open(options['templates']) as stream:
+                count = importing.import_templates(json.load(stream))
+            self.stdout.write(f"Imported {count} templates")
+
+        path = options['path']
+        if path is None:
+            return
+        user = None
+        if options['user']:
+            try:
+                user = get_user_model().objects.get(username=options['user'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"User {options['user']} does not exist")
+        format = options['format']
+        if format is None:
+            name = path[:-3] if path.endswith('.gz') else path
+            format = 'csv' if name.endswith('.csv') else 'jsonl'
+        with self._open(path) as stream:
+            count = importing.import_boards(importing.FORMATS[format](stream), options['batch_size'], user)
+        self.stdout.write(f"Imported {count} boards")
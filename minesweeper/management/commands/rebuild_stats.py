@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from ... import stats
+
+
+class Command(BaseCommand):
+    help = ("Recomputes the daily and player statistics from the finished boards and the archived boards. "
+            "The statistics are updated when each game finishes, run it after importing boards.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000,
+            help="Count of boards read from the database at once.")
+
+    def handle(self, *args, **options):
+        count = stats.rebuild_stats(options['chunk_size'])
+        self.stdout.write(f"Rebuilt the statistics of {count} games")
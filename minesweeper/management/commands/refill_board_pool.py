@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ... import models
+
+
+class Command(BaseCommand):
+    help = "Fills the pools of pregenerated boards of every board template up to the watermark."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int,
+            default=getattr(settings, 'MINESWEEPER_BOARD_POOL_SIZE', 20),
+            help="Count of pregenerated boards to keep for each template.")
+        parser.add_argument('--template', type=int, action='append', dest='templates',
+            help="Id of the template to refill. Can be repeated. All templates by default.")
+        parser.add_argument('--loop', action='store_true',
+            help="Keep running and refill the pools periodically.")
+        parser.add_argument('--interval', type=float, default=5.0,
+            help="Seconds to wait between refills when running with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            templates = models.BoardTemplate.objects.all()
+            if options['templates']:
+                templates = templates.filter(pk__in=options['templates'])
+            for template in templates:
+                generated = template.refill_pool(options['size'])
+                if generated:
+                    self.stdout.write(f"{template}: generated {generated} boards")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
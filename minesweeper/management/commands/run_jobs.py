@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ... import jobs
+
+
+class Command(BaseCommand):
+    help = "Runs the pending jobs in this process."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int,
+            help="Count of jobs run at most in each pass. All the pending jobs by default.")
+        parser.add_argument('--loop', action='store_true',
+            help="Keep running and run the new jobs, as the worker of the database job backend.")
+        parser.add_argument('--interval', type=float, default=1.0,
+            help="Seconds to wait when there are no pending jobs, running with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            count = jobs.run_pending_jobs(options['limit'])
+            if count:
+                self.stdout.write(f"Ran {count} jobs")
+            if not options['loop']:
+                if not count:
+                    self.stdout.write("No pending jobs")
+                break
+            if not count:
+                time.sleep(options['interval'])
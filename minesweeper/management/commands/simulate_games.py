@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ... import models
+from ... import simulation
+
+
+class Command(BaseCommand):
+    help = ("Plays games with a bot strategy and prints the win rate, to compare the difficulty of the "
+            "board templates or of a board size.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, help="Rows of the board. All the templates by default.")
+        parser.add_argument('--columns', type=int, help="Columns of the board.")
+        parser.add_argument('--mines', type=int, help="Mines of the board.")
+        parser.add_argument('--games', type=int, default=1000, help="Count of games played for each size.")
+        parser.add_argument('--strategy', choices=sorted(simulation.STRATEGIES), default='rules',
+            help="Strategy of the bot.")
+        parser.add_argument('--workers', type=int, default=None,
+            help="Count of worker processes. The count of CPUs by default.")
+        parser.add_argument('--seed', type=int, default=0, help="Seed of the simulation.")
+
+    def handle(self, *args, **options):
+        if options['games'] < 1:
+            raise CommandError("--games must be a positive number.")
+        size = [options['rows'], options['columns'], options['mines']]
+        if any(value is not None for value in size):
+            if None in size:
+                raise CommandError("--rows, --columns and --mines must be given together.")
+            sizes = [tuple(size)]
+        else:
+            sizes = list(models.BoardTemplate.objects.values_list('rows', 'columns', 'mines'))
+        for rows, columns, mines in sizes:
+            result = simulation.simulate(rows, columns, mines, options['games'], options['strategy'],
+                options['seed'], options['workers'])
+            self.stdout.write(
+                f"{rows}x{columns} ({mines} mines): won {result.win_rate:.1%} of {result.games} games, "
+                f"{result.moves_per_game:.1f} moves per game, "
+                f"{result.games_per_second:.0f} games per second per process")
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from ... import startup
+
+
+class Command(BaseCommand):
+    help = ("Starts the application in a new process and prints the start time and the packages and "
+            "modules that take more time to import.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--api-only', action='store_true',
+            help="Starts the application with the API only profile.")
+        parser.add_argument('--limit', type=int, default=15, help="Count of packages and modules printed.")
+
+    def handle(self, *args, **options):
+        report = startup.measure_startup({'MINESWEEPER_API_ONLY': '1' if options['api_only'] else '0'})
+        limit = options['limit']
+        self.stdout.write(f"Started in {report.seconds:.3f} seconds, {len(report.imports)} modules imported")
+        self.stdout.write("\nPackages (milliseconds importing their modules):")
+        packages = sorted(report.packages().items(), key=lambda item: item[1], reverse=True)
+        for package, microseconds in packages[:limit]:
+            self.stdout.write(f"{microseconds / 1000:10.1f}  {package}")
+        self.stdout.write("\nModules (milliseconds without and with their imports):")
+        for item in sorted(report.imports, key=lambda item: item.self_us, reverse=True)[:limit]:
+            self.stdout.write(f"{item.self_us / 1000:10.1f} {item.cumulative_us / 1000:10.1f}  {item.module}")
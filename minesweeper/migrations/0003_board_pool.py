@@ -0,0 +1,32 @@
+# Generated by Django 3.2.25 on 2026-10-19 15:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('minesweeper', '0002_auto_20200907_0854'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='board',
+            options={'ordering': ['-modified'], 'verbose_name': 'Board', 'verbose_name_plural': 'Boards'},
+        ),
+        migrations.CreateModel(
+            name='PregeneratedBoard',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board_json', models.JSONField(editable=False, verbose_name='Board JSON')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Created')),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pregenerated_boards', to='minesweeper.boardtemplate', verbose_name='Template')),
+            ],
+            options={
+                'verbose_name': 'Pregenerated board',
+                'verbose_name_plural': 'Pregenerated boards',
+                'ordering': ['pk'],
+            },
+        ),
+    ]
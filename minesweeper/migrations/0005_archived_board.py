@@ -0,0 +1,53 @@
+# Generated by Django 3.2.25 on 2026-10-19 15:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('minesweeper', '0004_board_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedBoard',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rows', models.PositiveIntegerField(verbose_name='Rows')),
+                ('columns', models.PositiveIntegerField(verbose_name='Columns')),
+                ('mines', models.PositiveIntegerField(verbose_name='Mines')),
+                ('board_id', models.PositiveIntegerField(db_index=True, verbose_name='Board id')),
+                ('won', models.BooleanField(default=False, verbose_name='Won')),
+                ('data', models.BinaryField(verbose_name='Compressed board JSON')),
+                ('created', models.DateTimeField(verbose_name='Created')),
+                ('modified', models.DateTimeField(verbose_name='Modified')),
+                ('archived', models.DateTimeField(auto_now_add=True, verbose_name='Archived')),
+            ],
+            options={
+                'verbose_name': 'Archived board',
+                'verbose_name_plural': 'Archived boards',
+                'ordering': ['-modified'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='board',
+            index=models.Index(fields=['user', '-modified'], name='minesweeper_user_id_08f289_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='board',
+            index=models.Index(fields=['finished', 'modified'], name='minesweeper_finishe_1293f6_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedboard',
+            name='user',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='minesweeper_archived_boards', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='archivedboard',
+            index=models.Index(fields=['user', '-modified'], name='minesweeper_user_id_9dbcdd_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-19 15:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('minesweeper', '0005_archived_board'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='share_token',
+            field=models.CharField(blank=True, editable=False, max_length=32, null=True, unique=True, verbose_name='Share token'),
+        ),
+    ]
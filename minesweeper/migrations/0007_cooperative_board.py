@@ -0,0 +1,25 @@
+# Generated by Django 3.2.25 on 2026-10-19 15:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('minesweeper', '0006_board_share_token'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='cooperative',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Cooperative'),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='players',
+            field=models.ManyToManyField(blank=True, related_name='minesweeper_cooperative_boards', to=settings.AUTH_USER_MODEL, verbose_name='Players'),
+        ),
+    ]
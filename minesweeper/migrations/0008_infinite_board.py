@@ -0,0 +1,60 @@
+# Generated by Django 3.2.25 on 2026-10-19 15:33
+
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import minesweeper.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('minesweeper', '0007_cooperative_board'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InfiniteBoard',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seed', models.BigIntegerField(default=minesweeper.models.generate_seed, editable=False, verbose_name='Seed')),
+                ('density', models.FloatField(default=0.15, validators=[django.core.validators.MinValueValidator(0.01), django.core.validators.MaxValueValidator(0.9)], verbose_name='Mine density')),
+                ('chunk_size', models.PositiveSmallIntegerField(default=32, editable=False, verbose_name='Chunk size')),
+                ('revealed', models.PositiveIntegerField(default=0, editable=False, verbose_name='Revealed cells')),
+                ('finished', models.BooleanField(blank=True, default=False, editable=False, verbose_name='Finished')),
+                ('version', models.PositiveIntegerField(default=0, editable=False, verbose_name='Version')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Created')),
+                ('modified', models.DateTimeField(auto_now=True, verbose_name='Modified')),
+                ('user', models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='minesweeper_infinite_boards', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Infinite board',
+                'verbose_name_plural': 'Infinite boards',
+                'ordering': ['-modified'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BoardChunk',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row', models.IntegerField(verbose_name='Chunk row')),
+                ('column', models.IntegerField(verbose_name='Chunk column')),
+                ('data', models.TextField(verbose_name='Encoded cells')),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='minesweeper.infiniteboard')),
+            ],
+            options={
+                'verbose_name': 'Board chunk',
+                'verbose_name_plural': 'Board chunks',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='infiniteboard',
+            index=models.Index(fields=['user', '-modified'], name='minesweeper_user_id_7fafea_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='boardchunk',
+            unique_together={('board', 'row', 'column')},
+        ),
+    ]
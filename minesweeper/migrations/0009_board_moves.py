@@ -0,0 +1,53 @@
+# Generated by Django 3.2.25 on 2026-10-19 15:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('minesweeper', '0008_infinite_board'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='move_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Moves'),
+        ),
+        migrations.CreateModel(
+            name='BoardMove',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField(verbose_name='Number')),
+                ('operation', models.CharField(choices=[('mark_cell', 'Mark cell'), ('reveal_cell', 'Reveal cell')], max_length=16, verbose_name='Operation')),
+                ('row', models.PositiveIntegerField(verbose_name='Row')),
+                ('column', models.PositiveIntegerField(verbose_name='Column')),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Created')),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='moves', to='minesweeper.board')),
+            ],
+            options={
+                'verbose_name': 'Board move',
+                'verbose_name_plural': 'Board moves',
+                'ordering': ['board', 'number'],
+                'unique_together': {('board', 'number')},
+            },
+        ),
+        migrations.CreateModel(
+            name='BoardCheckpoint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField(verbose_name='Number')),
+                ('data', models.TextField(verbose_name='Encoded cells')),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkpoints', to='minesweeper.board')),
+            ],
+            options={
+                'verbose_name': 'Board checkpoint',
+                'verbose_name_plural': 'Board checkpoints',
+                'ordering': ['board', 'number'],
+                'unique_together': {('board', 'number')},
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 3.2.25 on 2026-10-19 15:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def set_finished_at(apps, schema_editor):
+    # the last modification of the finished boards is their finish date.
+    Board = apps.get_model('minesweeper', 'Board')
+    Board.objects.filter(finished=True).update(finished_at=models.F('modified'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('minesweeper', '0009_board_moves'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalysisRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started', models.DateTimeField(auto_now_add=True, verbose_name='Started')),
+                ('completed', models.DateTimeField(blank=True, null=True, verbose_name='Completed')),
+                ('boards', models.PositiveIntegerField(default=0, verbose_name='Analyzed boards')),
+                ('last_finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finish date of the last board')),
+                ('last_board_id', models.PositiveIntegerField(blank=True, null=True, verbose_name='Id of the last board')),
+            ],
+            options={
+                'verbose_name': 'Analysis run',
+                'verbose_name_plural': 'Analysis runs',
+                'ordering': ['-started'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BoardAnalysis',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('moves', models.PositiveIntegerField(verbose_name='Moves')),
+                ('duration', models.FloatField(verbose_name='Duration (seconds)')),
+                ('max_click_rate', models.FloatField(verbose_name='Max click rate (moves per second)')),
+                ('guesses', models.PositiveIntegerField(verbose_name='Guesses')),
+                ('survival_probability', models.FloatField(verbose_name='Probability of surviving the guesses')),
+                ('suspicious', models.BooleanField(db_index=True, default=False, verbose_name='Suspicious')),
+                ('reasons', models.JSONField(blank=True, default=list, verbose_name='Reasons')),
+                ('analyzed', models.DateTimeField(auto_now=True, verbose_name='Analyzed')),
+            ],
+            options={
+                'verbose_name': 'Board analysis',
+                'verbose_name_plural': 'Board analyses',
+                'ordering': ['-analyzed'],
+            },
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='finished_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Finished at'),
+        ),
+        migrations.AddIndex(
+            model_name='board',
+            index=models.Index(fields=['finished_at', 'id'], name='minesweeper_finishe_470f13_idx'),
+        ),
+        migrations.AddField(
+            model_name='boardanalysis',
+            name='board',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='analysis', to='minesweeper.board'),
+        ),
+        migrations.RunPython(set_finished_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.25 on 2026-10-19 15:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('minesweeper', '0010_board_analysis'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='practice',
+            field=models.BooleanField(default=False, help_text='The moves of practice boards can be undone.', verbose_name='Practice'),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='undo_history',
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name='Undo history'),
+        ),
+        migrations.AlterField(
+            model_name='boardmove',
+            name='operation',
+            field=models.CharField(choices=[('mark_cell', 'Mark cell'), ('reveal_cell', 'Reveal cell'), ('undo', 'Undo')], max_length=16, verbose_name='Operation'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 3.2.25 on 2026-10-19 15:56
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('minesweeper', '0011_board_undo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='minesweeper_stats', serialize=False, to='auth.user')),
+                ('played', models.PositiveIntegerField(default=0, verbose_name='Played')),
+                ('won', models.PositiveIntegerField(default=0, verbose_name='Won')),
+                ('seconds', models.FloatField(default=0.0, verbose_name='Seconds played')),
+                ('current_streak', models.PositiveIntegerField(default=0, verbose_name='Current win streak')),
+                ('best_streak', models.PositiveIntegerField(default=0, verbose_name='Best win streak')),
+                ('last_finished', models.DateTimeField(blank=True, null=True, verbose_name='Last game finished')),
+            ],
+            options={
+                'verbose_name': 'Player statistics',
+                'verbose_name_plural': 'Player statistics',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rows', models.PositiveIntegerField(verbose_name='Rows')),
+                ('columns', models.PositiveIntegerField(verbose_name='Columns')),
+                ('mines', models.PositiveIntegerField(verbose_name='Mines')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('played', models.PositiveIntegerField(default=0, verbose_name='Played')),
+                ('won', models.PositiveIntegerField(default=0, verbose_name='Won')),
+                ('seconds', models.FloatField(default=0.0, verbose_name='Seconds played')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='minesweeper_daily_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Daily statistics',
+                'verbose_name_plural': 'Daily statistics',
+                'ordering': ['-date', 'rows', 'columns', 'mines'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='dailystats',
+            index=models.Index(fields=['user', 'date'], name='minesweeper_user_id_cf5182_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailystats',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', False)), fields=('user', 'date', 'rows', 'columns', 'mines'), name='minesweeper_dailystats_user_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailystats',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', True)), fields=('date', 'rows', 'columns', 'mines'), name='minesweeper_dailystats_global_unique'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 3.2.25 on 2026-10-19 16:11
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('minesweeper', '0013_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedboard',
+            name='analysis',
+            field=models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True, verbose_name='Analysis'),
+        ),
+        migrations.AddField(
+            model_name='archivedboard',
+            name='history',
+            field=models.BinaryField(blank=True, null=True, verbose_name='Compressed move history'),
+        ),
+        migrations.AddField(
+            model_name='archivedboard',
+            name='suspicious',
+            field=models.BooleanField(db_index=True, default=False, verbose_name='Suspicious'),
+        ),
+    ]
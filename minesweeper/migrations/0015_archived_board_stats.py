@@ -0,0 +1,30 @@
+# Generated by Django 3.2.25 on 2026-10-19 16:22
+
+from django.db import migrations, models
+
+
+def set_finished_at(apps, schema_editor):
+    # the boards are archived when they are not modified after they finish.
+    ArchivedBoard = apps.get_model('minesweeper', 'ArchivedBoard')
+    ArchivedBoard.objects.update(finished_at=models.F('modified'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('minesweeper', '0014_archived_board_history'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedboard',
+            name='finished_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Finished at'),
+        ),
+        migrations.AddField(
+            model_name='archivedboard',
+            name='practice',
+            field=models.BooleanField(default=False, verbose_name='Practice'),
+        ),
+        migrations.RunPython(set_finished_at, migrations.RunPython.noop),
+    ]
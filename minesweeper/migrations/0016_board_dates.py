@@ -0,0 +1,24 @@
+# Generated by Django 3.2.25 on 2026-10-19 16:49
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('minesweeper', '0015_archived_board_stats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='board',
+            name='created',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Created'),
+        ),
+        migrations.AlterField(
+            model_name='board',
+            name='modified',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Modified'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 
+import base64
 import itertools
-from typing import Callable, Optional, Set, Tuple, Iterator, List, Any, Union, Iterable
+from typing import Callable, Dict, Optional, Set, Tuple, Iterator, List, Any, Union, Iterable
 import random
 import enum
 
@@ -24,15 +25,96 @@ class MineExplossionError(Exception):
     pass
 
 
+# one character codes of the display board values used by the compact formats
+DISPLAY_CODES = {' ': ' ', '!': '!', '?': '?', '*': '*', '**': 'X'}
+DISPLAY_CODES.update((str(count), str(count)) for count in range(9))
+
+# bits of the revealed cells without mine
+_SAFE_REVEALED_MASK = CellType.REVEALED | CellType.BOMB
+
+
+def display_rows(display: List[List[str]]) -> List[str]:
+    "Returns the display board as one string per row with a character per cell."
+    return [''.join([DISPLAY_CODES[value] for value in display_row]) for display_row in display]
+
+
+def rle_encode(values: Iterable[int]) -> bytes:
+    """
+    Encodes byte values as run length pairs. Each pair is a byte with the length
+    of the run (1-255) followed by the value.
+    """
+    result = bytearray()
+    append = result.append
+    previous = None
+    length = 0
+    for value in values:
+        if value == previous and length < 255:
+            length += 1
+            continue
+        if length:
+            append(length)
+            append(previous)
+        previous = value
+        length = 1
+    if length:
+        append(length)
+        append(previous)
+    return bytes(result)
+
+
+def rle_decode(data: bytes) -> List[int]:
+    "Decodes the run length pairs written by `rle_encode`."
+    result: List[int] = []
+    for i in range(0, len(data), 2):
+        result += [data[i + 1]] * data[i]
+    return result
+
+
+def encode_board(board: List[List[int]]) -> str:
+    "Returns the cells of the board encoded as base64 of run length pairs, row by row."
+    return base64.b64encode(rle_encode(itertools.chain.from_iterable(board))).decode('ascii')
+
+
+def decode_board(data: str, rows: int, columns: int) -> List[List[int]]:
+    "Returns the cells encoded by `encode_board` as a list of rows."
+    cells = rle_decode(base64.b64decode(data))
+    if len(cells) != rows * columns:
+        raise ValueError("the encoded board does not have the given size")
+    return [cells[row * columns:(row + 1) * columns] for row in range(rows)]
+
+
+def encode_display_rle(display: List[List[str]]) -> str:
+    """
+    Returns the display board encoded as base64 of run length pairs. Each pair
+    is a byte with the length of the run (1-255) followed by the ASCII code of
+    the cell character in `DISPLAY_CODES`. Cells are encoded row by row.
+    """
+    codes = ''.join(display_rows(display)).encode('ascii')
+    return base64.b64encode(rle_encode(codes)).decode('ascii')
+
+
+def decode_display_rle(data: str, columns: int) -> List[str]:
+    "Returns the rows of the display board encoded by `encode_display_rle` in the `display_rows` format."
+    cells = bytes(rle_decode(base64.b64decode(data))).decode('ascii')
+    return [cells[start:start + columns] for start in range(0, len(cells), columns)]
+
+
 class Board:
     "Mine sweeper board logic"
 
     rows: int
     columns: int
     mines: int
-    board: List[List[CellType]]
-
-    def __init__(self, rows: int, columns: int, mines: int):
+    _board: List[List[CellType]]
+    # rendered display rows and the rows changed since they were rendered.
+    _display: Optional[List[List[str]]] = None
+    _dirty_rows: Set[int]
+    # count of revealed cells without mine, computed when it is needed.
+    _safe_revealed: Optional[int] = None
+    # previous values of the cells changed since `record_changes` was called.
+    _changes: Optional[Dict[Tuple[int, int], int]] = None
+
+    def __init__(self, rows: int, columns: int, mines: int, rng: Optional[random.Random] = None):
         """
         Initialize a mine sweeper board. Mines are randomly placed.
 
@@ -44,6 +126,9 @@ class Board:
             Count of columns of the board.
         mines: int
             Count of mines to places on the board.
+        rng: random.Random
+            Random generator used to place the mines, for reproducible boards.
+            The `random` module is used by default.
         """
         if not rows:
             raise ValueError("row count cannot be empty")
@@ -54,17 +139,78 @@ class Board:
         self.rows = rows
         self.columns = columns
         self.mines = mines
+        self._rng = rng if rng is not None else random
         self.board = [[CellType.EMPTY]*columns for i in range(rows)]
         for row, col in self._random_cells():
             self.board[row][col] = CellType.BOMB
 
+    @property
+    def board(self) -> List[List[CellType]]:
+        return self._board
+
+    @board.setter
+    def board(self, value: List[List[CellType]]):
+        self._board = value
+        self.invalidate_display()
+
     def __getitem__(self, cell_pos: Tuple[int, int]) -> CellType:
         row, col = cell_pos
-        return self.board[row][col]
+        return self._board[row][col]
 
     def __setitem__(self, cell_pos: Tuple[int, int], value: Union[int, CellType]):
         row, col = cell_pos
-        self.board[row][col] = value # type: ignore
+        old_value = self._board[row][col]
+        self._board[row][col] = value # type: ignore
+        if self._changes is not None and cell_pos not in self._changes:
+            self._changes[cell_pos] = old_value
+        if self._safe_revealed is not None:
+            self._safe_revealed += (((value & _SAFE_REVEALED_MASK) == CellType.REVEALED)
+                - ((old_value & _SAFE_REVEALED_MASK) == CellType.REVEALED))
+        if self._display is not None:
+            if (old_value ^ value) & CellType.BOMB:
+                # the mine counts of the adjacent rows change too
+                self._dirty_rows.update(range(max(row - 1, 0), min(row + 2, self.rows)))
+            else:
+                self._dirty_rows.add(row)
+
+    def set_display(self, display: List[List[str]]):
+        """
+        Uses a display board rendered before for the current cells, for example
+        kept in a cache by a previous request, so only the rows changed after
+        this call are rendered by `get_display_board`.
+        """
+        if len(display) != self.rows:
+            raise ValueError("the display board does not have the rows of the board")
+        self._display = display
+        self._dirty_rows = set()
+
+    def invalidate_display(self):
+        """
+        Discards the rendered display board. Call it after modifying the lists
+        of `board` directly instead of using the methods of the class.
+        """
+        self._display = None
+        self._dirty_rows = set()
+        self._safe_revealed = None
+
+    def record_changes(self):
+        "Starts recording the previous values of the cells changed by the next operations."
+        self._changes = {}
+
+    def recorded_changes(self) -> List[int]:
+        """
+        Stops recording and returns the cells changed since `record_changes`
+        was called as a flat list of row, column and previous value triples.
+        Its size is proportional to the count of changed cells.
+        """
+        changes = self._changes or {}
+        self._changes = None
+        return [item for (row, column), value in changes.items() for item in (row, column, int(value))]
+
+    def restore_changes(self, changes: List[int]):
+        "Restores the previous values of the cells returned by `recorded_changes`."
+        for index in range(0, len(changes), 3):
+            self[changes[index], changes[index + 1]] = changes[index + 2]
 
     def _random_cell(self, omit: Set[Tuple[int, int]]) -> Tuple[int, int]:
         """Returns a random cell coordinate that is not in in `omit`
@@ -86,9 +232,10 @@ class Board:
         """
         if len(omit) > self.rows * self.columns:
             raise ValueError("the omit set if full of mines.")
-        result = (random.randint(0, self.rows-1), random.randint(0, self.columns-1))
+        randint = self._rng.randint
+        result = (randint(0, self.rows-1), randint(0, self.columns-1))
         while result in omit:
-            result = (random.randint(0, self.rows-1), random.randint(0, self.columns-1))
+            result = (randint(0, self.rows-1), randint(0, self.columns-1))
 
         return result
 
@@ -151,6 +298,18 @@ class Board:
                 result.append((check_row, check_col))
         return result
 
+    def count_adjacent_mines(self, row: int, column: int) -> int:
+        "Returns the count of mines around the cell. Faster than `adjacent_mines`."
+        count = 0
+        for near_row in self._board[max(row - 1, 0):row + 2]:
+            for value in near_row[max(column - 1, 0):column + 2]:
+                if value & CellType.BOMB:
+                    count += 1
+        # the cell itself
+        if self._board[row][column] & CellType.BOMB:
+            count -= 1
+        return count
+
     def adjacent_mines(self, row: int, column: int) -> List[Tuple[int, int]]:
         "Returns the count of mines around the cell."
         return self.adjacent_cells(row, column, self.has_bomb)
@@ -167,21 +326,28 @@ class Board:
         return []
 
     def is_finished(self):
-        revealed = 0
-        for row in range(self.rows):
-            for column in range(self.columns):
-                if not self.has_bomb(row, column) and self.is_revealed(row, column):
-                    revealed += 1
-        return revealed + self.mines == self.rows * self.columns
+        # the count is updated by `__setitem__` after it is computed once.
+        if self._safe_revealed is None:
+            self._safe_revealed = sum((value & _SAFE_REVEALED_MASK) == CellType.REVEALED
+                for row_cells in self._board for value in row_cells)
+        return self._safe_revealed + self.mines == self.rows * self.columns
+
+    def is_exploded(self) -> bool:
+        "Returns if a mine was revealed."
+        return any(cell & CellType.KABOOM for row_cells in self.board for cell in row_cells)
 
     def reveal_board(self):
         for row in range(self.rows):
             for column in range(self.columns):
                 self.add_type(row, column, CellType.REVEALED)
 
-    def reveal(self, row: int, column: int):
+    def reveal(self, row: int, column: int) -> List[Tuple[int, int]]:
+        """
+        Reveals the cell and the empty area around it. Returns the revealed
+        cells. Raises `MineExplossionError` when the cell has a mine.
+        """
         if self.is_type(row, column, CellType.FLAG|CellType.QUESTION|CellType.REVEALED|CellType.KABOOM):
-            return
+            return []
         if self.has_bomb(row, column):
             self.add_type(row, column, CellType.KABOOM)
             self.add_type(row, column, CellType.REVEALED)
@@ -190,41 +356,94 @@ class Board:
         if not self.is_empty(row, column):
             raise ValueError(f"Wrong cell value in cell {row},{column}")
 
-        processed: Set[Tuple[int, int]] = set()
-        queue = [(row, column)]
-        while queue:
-            cell = queue.pop(0)
-            processed.add(cell)
-
-            if self.is_empty(*cell):
-                self.add_type(cell_type=CellType.REVEALED, *cell)
-
-                if not self.adjacent_mines(*cell):
-                    is_unprocessed = lambda *cell: cell not in processed
-                    queue.extend(self.adjacent_cells(filter=is_unprocessed, *cell))
+        board = self._board
+        revealed = []
+        processed = {(row, column)}
+        stack = [(row, column)]
+        while stack:
+            cell = stack.pop()
+            cell_row, cell_column = cell
+            if board[cell_row][cell_column] != CellType.EMPTY:
+                continue
+            self[cell] = CellType.REVEALED
+            revealed.append(cell)
+            if self.count_adjacent_mines(cell_row, cell_column):
+                continue
+            for near_row in range(max(cell_row - 1, 0), min(cell_row + 2, self.rows)):
+                for near_column in range(max(cell_column - 1, 0), min(cell_column + 2, self.columns)):
+                    near = (near_row, near_column)
+                    if near not in processed:
+                        processed.add(near)
+                        stack.append(near)
         if self.is_finished():
             self.reveal_board()
-
-    def get_display_board(self):
+        return revealed
+
+    def _display_row(self, row: int, first_column: int = 0, end_column: Optional[int] = None) -> List[str]:
+        board = self._board
+        row_cells = board[row][first_column:end_column]
+        # rows used to count the mines around the cells of the row
+        near_rows = board[max(row - 1, 0):row + 2]
+        last_column = self.columns - 1
         result = []
-        for row, row_cells in enumerate(self.board):
-            display_row = []
-            for col, value in enumerate(row_cells):
-                if self.is_type(row, col, CellType.QUESTION):
-                    display_row.append('?')
-                elif self.is_type(row, col, CellType.FLAG):
-                    display_row.append('!')
-                elif self.is_type(row, col, CellType.KABOOM):
-                    display_row.append('**')
-                elif self.is_type(row, col, CellType.REVEALED):
-                    if self.is_type(row, col, CellType.KABOOM):
-                        display_row.append('**')
-                    if self.is_type(row, col, CellType.BOMB):
-                        display_row.append('*')
-                    else:
-                        mines_count = len(self.adjacent_mines(row, col))
-                        display_row.append(str(mines_count))
+        for col, value in enumerate(row_cells, first_column):
+            if value & CellType.QUESTION:
+                result.append('?')
+            elif value & CellType.FLAG:
+                result.append('!')
+            elif value & CellType.KABOOM:
+                result.append('**')
+            elif value & CellType.REVEALED:
+                if value & CellType.BOMB:
+                    result.append('*')
                 else:
-                    display_row.append(' ')
-            result.append(display_row)
+                    first = col - 1 if col else 0
+                    last = col + 2 if col < last_column else col + 1
+                    mines_count = 0
+                    for near_row in near_rows:
+                        for near_value in near_row[first:last]:
+                            if near_value & CellType.BOMB:
+                                mines_count += 1
+                    result.append(str(mines_count))
+            else:
+                result.append(' ')
+        return result
+
+    def get_display_board(self) -> List[List[str]]:
+        """
+        Returns the board as it is displayed to the player.
+
+        The rendered rows are kept and only the rows changed since the last call
+        are rendered again, so unchanged row lists are shared between the results
+        of consecutive calls and must not be modified.
+        """
+        if self._display is None:
+            self._display = [self._display_row(row) for row in range(self.rows)]
+        else:
+            for row in self._dirty_rows:
+                self._display[row] = self._display_row(row)
+        self._dirty_rows = set()
+        return list(self._display)
+
+    def clip_window(self, row: int, column: int, height: int, width: int) -> Tuple[int, int, int, int]:
+        "Returns the part of the rectangle inside the board as (row, column, height, width)."
+        first_row, first_column = max(row, 0), max(column, 0)
+        end_row, end_column = min(row + height, self.rows), min(column + width, self.columns)
+        return first_row, first_column, max(end_row - first_row, 0), max(end_column - first_column, 0)
+
+    def get_display_window(self, row: int, column: int, height: int, width: int) -> List[List[str]]:
+        """
+        Returns the cells of the rectangle as displayed to the player. The
+        rectangle is clipped with `clip_window`. Only the cells of the rectangle
+        are rendered; rows already rendered by `get_display_board` and not
+        changed since are sliced instead.
+        """
+        row, column, height, width = self.clip_window(row, column, height, width)
+        display = self._display
+        result = []
+        for current in range(row, row + height):
+            if display is not None and current not in self._dirty_rows:
+                result.append(display[current][column:column + width])
+            else:
+                result.append(self._display_row(current, column, column + width))
         return result
@@ -1,9 +1,49 @@
-from typing import List
+import hashlib
+import json
+import secrets
+import zlib
+from typing import Dict, List, Optional
 from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 
+from . import chunks
 from . import minesweeper
+from . import solver
+
+
+def decode_board_json(value, rows: int, columns: int) -> List[List[int]]:
+    "Returns the layout of a board stored as a list of rows or encoded with run lengths."
+    if isinstance(value, dict):
+        return minesweeper.decode_board(value['rle'], rows, columns)
+    return value
+
+
+def encode_board_json(layout: List[List[int]]):
+    """
+    Returns the value stored in `board_json` for the layout. With the `rle`
+    storage (`MINESWEEPER_BOARD_STORAGE` setting) the layout is encoded with run
+    lengths, otherwise it is stored as a list of rows.
+    """
+    if getattr(settings, 'MINESWEEPER_BOARD_STORAGE', 'grid') == 'rle':
+        return {'rle': minesweeper.encode_board(layout)}
+    return layout
+
+
+# boards with fewer cells are rendered faster than their display is read from the cache
+DISPLAY_CACHE_CELLS = 1000
+
+
+def display_cache_key(layout: List[List[int]]) -> str:
+    "Returns the cache key of the display board of the cells. It depends only on the cells."
+    digest = hashlib.blake2b(json.dumps(layout, separators=(',', ':')).encode(), digest_size=16)
+    return f'minesweeper:display:{digest.hexdigest()}'
 
 
 class BoardSize(models.Model):
@@ -21,46 +61,724 @@ class BoardTemplate(BoardSize):
         verbose_name_plural = _("Board templates")
         ordering = ['rows', 'columns', 'mines']
 
+    def __str__(self):
+        return f"{self.rows}x{self.columns} ({self.mines} mines)"
+
+    def refill_pool(self, size: int) -> int:
+        """
+        Generates layouts until the pool of this template holds `size` boards.
+
+        Returns
+        -------
+        result: int
+            Count of generated layouts.
+        """
+        missing = size - self.pregenerated_boards.count()
+        if missing <= 0:
+            return 0
+        PregeneratedBoard.objects.bulk_create([
+            PregeneratedBoard(template=self,
+                board_json=minesweeper.Board(self.rows, self.columns, self.mines).board)
+            for i in range(missing)
+        ])
+        return missing
+
+
+class PregeneratedBoardQuerySet(models.QuerySet):
+    def take(self, rows: int, columns: int, mines: int) -> Optional[list]:
+        """
+        Removes a layout for the given board size from the pool and returns it.
+        Returns `None` when the pool of the size is empty.
+        """
+        candidates = self.filter(template__rows=rows, template__columns=columns, template__mines=mines)
+        for i in range(3):
+            with transaction.atomic():
+                item = candidates.select_for_update(skip_locked=True).only('pk', 'board_json').first()
+                if item is None:
+                    return None
+                # another worker could have taken the layout when the database
+                # does not support row locks.
+                if self.filter(pk=item.pk).delete()[0]:
+                    return item.board_json
+        return None
+
+
+class PregeneratedBoard(models.Model):
+    "Mine layout generated ahead of time for a board template."
+    template = models.ForeignKey(BoardTemplate, on_delete=models.CASCADE,
+        related_name='pregenerated_boards', verbose_name=_("Template"))
+    board_json = models.JSONField(verbose_name=_("Board JSON"), editable=False)
+    created = models.DateTimeField(_("Created"), auto_now_add=True)
+
+    objects = PregeneratedBoardQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("Pregenerated board")
+        verbose_name_plural = _("Pregenerated boards")
+        ordering = ['pk']
+
+
+class MoveOperation(models.TextChoices):
+    MARK_CELL = 'mark_cell', _("Mark cell")
+    REVEAL_CELL = 'reveal_cell', _("Reveal cell")
+    UNDO = 'undo', _("Undo")
+
+
+class BoardQuerySet(models.QuerySet):
+    def for_user(self, user) -> 'BoardQuerySet':
+        "Returns the boards owned by the user and the cooperative boards where the user plays."
+        played = Board.players.through.objects.filter(user=user).values('board_id')
+        return self.filter(models.Q(user=user) | models.Q(pk__in=played))
+
 
 class Board(BoardSize):
     board_json = models.JSONField(verbose_name=_("Board JSON"), editable=False)
     finished = models.BooleanField(_("Finished"), blank=True, default=False, editable=False)
+    finished_at = models.DateTimeField(_("Finished at"), null=True, blank=True, editable=False)
+    version = models.PositiveIntegerField(_("Version"), default=0, editable=False)
+    move_count = models.PositiveIntegerField(_("Moves"), default=0, editable=False)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
         related_name='minesweeper_boards', editable=False)
-    created = models.DateTimeField(_("Created"), auto_now_add=True)
-    modified = models.DateTimeField(_("Modified"), auto_now=True)
+    players = models.ManyToManyField(settings.AUTH_USER_MODEL, blank=True,
+        related_name='minesweeper_cooperative_boards', verbose_name=_("Players"))
+    cooperative = models.BooleanField(_("Cooperative"), default=False, editable=False)
+    practice = models.BooleanField(_("Practice"), default=False,
+        help_text=_("The moves of practice boards can be undone."))
+    # cells changed by the last moves of practice boards, see `undo`
+    undo_history = models.JSONField(_("Undo history"), default=list, blank=True, editable=False)
+    share_token = models.CharField(_("Share token"), max_length=32, null=True, blank=True,
+        unique=True, editable=False)
+    # big boards are saved without a layout, generated later by `job`
+    pending = models.BooleanField(_("Pending"), default=False, editable=False,
+        help_text=_("The layout of the board is being generated."))
+    job = models.ForeignKey('Job', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='boards', editable=False, verbose_name=_("Job"))
+    # set by `save` instead of auto_now, so `bulk_create` keeps the dates of imported boards
+    created = models.DateTimeField(_("Created"), default=timezone.now, editable=False)
+    modified = models.DateTimeField(_("Modified"), default=timezone.now, editable=False)
+
+    objects = BoardQuerySet.as_manager()
 
     class Meta:
         verbose_name = _("Board")
         verbose_name_plural = _("Boards")
         ordering = ['-modified']
+        indexes = [
+            models.Index(fields=['user', '-modified']),
+            models.Index(fields=['finished', 'modified']),
+            models.Index(fields=['finished_at', 'id']),
+        ]
 
     def save(self, *args, **kwargs):
+        self.modified = timezone.now()
         if self.pk is None:
-            board = minesweeper.Board(self.rows, self.columns, self.mines)
-            self.board_json = board.board
-        return super().save(*args, **kwargs)
+            # a layout supplied by the caller (imports) is kept, pending boards get it from a job.
+            if not self.board_json and not self.pending:
+                self.board_json = self._new_layout()
+        else:
+            self.version += 1
+        layout = self.board_json
+        if isinstance(layout, list) and layout:
+            self.board_json = encode_board_json(layout)
+        try:
+            return super().save(*args, **kwargs)
+        finally:
+            self.board_json = layout
+
+    def _new_layout(self) -> List[List[int]]:
+        "Returns a layout of the pool of the board size or a new random layout."
+        layout = PregeneratedBoard.objects.take(self.rows, self.columns, self.mines)
+        if not layout:
+            layout = minesweeper.Board(self.rows, self.columns, self.mines).board
+        return layout
+
+    def generate_layout(self):
+        """
+        Generates the layout of a pending board and saves it. Raises
+        `DatabaseError` when the board was deleted meanwhile.
+        """
+        self.board_json = self._new_layout()
+        self.pending = False
+        # only these fields, so a deleted board is not inserted again
+        self.save(update_fields=['board_json', 'pending', 'version', 'modified'])
+
+    def get_layout(self) -> List[List[int]]:
+        "Returns the cells of the board as a list of rows, decoding `board_json` if it is encoded."
+        if isinstance(self.board_json, dict):
+            self.board_json = decode_board_json(self.board_json, self.rows, self.columns)
+        return self.board_json
 
     def get_minesweeper_board(self) -> minesweeper.Board:
-        board = minesweeper.Board(self.rows, self.columns, self.mines)
-        board.board = self.board_json
+        # the engine is kept while `board_json` is not replaced, so its rendered
+        # display board is reused between the update and the serialization.
+        layout = self.get_layout()
+        board = getattr(self, '_minesweeper_board', None)
+        if board is None or board.board is not layout:
+            board = minesweeper.Board(self.rows, self.columns, self.mines)
+            board.board = layout
+            self._minesweeper_board = board
+            # key of the display of the engine in the cache, see `_load_display`
+            self._display_key = None
+            self._display_loaded = False
         return board
 
-    def mark_cell(self, row: int, column: int):
+    def _uses_display_cache(self) -> bool:
+        # the actors of cooperative boards keep their engine between the moves
+        return not self.cooperative and not self.pending and self.rows * self.columns >= DISPLAY_CACHE_CELLS
+
+    def _load_display(self) -> minesweeper.Board:
+        """
+        Returns the engine with the display board of its cells kept in the
+        cache by a previous request, looked up once per engine. It is loaded
+        before the moves, so only the rows they change are rendered again.
+        """
         board = self.get_minesweeper_board()
+        if not self._display_loaded and self._uses_display_cache():
+            self._display_loaded = True
+            key = display_cache_key(self.get_layout())
+            display = cache.get(key)
+            if display is not None:
+                board.set_display(display)
+                self._display_key = key
+        return board
+
+    def mark_cell(self, row: int, column: int, save: bool = True):
+        board = self._load_display()
+        self._start_move()
         board.mark_cell(row, column)
-        self.save()
+        self._finish_move(MoveOperation.MARK_CELL, row, column, save)
 
-    def reveal_cell(self, row: int, column: int):
-        board = self.get_minesweeper_board()
+    def reveal_cell(self, row: int, column: int, save: bool = True):
+        board = self._load_display()
+        self._start_move()
+        won = False
         try:
             board.reveal(row, column)
             if board.is_finished():
-                self.finished = True
+                self.finished = won = True
         except minesweeper.MineExplossionError:
             self.finished = True
-        self.save()
+        finishing = self.finished and self.finished_at is None
+        if finishing:
+            self.finished_at = timezone.now()
+        with transaction.atomic():
+            self._finish_move(MoveOperation.REVEAL_CELL, row, column, save)
+            # the games of practice boards can be undone, they are not counted
+            if finishing and not self.practice:
+                DailyStats.add_game(self, won)
+                PlayerStats.add_game(self, won)
+
+    def undo(self, steps: int = 1, save: bool = True) -> int:
+        """
+        Reverts the last `steps` moves of a practice board and returns the count
+        of reverted moves, lower than `steps` when the undo history is shorter.
+        Only the last `MINESWEEPER_UNDO_DEPTH` moves can be reverted. Raises
+        `ValueError` when the board is not a practice board.
+        """
+        if not self.practice:
+            raise ValueError("only the moves of practice boards can be undone")
+        board = self._load_display()
+        undone = 0
+        while undone < steps and self.undo_history:
+            board.restore_changes(self.undo_history.pop())
+            undone += 1
+        if not undone:
+            return 0
+        self.finished = board.is_finished() or board.is_exploded()
+        if not self.finished:
+            self.finished_at = None
+        self._finish_move(MoveOperation.UNDO, undone, 0, save)
+        return undone
+
+    def _start_move(self):
+        # the state before the first move is the starting point of the replays.
+        if not self.move_count and not self.checkpoints.filter(number=0).exists():
+            self.checkpoints.create(number=0, data=minesweeper.encode_board(self.get_layout()))
+        if self.practice:
+            self.get_minesweeper_board().record_changes()
+
+    def _finish_move(self, operation: str, row: int, column: int, save: bool):
+        """
+        Records the move in the history of the board. Every
+        `MINESWEEPER_CHECKPOINT_EVERY` moves and after each undo the state of
+        the board is stored as a checkpoint, so replays do not apply the moves
+        from the start and never revert moves. The cells changed by the moves of
+        practice boards are kept in the undo history, which holds the last
+        `MINESWEEPER_UNDO_DEPTH` moves. Without `save` the move is kept until
+        `save_moves` is called, so it is not stored without the board.
+        """
+        self.move_count += 1
+        if self.practice and operation != MoveOperation.UNDO:
+            self.undo_history.append(self.get_minesweeper_board().recorded_changes())
+            del self.undo_history[:-getattr(settings, 'MINESWEEPER_UNDO_DEPTH', 20)]
+        checkpoint = (operation == MoveOperation.UNDO
+            or self.move_count % getattr(settings, 'MINESWEEPER_CHECKPOINT_EVERY', 50) == 0)
+        self._unsaved_rows = getattr(self, '_unsaved_rows', [])
+        self._unsaved_rows.append(BoardMove(board=self, number=self.move_count, operation=operation,
+            row=row, column=column))
+        if checkpoint:
+            self._unsaved_rows.append(BoardCheckpoint(board=self, number=self.move_count,
+                data=minesweeper.encode_board(self.get_layout())))
+        if save:
+            with transaction.atomic():
+                self.save_moves()
+                self.save()
+
+    def save_moves(self):
+        """
+        Stores the moves and checkpoints of the updates applied with
+        `save=False`. Call it in the transaction saving the board.
+        """
+        rows = getattr(self, '_unsaved_rows', [])
+        for model in (BoardMove, BoardCheckpoint):
+            model.objects.bulk_create([row for row in rows if isinstance(row, model)])
+        self._unsaved_rows = []
 
     def display_board(self) -> List[List[str]]:
+        """
+        Returns the board as displayed to the player. The display of big boards
+        is kept in the cache for the next requests.
+        """
+        board = self._load_display()
+        display = board.get_display_board()
+        if self._uses_display_cache():
+            key = display_cache_key(self.get_layout())
+            if key != self._display_key:
+                cache.set(key, display)
+                self._display_key = key
+        return display
+
+    def display_window(self, row: int, column: int, height: int, width: int) -> List[List[str]]:
+        "Returns the rectangle of the display board, clipped to the board."
         board = self.get_minesweeper_board()
-        return board.get_display_board()
+        return board.get_display_window(row, column, height, width)
+
+    def share(self) -> str:
+        "Creates the token used by spectators to follow the board and returns it."
+        if not self.share_token:
+            self.share_token = secrets.token_urlsafe(16)
+            Board.objects.filter(pk=self.pk).update(share_token=self.share_token)
+        return self.share_token
+
+    def unshare(self):
+        self.share_token = None
+        Board.objects.filter(pk=self.pk).update(share_token=None)
+
+    def add_player(self, user):
+        "Adds a player to the board. Boards with players are cooperative."
+        self.players.add(user)
+        if not self.cooperative:
+            self.cooperative = True
+            Board.objects.filter(pk=self.pk).update(cooperative=True)
+
+    def mine_probabilities(self) -> dict:
+        """
+        Returns the probability of having a mine for the hidden cells of the board.
+        The result is cached for the current version of the board.
+        """
+        cache_key = f'minesweeper:probabilities:{self.pk}:{self.version}'
+        result = cache.get(cache_key)
+        if result is not None:
+            return result
+        probabilities: dict = {}
+        default_probability = 0.0
+        if not self.finished:
+            probabilities, default_probability = solver.mine_probabilities(self.display_board(), self.mines)
+        result = {
+            'version': self.version,
+            'default_probability': default_probability,
+            'cells': [
+                {'row': row, 'column': column, 'probability': probability}
+                for (row, column), probability in sorted(probabilities.items())
+            ],
+        }
+        cache.set(cache_key, result)
+        return result
+
+
+class ArchivedBoard(BoardSize):
+    """
+    Finished board moved out of the boards table. The layout and the move
+    history are stored compressed, the analysis of the moves is kept as JSON.
+    """
+    board_id = models.PositiveIntegerField(_("Board id"), db_index=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+        related_name='minesweeper_archived_boards', editable=False)
+    won = models.BooleanField(_("Won"), default=False)
+    practice = models.BooleanField(_("Practice"), default=False)
+    data = models.BinaryField(_("Compressed board JSON"))
+    # initial layout and moves in the format of `analysis.analyze_game`
+    history = models.BinaryField(_("Compressed move history"), null=True, blank=True)
+    analysis = models.JSONField(_("Analysis"), null=True, blank=True, encoder=DjangoJSONEncoder)
+    suspicious = models.BooleanField(_("Suspicious"), default=False, db_index=True)
+    created = models.DateTimeField(_("Created"))
+    modified = models.DateTimeField(_("Modified"))
+    finished_at = models.DateTimeField(_("Finished at"), null=True, blank=True)
+    archived = models.DateTimeField(_("Archived"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Archived board")
+        verbose_name_plural = _("Archived boards")
+        ordering = ['-modified']
+        indexes = [
+            models.Index(fields=['user', '-modified']),
+        ]
+
+    @classmethod
+    def from_board(cls, board: Board, game: Optional[dict] = None,
+            analysis: Optional['BoardAnalysis'] = None) -> 'ArchivedBoard':
+        """
+        Returns the archived copy of the board with the `layout` and `moves` of
+        the game, as returned by `anticheat.load_games`, and its analysis.
+        """
+        layout = board.get_layout()
+        history = None
+        if game is not None:
+            history = zlib.compress(json.dumps({'layout': game['layout'], 'moves': game['moves']},
+                separators=(',', ':')).encode())
+        analysis_fields = None
+        if analysis is not None:
+            analysis_fields = {field.name: getattr(analysis, field.name) for field in analysis._meta.concrete_fields
+                if field.name not in ('id', 'board')}
+        return cls(
+            board_id=board.pk,
+            user_id=board.user_id,
+            rows=board.rows,
+            columns=board.columns,
+            mines=board.mines,
+            won=board.finished and not board.get_minesweeper_board().is_exploded(),
+            practice=board.practice,
+            data=zlib.compress(json.dumps(layout, separators=(',', ':')).encode()),
+            created=board.created,
+            modified=board.modified,
+            finished_at=board.finished_at,
+            history=history,
+            analysis=analysis_fields,
+            suspicious=bool(analysis_fields and analysis_fields['suspicious']),
+        )
+
+    def get_board_json(self) -> List[List[int]]:
+        return json.loads(zlib.decompress(self.data))
+
+    def get_game(self) -> Optional[dict]:
+        "Returns the game for `analysis.analyze_game`, or `None` when the board had no moves."
+        if self.history is None:
+            return None
+        game = json.loads(zlib.decompress(self.history))
+        game.update(board_id=self.board_id, rows=self.rows, columns=self.columns, mines=self.mines)
+        return game
+
+
+class BoardMove(models.Model):
+    """
+    Operation applied to a board. `number` is the count of moves of the board
+    after it. The `row` of undo moves is the count of reverted moves.
+    """
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='moves')
+    number = models.PositiveIntegerField(_("Number"))
+    operation = models.CharField(_("Operation"), max_length=16, choices=MoveOperation.choices)
+    row = models.PositiveIntegerField(_("Row"))
+    column = models.PositiveIntegerField(_("Column"))
+    created = models.DateTimeField(_("Created"), default=timezone.now)
+
+    class Meta:
+        verbose_name = _("Board move")
+        verbose_name_plural = _("Board moves")
+        ordering = ['board', 'number']
+        unique_together = [('board', 'number')]
+
+
+class BoardAnalysis(models.Model):
+    "Result of the analysis of the moves of a finished board, see `minesweeper.analysis`."
+    board = models.OneToOneField(Board, on_delete=models.CASCADE, related_name='analysis')
+    moves = models.PositiveIntegerField(_("Moves"))
+    duration = models.FloatField(_("Duration (seconds)"))
+    max_click_rate = models.FloatField(_("Max click rate (moves per second)"))
+    guesses = models.PositiveIntegerField(_("Guesses"))
+    survival_probability = models.FloatField(_("Probability of surviving the guesses"))
+    suspicious = models.BooleanField(_("Suspicious"), default=False, db_index=True)
+    reasons = models.JSONField(_("Reasons"), default=list, blank=True)
+    analyzed = models.DateTimeField(_("Analyzed"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("Board analysis")
+        verbose_name_plural = _("Board analyses")
+        ordering = ['-analyzed']
+
+
+class AnalysisRun(models.Model):
+    """
+    Run of `anticheat.analyze_finished_boards`. The finish date and id of the
+    last analyzed board are the starting point of the next run.
+    """
+    started = models.DateTimeField(_("Started"), auto_now_add=True)
+    completed = models.DateTimeField(_("Completed"), null=True, blank=True)
+    boards = models.PositiveIntegerField(_("Analyzed boards"), default=0)
+    last_finished_at = models.DateTimeField(_("Finish date of the last board"), null=True, blank=True)
+    last_board_id = models.PositiveIntegerField(_("Id of the last board"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Analysis run")
+        verbose_name_plural = _("Analysis runs")
+        ordering = ['-started']
+
+
+class BoardCheckpoint(models.Model):
+    "State of a board after `number` moves, encoded with `minesweeper.encode_board`."
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='checkpoints')
+    number = models.PositiveIntegerField(_("Number"))
+    data = models.TextField(_("Encoded cells"))
+
+    class Meta:
+        verbose_name = _("Board checkpoint")
+        verbose_name_plural = _("Board checkpoints")
+        ordering = ['board', 'number']
+        unique_together = [('board', 'number')]
+
+
+def _increment(model, key: dict, increments: dict, initial: dict):
+    "Applies the increments to the row of the model with the key, creating it with the initial values."
+    if model.objects.filter(**key).update(**increments):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, **initial)
+    except IntegrityError:
+        # created by a concurrent request
+        model.objects.filter(**key).update(**increments)
+
+
+class DailyStats(BoardSize):
+    """
+    Games of a board size finished in a day by a user, or by all the users when
+    `user` is null. Updated when each game finishes, so the statistics are read
+    without aggregating the boards.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True,
+        related_name='minesweeper_daily_stats')
+    date = models.DateField(_("Date"))
+    played = models.PositiveIntegerField(_("Played"), default=0)
+    won = models.PositiveIntegerField(_("Won"), default=0)
+    seconds = models.FloatField(_("Seconds played"), default=0.0)
+
+    class Meta:
+        verbose_name = _("Daily statistics")
+        verbose_name_plural = _("Daily statistics")
+        ordering = ['-date', 'rows', 'columns', 'mines']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date', 'rows', 'columns', 'mines'],
+                condition=models.Q(user__isnull=False), name='minesweeper_dailystats_user_unique'),
+            models.UniqueConstraint(fields=['date', 'rows', 'columns', 'mines'],
+                condition=models.Q(user__isnull=True), name='minesweeper_dailystats_global_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'date']),
+        ]
+
+    @classmethod
+    def add_game(cls, board: Board, won: bool):
+        "Adds the finished board to the statistics of its owner and of all the users."
+        seconds = (board.finished_at - board.created).total_seconds()
+        for user_id in [board.user_id, None]:
+            key = {'user_id': user_id, 'date': timezone.localdate(board.finished_at),
+                'rows': board.rows, 'columns': board.columns, 'mines': board.mines}
+            _increment(cls, key,
+                {'played': F('played') + 1, 'won': F('won') + int(won), 'seconds': F('seconds') + seconds},
+                {'played': 1, 'won': int(won), 'seconds': seconds})
+
+
+class PlayerStats(models.Model):
+    "Totals and win streaks of the finished games of a user, updated when each game finishes."
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True,
+        related_name='minesweeper_stats')
+    played = models.PositiveIntegerField(_("Played"), default=0)
+    won = models.PositiveIntegerField(_("Won"), default=0)
+    seconds = models.FloatField(_("Seconds played"), default=0.0)
+    current_streak = models.PositiveIntegerField(_("Current win streak"), default=0)
+    best_streak = models.PositiveIntegerField(_("Best win streak"), default=0)
+    last_finished = models.DateTimeField(_("Last game finished"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Player statistics")
+        verbose_name_plural = _("Player statistics")
+
+    @property
+    def average_seconds(self) -> float:
+        return self.seconds / self.played if self.played else 0.0
+
+    @classmethod
+    def add_game(cls, board: Board, won: bool):
+        "Adds the finished board to the statistics of its owner."
+        seconds = (board.finished_at - board.created).total_seconds()
+        increments = {'played': F('played') + 1, 'won': F('won') + int(won), 'seconds': F('seconds') + seconds,
+            'last_finished': board.finished_at}
+        if won:
+            # both expressions read the streak before the update
+            increments.update(current_streak=F('current_streak') + 1,
+                best_streak=Greatest('best_streak', F('current_streak') + 1))
+        else:
+            increments['current_streak'] = 0
+        _increment(cls, {'user_id': board.user_id}, increments,
+            {'played': 1, 'won': int(won), 'seconds': seconds, 'last_finished': board.finished_at,
+                'current_streak': int(won), 'best_streak': int(won)})
+
+
+def generate_seed() -> int:
+    return secrets.randbits(62)
+
+
+class JobStatus(models.TextChoices):
+    PENDING = 'pending', _("Pending")
+    RUNNING = 'running', _("Running")
+    DONE = 'done', _("Done")
+    FAILED = 'failed', _("Failed")
+
+
+class Job(models.Model):
+    "Operation run out of the request by the backend of `jobs`."
+    kind = models.CharField(_("Kind"), max_length=64)
+    params = models.JSONField(_("Parameters"), default=dict, blank=True)
+    status = models.CharField(_("Status"), max_length=16, choices=JobStatus.choices, default=JobStatus.PENDING)
+    result = models.JSONField(_("Result"), null=True, blank=True)
+    error = models.TextField(_("Error"), blank=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True,
+        related_name='minesweeper_jobs', verbose_name=_("User"))
+    created = models.DateTimeField(_("Created"), auto_now_add=True)
+    started = models.DateTimeField(_("Started"), null=True, blank=True)
+    finished = models.DateTimeField(_("Finished"), null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(_("Attempts"), default=0)
+
+    class Meta:
+        verbose_name = _("Job")
+        verbose_name_plural = _("Jobs")
+        ordering = ['-created']
+        indexes = [
+            models.Index(fields=['status', 'created']),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} {self.pk}'
+
+
+class InfiniteBoard(models.Model):
+    """
+    Board of unbounded size. The mines are generated by chunks from `seed` when
+    the game reaches them and only the chunks changed by the player are stored.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+        related_name='minesweeper_infinite_boards', editable=False)
+    seed = models.BigIntegerField(_("Seed"), default=generate_seed, editable=False)
+    density = models.FloatField(_("Mine density"), default=0.15,
+        validators=[MinValueValidator(0.01), MaxValueValidator(0.9)])
+    chunk_size = models.PositiveSmallIntegerField(_("Chunk size"), default=chunks.DEFAULT_CHUNK_SIZE,
+        editable=False)
+    revealed = models.PositiveIntegerField(_("Revealed cells"), default=0, editable=False)
+    finished = models.BooleanField(_("Finished"), blank=True, default=False, editable=False)
+    version = models.PositiveIntegerField(_("Version"), default=0, editable=False)
+    created = models.DateTimeField(_("Created"), auto_now_add=True)
+    modified = models.DateTimeField(_("Modified"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("Infinite board")
+        verbose_name_plural = _("Infinite boards")
+        ordering = ['-modified']
+        indexes = [
+            models.Index(fields=['user', '-modified']),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            self.version += 1
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._save_chunks()
+
+    def _load_chunks(self, keys: List[chunks.ChunkKey]) -> Dict[chunks.ChunkKey, chunks.Chunk]:
+        if self.pk is None:
+            return {}
+        rows = [key[0] for key in keys]
+        columns = [key[1] for key in keys]
+        wanted = set(keys)
+        stored = self.chunks.filter(row__range=(min(rows), max(rows)),
+            column__range=(min(columns), max(columns))).values_list('row', 'column', 'data')
+        return {
+            (row, column): minesweeper.decode_board(data, self.chunk_size, self.chunk_size)
+            for row, column, data in stored if (row, column) in wanted
+        }
+
+    def _save_chunks(self):
+        board: Optional[chunks.ChunkedBoard] = getattr(self, '_chunked_board', None)
+        if board is None or not board.changed_chunks:
+            return
+        data = {key: minesweeper.encode_board(board.get_chunk(key)) for key in board.changed_chunks}
+        existing = []
+        for pk, row, column in self.chunks.filter(
+                row__in={key[0] for key in data}, column__in={key[1] for key in data}
+                ).values_list('pk', 'row', 'column'):
+            if (row, column) in data:
+                existing.append(BoardChunk(pk=pk, data=data.pop((row, column))))
+        BoardChunk.objects.bulk_update(existing, ['data'])
+        BoardChunk.objects.bulk_create(
+            BoardChunk(board=self, row=row, column=column, data=value) for (row, column), value in data.items())
+        board.changed_chunks.clear()
+
+    def get_chunked_board(self) -> chunks.ChunkedBoard:
+        "Returns the engine of the board. Stored chunks are loaded when the game reaches them."
+        board = getattr(self, '_chunked_board', None)
+        if board is None:
+            board = chunks.ChunkedBoard(self.seed, self.density, self.chunk_size, loader=self._load_chunks)
+            self._chunked_board = board
+        return board
+
+    def mark_cell(self, row: int, column: int, save: bool = True):
+        self.get_chunked_board().mark_cell(row, column)
+        if save:
+            self.save()
+
+    def reveal_cell(self, row: int, column: int, save: bool = True):
+        try:
+            self.revealed += self.get_chunked_board().reveal(row, column)
+        except minesweeper.MineExplossionError:
+            self.finished = True
+        if save:
+            self.save()
+
+    def viewport_chunks(self, row: int, column: int, height: int, width: int,
+            limit: Optional[int] = None) -> List[chunks.ChunkKey]:
+        """
+        Returns the keys of the chunks with cells in the rectangle. Raises
+        `ValueError` when the rectangle spans more than `limit` chunks, before
+        building the keys.
+        """
+        first_row, first_column = row // self.chunk_size, column // self.chunk_size
+        last_row = (row + height - 1) // self.chunk_size
+        last_column = (column + width - 1) // self.chunk_size
+        if limit is not None and (last_row - first_row + 1) * (last_column - first_column + 1) > limit:
+            raise ValueError(f"The viewport spans more than {limit} chunks.")
+        return [(chunk_row, chunk_column) for chunk_row in range(first_row, last_row + 1)
+            for chunk_column in range(first_column, last_column + 1)]
+
+    def display_chunks(self, keys: List[chunks.ChunkKey]) -> List[dict]:
+        """
+        Returns the chunks as displayed to the player. The chunks and their
+        neighbours, needed to count the mines of the border cells, are loaded
+        with a single query.
+        """
+        board = self.get_chunked_board()
+        board.load_chunks({(row + diff_row, column + diff_column) for row, column in keys
+            for diff_row in (-1, 0, 1) for diff_column in (-1, 0, 1)})
+        return [{'row': row, 'column': column, 'display': board.display_chunk((row, column))}
+            for row, column in keys]
+
+
+class BoardChunk(models.Model):
+    "Chunk of an infinite board changed by the player, encoded with `minesweeper.encode_board`."
+    board = models.ForeignKey(InfiniteBoard, on_delete=models.CASCADE, related_name='chunks')
+    row = models.IntegerField(_("Chunk row"))
+    column = models.IntegerField(_("Chunk column"))
+    data = models.TextField(_("Encoded cells"))
+
+    class Meta:
+        verbose_name = _("Board chunk")
+        verbose_name_plural = _("Board chunks")
+        unique_together = [('board', 'row', 'column')]
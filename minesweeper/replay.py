@@ -0,0 +1,103 @@
+"""
+Reconstruction of past states of boards from their move history.
+
+The moves of a board are recorded with the state of the board every
+`MINESWEEPER_CHECKPOINT_EVERY` moves (and before the first move). The state
+after a move is rebuilt from the nearest checkpoint before it, so the cost
+depends on the distance to the checkpoint and not on the length of the game.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import minesweeper
+from . import models
+
+
+def apply_move(board: minesweeper.Board, operation: str, row: int, column: int):
+    """
+    Applies a recorded move to the engine like `models.Board` does. Undo
+    moves are not applied, the state after them is read from their checkpoint.
+    """
+    if operation == models.MoveOperation.MARK_CELL:
+        board.mark_cell(row, column)
+    elif operation == models.MoveOperation.REVEAL_CELL:
+        try:
+            board.reveal(row, column)
+        except minesweeper.MineExplossionError:
+            pass
+
+
+def _checkpoint(board: models.Board, number: int) -> Tuple[int, minesweeper.Board]:
+    "Returns the nearest checkpoint at or before the move and the engine with its state."
+    checkpoint = board.checkpoints.filter(number__lte=number).order_by('-number').values_list(
+        'number', 'data').first()
+    engine = minesweeper.Board(board.rows, board.columns, board.mines)
+    if checkpoint is None:
+        # boards without moves do not have checkpoints yet
+        if board.move_count:
+            raise ValueError("the board does not have a history")
+        engine.board = [list(row) for row in board.get_layout()]
+        return 0, engine
+    engine.board = minesweeper.decode_board(checkpoint[1], board.rows, board.columns)
+    return checkpoint[0], engine
+
+
+def _moves(board: models.Board, start: int, end: Optional[int]):
+    moves = board.moves.filter(number__gt=start)
+    if end is not None:
+        moves = moves.filter(number__lte=end)
+    return moves.order_by('number').values_list('number', 'operation', 'row', 'column')
+
+
+def state_at(board: models.Board, number: int) -> minesweeper.Board:
+    """
+    Returns the engine with the state of the board after `number` moves.
+    Raises `ValueError` when the move does not exist.
+    """
+    if not 0 <= number <= board.move_count:
+        raise ValueError("the board does not have the move")
+    start, engine = _checkpoint(board, number)
+    for _number, operation, row, column in _moves(board, start, number):
+        apply_move(engine, operation, row, column)
+    return engine
+
+
+def display_diff(before: List[List[str]], after: List[List[str]]) -> List[Tuple[int, int, str]]:
+    "Returns the cells that changed between two display boards as (row, column, value)."
+    cells = []
+    for row, (before_row, after_row) in enumerate(zip(before, after)):
+        # unchanged rows are shared by the display boards of the engine
+        if before_row is after_row:
+            continue
+        cells.extend((row, column, value) for column, (old, value) in enumerate(zip(before_row, after_row))
+            if old != value)
+    return cells
+
+
+def iter_diffs(board: models.Board, start: int = 0, end: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Returns an iterator with the state of the board after `start` moves
+    followed by the cells changed by each move until `end` (the last move by
+    default). The moves are read from the database in chunks. Raises
+    `ValueError` when the `start` move does not exist.
+    """
+    engine = state_at(board, start)
+    return _iter_diffs(board, engine, start, end)
+
+
+def _iter_diffs(board: models.Board, engine: minesweeper.Board, start: int,
+        end: Optional[int]) -> Iterator[Dict[str, Any]]:
+    display = engine.get_display_board()
+    yield {'move': start, 'display_board': minesweeper.display_rows(display)}
+    for number, operation, row, column in _moves(board, start, end).iterator():
+        if operation == models.MoveOperation.UNDO:
+            _number, engine = _checkpoint(board, number)
+        else:
+            apply_move(engine, operation, row, column)
+        new_display = engine.get_display_board()
+        cells = display_diff(display, new_display)
+        yield {
+            'move': number, 'operation': operation, 'row': row, 'column': column,
+            'cells': [[cell_row, cell_column, minesweeper.DISPLAY_CODES[value]]
+                for cell_row, cell_column, value in cells],
+        }
+        display = new_display
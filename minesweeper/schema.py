@@ -0,0 +1,102 @@
+"""
+OpenAPI schema of the API.
+
+Generating the schema introspects every view and serializer, so outside debug
+mode it is not generated by the requests: the `build_api_schema` command writes
+it to `MINESWEEPER_SCHEMA_DIR` at build time and `StaticSchemaView` serves the
+written files.
+"""
+import functools
+import hashlib
+import logging
+from pathlib import Path
+from typing import List, NamedTuple
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.views.generic import View
+
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+
+logger = logging.getLogger(__name__)
+
+
+API_INFO = openapi.Info(
+    title="MineSweeper API",
+    default_version='v1',
+    description="REST endpoint for playing minesweeper games",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="kverdecia@gmail.com"),
+    license=openapi.License(name="MIT License"),
+)
+
+CODECS = {'.json': OpenAPICodecJson, '.yaml': OpenAPICodecYaml}
+
+# seconds the clients can keep the schema without checking it again
+SCHEMA_MAX_AGE = 3600
+
+
+def schema_dir() -> Path:
+    return Path(getattr(settings, 'MINESWEEPER_SCHEMA_DIR', settings.BASE_DIR / 'schema'))
+
+
+def generate_schema(format: str) -> bytes:
+    """
+    Generates the public schema of the API encoded with the format, `.json` or
+    `.yaml`. The views are introspected with an anonymous request and the
+    schema has no host, the clients use the host serving it.
+    """
+    request = APIView().initialize_request(APIRequestFactory().get(f'/swagger{format}'))
+    schema = OpenAPISchemaGenerator(API_INFO, url='').get_schema(request=request, public=True)
+    return CODECS[format](validators=[]).encode(schema)
+
+
+def write_schema(directory: Path) -> List[Path]:
+    "Writes the schema in every format to `directory` and returns the paths of the files."
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for format in CODECS:
+        path = directory / f'swagger{format}'
+        path.write_bytes(generate_schema(format))
+        paths.append(path)
+    return paths
+
+
+class SchemaFile(NamedTuple):
+    content: bytes
+    etag: str
+
+
+@functools.lru_cache(maxsize=None)
+def load_schema(format: str) -> SchemaFile:
+    """
+    Returns the schema written by `build_api_schema`. It is read once per
+    process. When the file is missing the schema is generated and kept in
+    memory instead.
+    """
+    path = schema_dir() / f'swagger{format}'
+    try:
+        content = path.read_bytes()
+    except FileNotFoundError:
+        logger.warning("%s not found, run the build_api_schema command", path)
+        content = generate_schema(format)
+    return SchemaFile(content, hashlib.sha1(content).hexdigest())
+
+
+class StaticSchemaView(View):
+    "Serves the schema written by `build_api_schema`."
+    content_types = {'.json': 'application/json', '.yaml': 'application/yaml'}
+
+    @method_decorator(cache_control(public=True, max_age=SCHEMA_MAX_AGE))
+    @method_decorator(condition(etag_func=lambda request, format: load_schema(format).etag))
+    def get(self, request, format):
+        return HttpResponse(load_schema(format).content, content_type=self.content_types[format])
@@ -1,9 +1,13 @@
-from re import U
+from typing import List
+
 from django.utils.translation import ugettext_lazy as _
 from django.db.models import TextChoices
 
 from rest_framework import serializers
 
+from drf_yasg.utils import swagger_serializer_method
+
+from . import minesweeper
 from . import models
 
 
@@ -13,24 +17,130 @@ class BoardTemplateSerializer(serializers.ModelSerializer):
         fields = ('id', 'rows', 'columns', 'mines')
 
 
+class DisplayFormat(TextChoices):
+    GRID = 'grid', _("List of rows with a string per cell")
+    ROWS = 'rows', _("String per row with a character per cell")
+    RLE = 'rle', _("Base64 of run length pairs of (length, character) bytes")
+
+
+def format_display(display: List[List[str]], display_format: str):
+    "Returns the display board in the given `DisplayFormat`."
+    if display_format == DisplayFormat.ROWS:
+        return minesweeper.display_rows(display)
+    if display_format == DisplayFormat.RLE:
+        return minesweeper.encode_display_rle(display)
+    return display
+
+
 class BoardSerializer(serializers.ModelSerializer):
+    """
+    Serializes a board. The format of `display_board` is taken from the
+    `display_format` key of the context. When the context has a `window`
+    (row, column, height, width) only that rectangle of the board is displayed.
+    Pending boards, whose layout is being generated by `job`, are not displayed.
+    """
+    display_board = serializers.SerializerMethodField()
+    window = serializers.SerializerMethodField()
+
+    class Meta:
+        model = models.Board
+        fields = (
+            'id', 'rows', 'columns', 'mines', 'finished', 'user',
+            'cooperative', 'practice', 'pending', 'job', 'created', 'modified', 'version',
+            'display_board', 'window'
+        )
+
+    @swagger_serializer_method(serializer_or_field=serializers.DictField(child=serializers.IntegerField(),
+        allow_null=True, help_text=_("Rectangle of the board in `display_board` as row, column, "
+        "height and width, or null when the whole board is displayed.")))
+    def get_window(self, obj: models.Board):
+        window = self.context.get('window')
+        if window is None or obj.pending:
+            return None
+        row, column, height, width = obj.get_minesweeper_board().clip_window(*window)
+        return {'row': row, 'column': column, 'height': height, 'width': width}
+
+    @swagger_serializer_method(serializer_or_field=serializers.JSONField(help_text=_(
+        "Board as displayed to the player. With the `grid` format (default) it is a list of rows "
+        "where each cell is one of ' ' (hidden), '!' (flag), '?' (question), '*' (mine), "
+        "'**' (exploded mine) or the count of adjacent mines. With the `rows` format it is a "
+        "list of strings with a character per cell where the exploded mine is 'X'. With the "
+        "`rle` format it is a base64 string of (run length, character) byte pairs of the cells "
+        "of the `rows` format read row by row. Null while the board is pending."
+    )))
+    def get_display_board(self, obj: models.Board):
+        if obj.pending:
+            return None
+        window = self.context.get('window')
+        display = obj.display_board() if window is None else obj.display_window(*window)
+        return format_display(display, self.context.get('display_format', DisplayFormat.GRID))
+
+
+class SpectatorBoardSerializer(BoardSerializer):
+    "Read only view of a shared board. It does not include the owner."
     class Meta:
         model = models.Board
         fields = (
             'id', 'rows', 'columns', 'mines', 'finished',
-            'user', 'created', 'modified', 'display_board'
+            'created', 'modified', 'version', 'display_board'
         )
 
 
-class UpdateCellOperation(TextChoices):
-    MARK_CELL = 'mark_cell', _("Mark cell")
-    REVEAL_CELL = 'reveal_cell', _("Reveal cell")
+class ShareBoardSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.Board
+        fields = ('share_token',)
+        read_only_fields = ('share_token',)
+
+
+class CellProbabilitySerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    column = serializers.IntegerField()
+    probability = serializers.FloatField()
+
+
+class BoardProbabilitiesSerializer(serializers.Serializer):
+    version = serializers.IntegerField(help_text=_("Version of the board used to compute the probabilities."))
+    default_probability = serializers.FloatField(
+        help_text=_("Probability of the hidden cells that are not next to a revealed cell."))
+    cells = CellProbabilitySerializer(many=True,
+        help_text=_("Probabilities of the hidden cells next to revealed cells."))
+
+
+UpdateCellOperation = models.MoveOperation
+
+
+class ReplayStateSerializer(serializers.Serializer):
+    "State of a board after a move of its history."
+    move = serializers.IntegerField(help_text=_("Count of moves applied to the board."))
+    move_count = serializers.IntegerField(help_text=_("Count of moves of the board."))
+    finished = serializers.BooleanField()
+    display_board = serializers.SerializerMethodField()
+
+    @swagger_serializer_method(serializer_or_field=serializers.JSONField(
+        help_text=_("Board as displayed to the player after the move, in the requested format.")))
+    def get_display_board(self, obj: dict):
+        return format_display(obj['board'].get_display_board(),
+            self.context.get('display_format', DisplayFormat.GRID))
+
+
+class ReplaySerializer(serializers.Serializer):
+    move = serializers.IntegerField(min_value=0, required=False,
+        help_text=_("Move of the returned state. The last move by default."))
+
+
+class ReplayStreamSerializer(serializers.Serializer):
+    start = serializers.IntegerField(min_value=0, default=0, help_text=_("Move of the first state."))
+    end = serializers.IntegerField(min_value=0, required=False, help_text=_("Last move. The last move by default."))
 
 
 class UpdateCellSerializer(serializers.Serializer):
-    row = serializers.IntegerField(write_only=True)
-    column = serializers.IntegerField(write_only=True)
+    "The `undo` operation reverts the last `steps` moves of practice boards, it does not use a cell."
+    row = serializers.IntegerField(write_only=True, required=False)
+    column = serializers.IntegerField(write_only=True, required=False)
     operation = serializers.ChoiceField(write_only=True, choices=UpdateCellOperation.choices)
+    steps = serializers.IntegerField(write_only=True, min_value=1, default=1,
+        help_text=_("Count of moves reverted by the undo operation."))
 
     class Meta:
         model = models.Board
@@ -44,10 +154,147 @@ class UpdateCellSerializer(serializers.Serializer):
             'user', 'created', 'modified'
         )
 
+    def validate(self, data):
+        # infinite boards are never pending
+        if getattr(self.instance, 'pending', False):
+            raise serializers.ValidationError(_("The board is being generated, try again later."))
+        if data['operation'] == UpdateCellOperation.UNDO:
+            if self.instance is not None and not self.instance.practice:
+                raise serializers.ValidationError({'operation': [_("Only practice boards can undo moves.")]})
+        else:
+            missing = {field: [_("This field is required.")] for field in ['row', 'column'] if field not in data}
+            if missing:
+                raise serializers.ValidationError(missing)
+            self.validate_cell(data['row'], data['column'])
+        return data
+
+    def validate_cell(self, row: int, column: int):
+        "Raises `ValidationError` when the cell is outside the board."
+        if self.instance is None:
+            return
+        errors = {}
+        if not 0 <= row < self.instance.rows:
+            errors['row'] = [_("The row must be between 0 and {}.").format(self.instance.rows - 1)]
+        if not 0 <= column < self.instance.columns:
+            errors['column'] = [_("The column must be between 0 and {}.").format(self.instance.columns - 1)]
+        if errors:
+            raise serializers.ValidationError(errors)
+
     def update(self, instance: models.Board, validated_data):
-        if validated_data['operation'] == UpdateCellOperation.MARK_CELL:
-            instance.mark_cell(validated_data['row'], validated_data['column'])
-        elif validated_data['operation'] == UpdateCellOperation.REVEAL_CELL:
-            instance.reveal_cell(validated_data['row'], validated_data['column'])
-        self._data = BoardSerializer(instance).data
+        apply_cell_update(instance, validated_data)
+        self._data = BoardSerializer(instance, context=self.context).data
+        return instance
+
+
+def apply_cell_update(board: models.Board, validated_data: dict, save: bool = True):
+    "Applies the operation validated by `UpdateCellSerializer` to the board."
+    if validated_data['operation'] == UpdateCellOperation.MARK_CELL:
+        board.mark_cell(validated_data['row'], validated_data['column'], save=save)
+    elif validated_data['operation'] == UpdateCellOperation.REVEAL_CELL:
+        board.reveal_cell(validated_data['row'], validated_data['column'], save=save)
+    elif validated_data['operation'] == UpdateCellOperation.UNDO:
+        board.undo(validated_data['steps'], save=save)
+
+
+class PlayerSerializer(serializers.Serializer):
+    username = serializers.CharField(max_length=150)
+
+
+class StatsQuerySerializer(serializers.Serializer):
+    days = serializers.IntegerField(min_value=1, max_value=366, default=30,
+        help_text=_("Count of days of the statistics by board size, including today."))
+
+
+class SizeStatsSerializer(serializers.Serializer):
+    rows = serializers.IntegerField()
+    columns = serializers.IntegerField()
+    mines = serializers.IntegerField()
+    played = serializers.IntegerField()
+    won = serializers.IntegerField()
+    average_seconds = serializers.FloatField()
+
+
+class PlayerStatsSerializer(serializers.ModelSerializer):
+    average_seconds = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = models.PlayerStats
+        fields = ('played', 'won', 'average_seconds', 'current_streak', 'best_streak', 'last_finished')
+
+
+class StatsSerializer(serializers.Serializer):
+    days = serializers.IntegerField()
+    player = PlayerStatsSerializer(help_text=_("Totals of all the games of the user."))
+    sizes = SizeStatsSerializer(many=True, help_text=_("Games of the user in the last days by board size."))
+    global_sizes = SizeStatsSerializer(many=True,
+        help_text=_("Games of all the users in the last days by board size."))
+
+
+class TokenSerializer(serializers.Serializer):
+    token = serializers.CharField(read_only=True)
+    expires = serializers.DateTimeField(read_only=True)
+
+
+class InfiniteBoardSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.InfiniteBoard
+        fields = (
+            'id', 'density', 'chunk_size', 'revealed', 'finished',
+            'user', 'created', 'modified', 'version',
+        )
+
+
+class BoardChunkSerializer(serializers.Serializer):
+    row = serializers.IntegerField(help_text=_("Row of the chunk. The first cell row is `row * chunk_size`."))
+    column = serializers.IntegerField(
+        help_text=_("Column of the chunk. The first cell column is `column * chunk_size`."))
+    display = serializers.ListField(child=serializers.CharField(trim_whitespace=False), help_text=_(
+        "Rows of the chunk as displayed to the player with a character per cell, using the "
+        "characters of the `rows` display format."))
+
+
+# cells of a side of the viewport at most
+MAX_VIEWPORT_SIZE = 2048
+
+
+class ViewportSerializer(serializers.Serializer):
+    "Rectangle of cells visible to the player."
+    row = serializers.IntegerField(default=0)
+    column = serializers.IntegerField(default=0)
+    height = serializers.IntegerField(min_value=1, max_value=MAX_VIEWPORT_SIZE, default=32)
+    width = serializers.IntegerField(min_value=1, max_value=MAX_VIEWPORT_SIZE, default=32)
+
+
+class UpdateInfiniteCellSerializer(UpdateCellSerializer):
+    """
+    Updates a cell of an infinite board. The response has the board and the
+    chunks changed by the operation. The moves of infinite boards can not be
+    undone.
+    """
+    operation = serializers.ChoiceField(write_only=True, choices=[
+        choice for choice in UpdateCellOperation.choices if choice[0] != UpdateCellOperation.UNDO])
+    steps = None
+
+    def validate(self, data):
+        if self.instance is not None and self.instance.finished:
+            raise serializers.ValidationError(_("The game is finished."))
+        return super().validate(data)
+
+    def validate_cell(self, row: int, column: int):
+        # the cells of infinite boards have no bounds
+        pass
+
+    def update(self, instance: models.InfiniteBoard, validated_data):
+        board = instance.get_chunked_board()
+        apply_cell_update(instance, validated_data, save=False)
+        changed = sorted(board.changed_chunks)
+        instance.save()
+        self._data = dict(InfiniteBoardSerializer(instance, context=self.context).data,
+            chunks=BoardChunkSerializer(instance.display_chunks(changed), many=True).data)
         return instance
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.Job
+        fields = ('id', 'kind', 'status', 'params', 'result', 'error', 'created', 'started', 'finished')
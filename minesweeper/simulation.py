@@ -0,0 +1,249 @@
+"""
+Headless simulation of games played by bots.
+
+A strategy chooses the cells to reveal using only what a player could see.
+`simulate` plays many games of a board size, distributed in a pool of
+processes, and returns the aggregated results. Every game has its own random
+generator seeded from the seed of the simulation and the index of the game, so
+a simulation is reproducible and does not depend on the count of processes.
+"""
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple, Type
+
+from . import minesweeper
+from . import solver
+
+
+Cell = Tuple[int, int]
+
+_neighbours_cache: Dict[Tuple[int, int], List[List[List[Cell]]]] = {}
+
+
+def neighbours(rows: int, columns: int) -> List[List[List[Cell]]]:
+    "Returns the adjacent cells of every cell of a board size. The result is shared by the games of the size."
+    key = (rows, columns)
+    if key not in _neighbours_cache:
+        _neighbours_cache[key] = [[
+            [(near_row, near_column)
+                for near_row in range(max(row - 1, 0), min(row + 2, rows))
+                for near_column in range(max(column - 1, 0), min(column + 2, columns))
+                if (near_row, near_column) != (row, column)]
+            for column in range(columns)] for row in range(rows)]
+    return _neighbours_cache[key]
+
+
+class Strategy:
+    "Chooses the cells revealed by a bot."
+    name = ''
+
+    def __init__(self, board: minesweeper.Board, rng: random.Random):
+        self.board = board
+        self.rng = rng
+        self.hidden = [(row, column) for row in range(board.rows) for column in range(board.columns)]
+
+    def next_cell(self) -> Cell:
+        "Returns the next cell to reveal."
+        raise NotImplementedError
+
+    def revealed(self, cells: List[Cell]):
+        "Called with the cells revealed by the last move."
+
+    def random_cell(self, exclude=frozenset()) -> Cell:
+        """
+        Returns a random hidden cell that is not in `exclude`. The revealed and
+        the excluded cells found are dropped from `hidden`.
+        """
+        hidden = self.hidden
+        is_revealed = self.board.is_revealed
+        while True:
+            index = self.rng.randrange(len(hidden))
+            cell = hidden[index]
+            if not is_revealed(*cell) and cell not in exclude:
+                return cell
+            # the order of the list does not matter, the cell is dropped in constant time
+            hidden[index] = hidden[-1]
+            hidden.pop()
+
+
+class RandomStrategy(Strategy):
+    "Reveals random hidden cells."
+    name = 'random'
+
+    def next_cell(self) -> Cell:
+        return self.random_cell()
+
+
+class RulesStrategy(Strategy):
+    """
+    Applies the two basic rules to the revealed numbers: when a number is equal
+    to its known mines the other hidden neighbours are safe, and when it is equal
+    to its hidden neighbours they are all mines. Guesses a random cell when the
+    rules do not find a safe cell.
+    """
+    name = 'rules'
+
+    def __init__(self, board: minesweeper.Board, rng: random.Random):
+        super().__init__(board, rng)
+        self.neighbours = neighbours(board.rows, board.columns)
+        self.mines: set = set()
+        self.safe: List[Cell] = []
+        self.pending: List[Cell] = []
+
+    def revealed(self, cells: List[Cell]):
+        is_revealed = self.board.is_revealed
+        pending = self.pending
+        for row, column in cells:
+            pending.append((row, column))
+            pending.extend(cell for cell in self.neighbours[row][column] if is_revealed(*cell))
+
+    def _check(self, row: int, column: int):
+        board = self.board
+        unknown = []
+        known_mines = 0
+        for cell in self.neighbours[row][column]:
+            if board.is_revealed(*cell):
+                continue
+            if cell in self.mines:
+                known_mines += 1
+            else:
+                unknown.append(cell)
+        if not unknown:
+            return
+        missing = board.count_adjacent_mines(row, column) - known_mines
+        if missing == 0:
+            self.safe.extend(unknown)
+        elif missing == len(unknown):
+            self.mines.update(unknown)
+            # the new mines can solve the numbers around them
+            for mine_row, mine_column in unknown:
+                self.pending.extend(cell for cell in self.neighbours[mine_row][mine_column]
+                    if board.is_revealed(*cell))
+
+    def next_cell(self) -> Cell:
+        is_revealed = self.board.is_revealed
+        while True:
+            while self.safe:
+                cell = self.safe.pop()
+                if not is_revealed(*cell):
+                    return cell
+            if not self.pending:
+                return self.random_cell(self.mines)
+            self._check(*self.pending.pop())
+
+
+class ProbabilityStrategy(RulesStrategy):
+    """
+    Applies the rules and, instead of guessing a random cell, reveals the cell
+    with the lowest probability of having a mine according to the solver.
+    Slower than the other strategies.
+    """
+    name = 'probability'
+
+    def random_cell(self, exclude=frozenset()) -> Cell:
+        board = self.board
+        probabilities, default = solver.mine_probabilities(board.get_display_board(), board.mines)
+        self.hidden = [cell for cell in self.hidden if not board.is_revealed(*cell)]
+        candidates = [(probabilities.get(cell, default), cell) for cell in self.hidden if cell not in exclude]
+        return min(candidates)[1]
+
+
+STRATEGIES: Dict[str, Type[Strategy]] = {
+    strategy.name: strategy for strategy in (RandomStrategy, RulesStrategy, ProbabilityStrategy)
+}
+
+
+class GameResult(NamedTuple):
+    won: bool
+    moves: int
+
+
+def play_game(rows: int, columns: int, mines: int, strategy: str, seed: str) -> GameResult:
+    "Plays a game with a random board generated from `seed` and returns the result."
+    rng = random.Random(seed)
+    board = minesweeper.Board(rows, columns, mines, rng=rng)
+    player = STRATEGIES[strategy](board, rng)
+    moves = 0
+    while True:
+        row, column = player.next_cell()
+        moves += 1
+        try:
+            cells = board.reveal(row, column)
+        except minesweeper.MineExplossionError:
+            return GameResult(False, moves)
+        if board.is_finished():
+            return GameResult(True, moves)
+        player.revealed(cells)
+
+
+class SimulationResult(NamedTuple):
+    games: int
+    wins: int
+    moves: int
+    seconds: float
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def moves_per_game(self) -> float:
+        return self.moves / self.games if self.games else 0.0
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.seconds if self.seconds else 0.0
+
+
+def _play_games(rows: int, columns: int, mines: int, strategy: str, seed: int,
+        first: int, count: int) -> SimulationResult:
+    start = time.perf_counter()
+    wins = moves = 0
+    for index in range(first, first + count):
+        result = play_game(rows, columns, mines, strategy, f'{seed}:{index}')
+        wins += result.won
+        moves += result.moves
+    return SimulationResult(count, wins, moves, time.perf_counter() - start)
+
+
+def simulate(rows: int, columns: int, mines: int, games: int, strategy: str = 'rules',
+        seed: int = 0, workers: Optional[int] = None) -> SimulationResult:
+    """
+    Plays `games` games and returns the aggregated result. `seconds` is the
+    time spent playing added over all the processes.
+
+    Parameters
+    ----------
+    strategy: str
+        One of the keys of `STRATEGIES`.
+    seed: int
+        Seed of the simulation. The same seed plays the same games.
+    workers: int
+        Count of worker processes, the count of CPUs by default. With 0 or 1
+        the games are played in the current process.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown strategy {strategy}")
+    workers = os.cpu_count() if workers is None else workers
+    if workers < 2 or games < 2:
+        return _play_games(rows, columns, mines, strategy, seed, 0, games)
+    # a few tasks per worker so the work is balanced
+    tasks = min(games, workers * 4)
+    size, rest = divmod(games, tasks)
+    ranges = []
+    first = 0
+    for task in range(tasks):
+        count = size + (task < rest)
+        ranges.append((first, count))
+        first += count
+    with ProcessPoolExecutor(workers) as executor:
+        results = list(executor.map(_play_games, *zip(*[
+            (rows, columns, mines, strategy, seed, first, count) for first, count in ranges])))
+    return SimulationResult(
+        games=sum(result.games for result in results),
+        wins=sum(result.wins for result in results),
+        moves=sum(result.moves for result in results),
+        seconds=sum(result.seconds for result in results),
+    )
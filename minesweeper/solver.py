@@ -0,0 +1,340 @@
+"""
+Mine probabilities for the unrevealed cells of a board.
+
+The solver works only with the information visible to the player (the display
+board). Hidden cells next to revealed numbers form the frontier. The frontier is
+split into independent components (cells linked by shared number constraints),
+the mine configurations of each component are enumerated with backtracking and
+the components are combined with the cells outside the frontier using binomial
+coefficients, so the cost depends on the size of the components and not on the
+size of the board.
+
+The enumeration grows exponentially with the size of the components, so it
+stops after `MAX_STEPS` assignments. The components not enumerated by then get
+approximate probabilities (see `_Component.approximate`) and count as having
+their expected mines when combined with the others.
+"""
+import functools
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+
+Cell = Tuple[int, int]
+
+HIDDEN_CELLS = frozenset([' ', '!', '?'])
+
+# assignments tried by the enumeration of a board, about 30 ms
+MAX_STEPS = 30_000
+
+# rounds of the approximation of the components not enumerated
+APPROXIMATION_ROUNDS = 20
+
+
+@functools.lru_cache(maxsize=4096)
+def combinations(n: int, k: int) -> int:
+    "Memoized binomial coefficient. Returns 0 when `k` is out of range."
+    if k < 0 or k > n:
+        return 0
+    k = min(k, n - k)
+    result = 1
+    for i in range(k):
+        result = result * (n - i) // (i + 1)
+    return result
+
+
+def _convolve(first: Dict[int, int], second: Dict[int, int]) -> Dict[int, int]:
+    result: Dict[int, int] = {}
+    for first_mines, first_count in first.items():
+        for second_mines, second_count in second.items():
+            mines = first_mines + second_mines
+            result[mines] = result.get(mines, 0) + first_count * second_count
+    return result
+
+
+class _Component:
+    "Group of frontier cells linked by number constraints."
+
+    def __init__(self, cells: List[Cell], constraints: List[Tuple[List[Cell], int]]):
+        self.cells = cells
+        self.constraints = constraints
+        # solutions[k]: count of configurations with k mines
+        self.solutions: Dict[int, int] = {}
+        # cell_solutions[k][i]: count of configurations with k mines where cells[i] has a mine
+        self.cell_solutions: Dict[int, List[int]] = {}
+        # probabilities of the cells when the component is approximated
+        self.approximation: Optional[List[float]] = None
+
+    def solve(self, max_steps: int) -> int:
+        """
+        Enumerates the configurations of the component and returns the count of
+        steps used. Raises `StepLimitExceeded` after `max_steps` steps.
+
+        The cells of the same constraints are interchangeable, so they are
+        grouped and the search assigns the count of mines of each group. A
+        group of `size` cells with `k` mines stands for `combinations(size, k)`
+        configurations.
+        """
+        cell_constraints: Dict[Cell, List[int]] = {cell: [] for cell in self.cells}
+        for constraint_index, (cells, value) in enumerate(self.constraints):
+            for cell in cells:
+                cell_constraints[cell].append(constraint_index)
+        groups: Dict[Tuple[int, ...], List[int]] = {}
+        for i, cell in enumerate(self.cells):
+            groups.setdefault(tuple(cell_constraints[cell]), []).append(i)
+        group_cells = list(groups.values())
+        group_constraints = list(groups)
+        needed = [value for cells, value in self.constraints]
+        unassigned = [len(cells) for cells, value in self.constraints]
+
+        def apply(position: int, value: int) -> bool:
+            valid = True
+            size = len(group_cells[position])
+            for constraint_index in group_constraints[position]:
+                needed[constraint_index] -= value
+                unassigned[constraint_index] -= size
+                if needed[constraint_index] < 0 or needed[constraint_index] > unassigned[constraint_index]:
+                    valid = False
+            return valid
+
+        def revert(position: int, value: int):
+            size = len(group_cells[position])
+            for constraint_index in group_constraints[position]:
+                needed[constraint_index] += value
+                unassigned[constraint_index] += size
+
+        # depth first search with an explicit stack, components can be longer
+        # than the recursion limit. tried[i] is the count of values tried for
+        # group i. found[i] has the configurations found with the groups before
+        # i assigned by count of mines, they are added to the counts of the cells
+        # of group i - 1 when its assignment is reverted.
+        count = len(group_cells)
+        tried = [0] * count
+        assignment = [0] * count
+        found: List[Dict[int, int]] = [{} for i in range(count + 1)]
+        # weights[i]: configurations of the cells of the groups before i
+        weights = [1] * (count + 1)
+        position = mines = steps = 0
+        while True:
+            steps += 1
+            if steps > max_steps:
+                raise StepLimitExceeded
+            if position == count:
+                found[count][mines] = found[count].get(mines, 0) + weights[count]
+            elif tried[position] <= len(group_cells[position]):
+                value = tried[position]
+                tried[position] += 1
+                if apply(position, value):
+                    assignment[position] = value
+                    mines += value
+                    weights[position + 1] = weights[position] * combinations(len(group_cells[position]), value)
+                    position += 1
+                else:
+                    revert(position, value)
+                continue
+            else:
+                tried[position] = 0
+            # back to the previous group, its assignment is reverted before trying the next value
+            position -= 1
+            if position < 0:
+                self.solutions = found[0]
+                return steps
+            value = assignment[position]
+            cells = group_cells[position]
+            below, parent = found[position + 1], found[position]
+            if below:
+                steps += len(below) * (1 + len(cells) * bool(value))
+                for below_mines, weight in below.items():
+                    parent[below_mines] = parent.get(below_mines, 0) + weight
+                    if value:
+                        # each cell of the group has a mine in value / size of the configurations
+                        counts = self.cell_solutions.setdefault(below_mines, [0] * len(self.cells))
+                        for cell in cells:
+                            counts[cell] += weight * value // len(cells)
+                found[position + 1] = {}
+            revert(position, value)
+            mines -= value
+            assignment[position] = 0
+
+    def approximate(self, density: float):
+        """
+        Estimates the probabilities of the cells without enumerating the
+        configurations. The cells decided by a constraint, or by the difference
+        of a constraint and another one including it, are safe or mines. For the
+        rest, starting from the density of the board, the probabilities of the
+        cells of each constraint are scaled in turn so they add up to its count
+        of mines. The component counts as having its expected mines, rounded.
+        """
+        index = {cell: i for i, cell in enumerate(self.cells)}
+        probabilities: List[Optional[float]] = [None] * len(self.cells)
+        constraints = [(frozenset(index[cell] for cell in cells), value) for cells, value in self.constraints]
+        cell_constraints: List[List[int]] = [[] for cell in self.cells]
+        for constraint_index, (cells, value) in enumerate(constraints):
+            for cell in cells:
+                cell_constraints[cell].append(constraint_index)
+
+        def pending(constraint_index: int) -> Tuple[FrozenSet[int], int]:
+            "Returns the undecided cells of the constraint and the mines among them."
+            cells, value = constraints[constraint_index]
+            undecided = frozenset(cell for cell in cells if probabilities[cell] is None)
+            return undecided, value - sum(probabilities[cell] or 0 for cell in cells - undecided)
+
+        changed = True
+        while changed:
+            changed = False
+            for constraint_index in range(len(constraints)):
+                cells, value = pending(constraint_index)
+                rules = [(cells, value)]
+                for linked in {linked for cell in cells for linked in cell_constraints[cell]}:
+                    linked_cells, linked_value = pending(linked)
+                    if cells < linked_cells:
+                        rules.append((linked_cells - cells, linked_value - value))
+                for rule_cells, rule_value in rules:
+                    if rule_cells and rule_value in (0, len(rule_cells)):
+                        for cell in rule_cells:
+                            probabilities[cell] = float(rule_value > 0)
+                        changed = True
+
+        undecided = {cell for cell, probability in enumerate(probabilities) if probability is None}
+        for cell in undecided:
+            probabilities[cell] = density
+        for i in range(APPROXIMATION_ROUNDS):
+            for constraint_index in range(len(constraints)):
+                cells, value = constraints[constraint_index]
+                free = [cell for cell in cells if cell in undecided]
+                mines = max(value - sum(probabilities[cell] for cell in cells if cell not in undecided), 0)
+                total = sum(probabilities[cell] for cell in free)
+                if total:
+                    for cell in free:
+                        probabilities[cell] = min(probabilities[cell] * mines / total, 1.0)
+        self.approximation = probabilities
+        self.solutions = {round(sum(probabilities)): 1}
+        self.cell_solutions = {}
+
+
+class StepLimitExceeded(Exception):
+    "The enumeration of a component used more steps than allowed."
+
+
+def _components(constraints: List[Tuple[List[Cell], int]]) -> List[_Component]:
+    "Splits the constraints in groups that do not share cells."
+    cell_constraints: Dict[Cell, List[int]] = {}
+    for constraint_index, (cells, value) in enumerate(constraints):
+        for cell in cells:
+            cell_constraints.setdefault(cell, []).append(constraint_index)
+
+    result = []
+    visited_constraints = set()
+    for start in range(len(constraints)):
+        if start in visited_constraints:
+            continue
+        visited_constraints.add(start)
+        # breadth first order keeps linked cells close, so backtracking prunes early.
+        queue = [start]
+        component_cells: List[Cell] = []
+        seen_cells = set()
+        component_constraints = []
+        while queue:
+            constraint_index = queue.pop()
+            component_constraints.append(constraints[constraint_index])
+            for cell in constraints[constraint_index][0]:
+                if cell in seen_cells:
+                    continue
+                seen_cells.add(cell)
+                component_cells.append(cell)
+                for linked in cell_constraints[cell]:
+                    if linked not in visited_constraints:
+                        visited_constraints.add(linked)
+                        queue.insert(0, linked)
+        result.append(_Component(component_cells, component_constraints))
+    return result
+
+
+def mine_probabilities(display: Sequence[Sequence[str]], mines: int, max_steps: int = MAX_STEPS,
+        approximate: bool = True) -> Tuple[Dict[Cell, float], float]:
+    """
+    Computes the probability of having a mine for the hidden cells of a board.
+    The probabilities are approximate when the enumeration takes more than
+    `max_steps` steps, unless `approximate` is false and `StepLimitExceeded`
+    is raised instead.
+
+    Parameters
+    ----------
+    display: Sequence[Sequence[str]]
+        Display board as returned by `minesweeper.Board.get_display_board`.
+    mines: int
+        Count of mines in the board.
+
+    Returns
+    -------
+    result: Tuple[Dict[Tuple[int, int], float], float]
+        The probabilities of the frontier cells and the probability shared by
+        every hidden cell outside the frontier. Returns an empty dictionary and
+        zero when the display board is not consistent with the count of mines.
+    """
+    rows = len(display)
+    columns = len(display[0]) if rows else 0
+    hidden_count = 0
+    constraints: List[Tuple[List[Cell], int]] = []
+    for row, display_row in enumerate(display):
+        for column, value in enumerate(display_row):
+            if value in HIDDEN_CELLS:
+                hidden_count += 1
+                continue
+            if not value.isdigit():
+                continue
+            cells = [
+                (check_row, check_col)
+                for check_row in range(max(row - 1, 0), min(row + 2, rows))
+                for check_col in range(max(column - 1, 0), min(column + 2, columns))
+                if display[check_row][check_col] in HIDDEN_CELLS
+            ]
+            if cells:
+                constraints.append((cells, int(value)))
+
+    components = _components(constraints)
+    # the small components first, so most of them are enumerated within the limit
+    steps = max_steps
+    for component in sorted(components, key=lambda component: len(component.cells)):
+        try:
+            steps -= component.solve(steps)
+        except StepLimitExceeded:
+            if not approximate:
+                raise
+            steps = 0
+            component.approximate(mines / hidden_count)
+    frontier_count = sum(len(component.cells) for component in components)
+    rest_count = hidden_count - frontier_count
+
+    # prefix[i] combines the components before i, suffix[i] the components from i.
+    prefix = [{0: 1}]
+    for component in components:
+        prefix.append(_convolve(prefix[-1], component.solutions))
+    suffix = [{0: 1}]
+    for component in reversed(components):
+        suffix.insert(0, _convolve(component.solutions, suffix[0]))
+
+    total = sum(count * combinations(rest_count, mines - frontier_mines)
+        for frontier_mines, count in prefix[-1].items())
+    if not total:
+        return {}, 0.0
+
+    result: Dict[Cell, float] = {}
+    for i, component in enumerate(components):
+        others = _convolve(prefix[i], suffix[i + 1])
+        weights = {
+            component_mines: sum(count * combinations(rest_count, mines - component_mines - other_mines)
+                for other_mines, count in others.items())
+            for component_mines in component.solutions
+        }
+        if component.approximation is not None:
+            result.update(zip(component.cells, component.approximation))
+            continue
+        for cell_index, cell in enumerate(component.cells):
+            weight = sum(weights[component_mines] * counts[cell_index]
+                for component_mines, counts in component.cell_solutions.items())
+            result[cell] = weight / total
+
+    if not rest_count:
+        return result, 0.0
+    rest_mines = sum(count * combinations(rest_count, mines - frontier_mines) * (mines - frontier_mines)
+        for frontier_mines, count in prefix[-1].items())
+    return result, rest_mines / (total * rest_count)
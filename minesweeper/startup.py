@@ -0,0 +1,76 @@
+"""
+Measurement of the start time of the application.
+
+The application is started in a new Python process with `-X importtime`, the
+same way a worker starts: the WSGI application is created and the URL
+configuration is loaded. The import times printed by Python are parsed so the
+modules that make the start slow can be found.
+"""
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple, Optional
+
+from django.conf import settings
+
+
+class ImportTime(NamedTuple):
+    module: str
+    # microseconds spent importing the module, without and with its imports
+    self_us: int
+    cumulative_us: int
+
+
+class StartupReport(NamedTuple):
+    seconds: float
+    imports: List[ImportTime]
+
+    def packages(self) -> Dict[str, int]:
+        "Returns the microseconds spent importing the modules of each top level package."
+        result: Dict[str, int] = {}
+        for item in self.imports:
+            package = item.module.split('.')[0]
+            result[package] = result.get(package, 0) + item.self_us
+        return result
+
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)')
+
+STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(time.perf_counter() - start)
+"""
+
+
+def parse_import_times(output: str) -> List[ImportTime]:
+    "Parses the lines printed by `python -X importtime`."
+    result = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is not None:
+            result.append(ImportTime(match.group(3), int(match.group(1)), int(match.group(2))))
+    return result
+
+
+def measure_startup(environ: Optional[Dict[str, str]] = None) -> StartupReport:
+    """
+    Starts the application in a new process and returns the seconds it took
+    and the import times of the modules.
+
+    Parameters
+    ----------
+    environ: dict
+        Environment variables added to the environment of the process, for
+        example `{'MINESWEEPER_API_ONLY': '1'}`.
+    """
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE, **(environ or {})}
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+        cwd=settings.BASE_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True, check=True)
+    return StartupReport(float(process.stdout.split()[-1]), parse_import_times(process.stderr))
@@ -0,0 +1,101 @@
+"""
+Statistics of the finished games.
+
+The statistics are read from the rollups of `models.DailyStats` and
+`models.PlayerStats`, updated by `models.Board.reveal_cell` when a game
+finishes, so reading them does not aggregate the boards and its cost does not
+grow with the count of games played. `rebuild_stats` recomputes the rollups
+from the boards and the archived boards, for example after importing boards.
+"""
+import datetime
+import heapq
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from . import models
+
+
+def size_stats(user=None, days: int = 30) -> List[Dict]:
+    """
+    Returns the games finished in the last days by board size, of the user or
+    of all the users when `user` is `None`.
+    """
+    since = timezone.localdate() - datetime.timedelta(days=days - 1)
+    totals = models.DailyStats.objects.filter(user=user, date__gte=since).values(
+        'rows', 'columns', 'mines').annotate(
+        total_played=Sum('played'), total_won=Sum('won'), total_seconds=Sum('seconds')).order_by(
+        'rows', 'columns', 'mines')
+    return [{
+        'rows': item['rows'], 'columns': item['columns'], 'mines': item['mines'],
+        'played': item['total_played'], 'won': item['total_won'],
+        'average_seconds': item['total_seconds'] / item['total_played'],
+    } for item in totals]
+
+
+def player_stats(user) -> models.PlayerStats:
+    "Returns the totals of the user, with zero values when the user has not finished games."
+    return models.PlayerStats.objects.filter(user=user).first() or models.PlayerStats(user=user)
+
+
+class _Game(NamedTuple):
+    finished_at: datetime.datetime
+    user_id: int
+    created: datetime.datetime
+    rows: int
+    columns: int
+    mines: int
+    won: bool
+
+
+def _finished_games(chunk_size: int) -> Iterator[_Game]:
+    "Yields the games of the finished boards and of the archived boards by finish date."
+    boards = models.Board.objects.filter(finished=True, practice=False, finished_at__isnull=False).order_by(
+        'finished_at', 'pk')
+    games = (_Game(board.finished_at, board.user_id, board.created, board.rows, board.columns, board.mines,
+        not board.get_minesweeper_board().is_exploded()) for board in boards.iterator(chunk_size=chunk_size))
+    archived = models.ArchivedBoard.objects.filter(practice=False, finished_at__isnull=False).order_by(
+        'finished_at', 'pk').values_list(*_Game._fields)
+    archived_games = (_Game(*row) for row in archived.iterator(chunk_size=chunk_size))
+    return heapq.merge(games, archived_games, key=lambda game: game.finished_at)
+
+
+def rebuild_stats(chunk_size: int = 1000) -> int:
+    """
+    Replaces the rollups with the statistics of the finished boards and of the
+    archived boards, and returns the count of games. Practice boards are not
+    counted.
+    """
+    daily: Dict[Tuple[Optional[int], datetime.date, int, int, int], models.DailyStats] = {}
+    players: Dict[int, models.PlayerStats] = {}
+    count = 0
+    for game in _finished_games(chunk_size):
+        seconds = (game.finished_at - game.created).total_seconds()
+        date = timezone.localdate(game.finished_at)
+        for user_id in [game.user_id, None]:
+            key = (user_id, date, game.rows, game.columns, game.mines)
+            if key not in daily:
+                daily[key] = models.DailyStats(user_id=user_id, date=date, rows=game.rows,
+                    columns=game.columns, mines=game.mines)
+            item = daily[key]
+            item.played += 1
+            item.won += game.won
+            item.seconds += seconds
+        if game.user_id not in players:
+            players[game.user_id] = models.PlayerStats(user_id=game.user_id)
+        player = players[game.user_id]
+        player.played += 1
+        player.won += game.won
+        player.seconds += seconds
+        player.current_streak = player.current_streak + 1 if game.won else 0
+        player.best_streak = max(player.best_streak, player.current_streak)
+        player.last_finished = game.finished_at
+        count += 1
+    with transaction.atomic():
+        models.DailyStats.objects.all().delete()
+        models.PlayerStats.objects.all().delete()
+        models.DailyStats.objects.bulk_create(daily.values(), batch_size=chunk_size)
+        models.PlayerStats.objects.bulk_create(players.values(), batch_size=chunk_size)
+    return count
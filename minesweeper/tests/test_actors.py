@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from unittest import mock
+
+from django.test import TransactionTestCase, override_settings
+
+from rest_framework.test import APIClient
+
+from .. import actors
+from .. import api
+from .. import models
+
+from . import factories
+
+
+@override_settings(MINESWEEPER_BOARD_ACTORS=True)
+class TestCooperativeBoardApi(TransactionTestCase):
+    def setUp(self):
+        self.owner = factories.UserFactory()
+        self.player = factories.UserFactory()
+        self.board = models.Board.objects.create(rows=2, columns=3, mines=1, user=self.owner,
+            board_json=[[0, 0, 0], [0, 0, 1]])
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.url = f'/api/v1/boards/{self.board.pk}/'
+
+    def tearDown(self):
+        actors.registry.stop_all()
+
+    def _add_player(self):
+        response = self.client.post(f'{self.url}players/', {'username': self.player.username}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.client.force_authenticate(self.player)
+
+    def test_add_player(self):
+        self._add_player()
+        self.board.refresh_from_db()
+        self.assertTrue(self.board.cooperative)
+        self.assertEqual(list(self.board.players.all()), [self.player])
+        response = self.client.get('/api/v1/boards/')
+        self.assertEqual([board['id'] for board in response.data], [self.board.pk])
+
+    def test_add_unknown_player(self):
+        response = self.client.post(f'{self.url}players/', {'username': 'unknown'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_players_managed_by_owner(self):
+        self._add_player()
+        response = self.client.post(f'{self.url}players/', {'username': self.player.username}, format='json')
+        self.assertEqual(response.status_code, 404)
+
+    def test_moves_applied_in_actor(self):
+        self._add_player()
+        response = self.client.put(self.url, {'row': 0, 'column': 0, 'operation': 'mark_cell'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['version'], 1)
+        self.assertEqual(response.data['display_board'][0][0], '!')
+        self.assertEqual(response['ETag'], f'"{self.board.pk}-1"')
+
+        # the owner reads the state kept by the actor before it is saved
+        self.client.force_authenticate(self.owner)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"{self.board.pk}-1"')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(models.Board.objects.get(pk=self.board.pk).version, 0)
+
+        actors.registry.stop_all()
+        board = models.Board.objects.get(pk=self.board.pk)
+        self.assertEqual(board.version, 1)
+        self.assertEqual(board.display_board()[0][0], '!')
+
+    def test_layout_not_loaded_in_request(self):
+        self._add_player()
+        boards = []
+        get_object = api.ReadUpdateDeleteBoardView.get_object
+
+        def record(view):
+            boards.append(get_object(view))
+            return boards[-1]
+
+        with mock.patch.object(api.ReadUpdateDeleteBoardView, 'get_object', autospec=True, side_effect=record):
+            response = self.client.put(self.url, {'row': 0, 'column': 0, 'operation': 'mark_cell'}, format='json')
+            self.assertEqual(response.data['display_board'][0][0], '!')
+            response = self.client.get(self.url)
+            self.assertEqual(response.data['display_board'][0][0], '!')
+        self.assertEqual(len(boards), 2)
+        for board in boards:
+            self.assertIn('board_json', board.get_deferred_fields())
+
+    def test_failed_move(self):
+        self._add_player()
+        with mock.patch.object(models.Board, 'mark_cell', side_effect=ValueError("failed")):
+            with self.assertRaises(ValueError):
+                self.client.put(self.url, {'row': 0, 'column': 0, 'operation': 'mark_cell'}, format='json')
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['version'], 0)
+        self.assertEqual(actors.registry.get(self.board.pk)._pending, 0)
+
+    @override_settings(MINESWEEPER_ACTOR_SNAPSHOT_EVERY=1)
+    def test_snapshot_every(self):
+        self._add_player()
+        self.client.put(self.url, {'row': 0, 'column': 0, 'operation': 'reveal_cell'}, format='json')
+        board = models.Board.objects.get(pk=self.board.pk)
+        self.assertEqual(board.version, 1)
+        self.assertTrue(board.get_minesweeper_board().is_revealed(0, 0))
+
+    def test_finished_board_saved(self):
+        self._add_player()
+        response = self.client.put(self.url, {'row': 1, 'column': 2, 'operation': 'reveal_cell'}, format='json')
+        self.assertTrue(response.data['finished'])
+        self.assertTrue(models.Board.objects.get(pk=self.board.pk).finished)
+
+    def test_only_owner_deletes(self):
+        self._add_player()
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, 403)
+        self.client.force_authenticate(self.owner)
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(models.Board.objects.filter(pk=self.board.pk).exists())
+
+    def test_other_user(self):
+        self._add_player()
+        self.client.force_authenticate(factories.UserFactory())
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+class TestLockedCooperativeBoardApi(TransactionTestCase):
+    def setUp(self):
+        self.owner = factories.UserFactory()
+        self.player = factories.UserFactory()
+        self.board = models.Board.objects.create(rows=2, columns=3, mines=1, user=self.owner,
+            board_json=[[0, 0, 0], [0, 0, 1]])
+        self.board.add_player(self.player)
+        self.client = APIClient()
+        self.client.force_authenticate(self.player)
+        self.url = f'/api/v1/boards/{self.board.pk}/'
+
+    def test_moves_saved_in_request(self):
+        response = self.client.put(self.url, {'row': 0, 'column': 0, 'operation': 'mark_cell'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['version'], 1)
+        self.assertIsNone(actors.registry.get(self.board.pk))
+        board = models.Board.objects.get(pk=self.board.pk)
+        self.assertEqual(board.version, 1)
+        self.assertEqual(board.display_board()[0][0], '!')
+        self.client.force_authenticate(self.owner)
+        response = self.client.get(self.url)
+        self.assertEqual(response['ETag'], f'"{self.board.pk}-1"')
+        self.assertEqual(response.data['display_board'][0][0], '!')
+
+
+class TestActorRegistry(TransactionTestCase):
+    def setUp(self):
+        self.board = factories.BoardModelFactory()
+        self.registry = actors.ActorRegistry()
+
+    def tearDown(self):
+        self.registry.stop_all()
+
+    def test_call(self):
+        self.assertEqual(self.registry.call(self.board.pk, lambda board: board.pk), self.board.pk)
+        actor = self.registry.get(self.board.pk)
+        self.assertIsNotNone(actor)
+        self.assertIs(self.registry.get_or_create(self.board.pk), actor)
+
+    def test_stopped_actor(self):
+        actor = self.registry.get_or_create(self.board.pk)
+        actor.stop()
+        self.assertIsNone(self.registry.get(self.board.pk))
+        with self.assertRaises(actors.ActorStopped):
+            actor.call(lambda board: board.pk)
+        # a new actor is started for the board
+        self.assertEqual(self.registry.call(self.board.pk, lambda board: board.pk), self.board.pk)
+
+    @override_settings(MINESWEEPER_ACTOR_IDLE_SECONDS=0.05, MINESWEEPER_ACTOR_SNAPSHOT_SECONDS=0.05)
+    def test_idle_actor(self):
+        self.registry.call(self.board.pk, lambda board: board.mark_cell(0, 0, save=False), mutates=True)
+        actor = self.registry.get(self.board.pk)
+        actor._thread.join(5)
+        self.assertIsNone(self.registry.get(self.board.pk))
+        self.assertEqual(models.Board.objects.get(pk=self.board.pk).version, self.board.version + 1)
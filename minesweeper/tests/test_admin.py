@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from .. import admin
+from .. import models
+
+from . import factories
+
+
+class TestBoardAdmin(TestCase):
+    def setUp(self):
+        self.superuser = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.superuser)
+
+    def test_render_page(self):
+        display = [[' ', '1', '0'], ['!', '**', '?']]
+        self.assertEqual(admin.render_page(display, 0), '#1.\n!X?')
+        self.assertEqual(admin.render_page(display, 1, page_rows=1), '!X?')
+
+    def test_render_overview(self):
+        display = [
+            [' ', '0', '0', '0'],
+            ['0', '0', '0', '0'],
+            ['!', '!', '1', '*'],
+            ['?', '!', '1', '1'],
+        ]
+        self.assertEqual(admin.render_overview(display, size=2), '#.\n!*')
+
+    def test_changelist(self):
+        factories.BoardModelFactory()
+        response = self.client.get('/admin/minesweeper/board/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIs(response.context['cl'].paginator.__class__, admin.EstimatedCountPaginator)
+        board = response.context['cl'].result_list[0]
+        self.assertIn('board_json', board.get_deferred_fields())
+
+    def test_change_view(self):
+        board = factories.BoardModelFactory(rows=120, columns=30, mines=10)
+        response = self.client.get(f'/admin/minesweeper/board/{board.pk}/change/?preview_page=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '2/3')
+        self.assertContains(response, 'Overview')
+
+    def test_change_view_renders_page(self):
+        board = factories.BoardModelFactory(rows=60, columns=30, mines=10)
+        with mock.patch.object(models.Board, 'display_board') as display_board:
+            response = self.client.get(f'/admin/minesweeper/board/{board.pk}/change/',
+                {'preview_page': 1, '_changelist_filters': 'finished__exact=1'})
+        display_board.assert_not_called()
+        self.assertContains(response, '2/2')
+        self.assertContains(response, 'href="?preview_page=0&amp;_changelist_filters=finished__exact%3D1"')
+        self.assertContains(response, '#' * 30)
+        self.assertNotContains(response, 'Overview')
+
+    def test_change_view_pending_board(self):
+        board = factories.BoardModelFactory(pending=True, board_json=[])
+        response = self.client.get(f'/admin/minesweeper/board/{board.pk}/change/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Pending')
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import datetime
+import io
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from .. import analysis
+from .. import anticheat
+from .. import minesweeper
+from .. import models
+
+from . import factories
+
+
+# the first reveal shows a 1, then every other reveal has the same chance of having a mine
+LAYOUT = [[0, 1, 0, 1, 0, 1, 0, 1, 0, 1]]
+GUESSES = [(0, 0), (0, 2), (0, 4), (0, 6), (0, 8)]
+
+
+def make_game(interval: float) -> dict:
+    return {
+        'board_id': 1, 'rows': 1, 'columns': 10, 'mines': 5,
+        'layout': minesweeper.encode_board(LAYOUT),
+        'moves': [('reveal_cell', row, column, index * interval) for index, (row, column) in enumerate(GUESSES)],
+    }
+
+
+class TestAnalysis(TestCase):
+    def test_max_click_rate(self):
+        self.assertEqual(analysis.max_click_rate([]), 0.0)
+        self.assertEqual(analysis.max_click_rate([0.0, 2.0, 2.5]), 0.8)
+        self.assertEqual(analysis.max_click_rate([0.0, 2.0, 2.5], window=2), 2.0)
+
+    def test_guess_probabilities(self):
+        game = make_game(1.0)
+        probabilities = analysis.guess_probabilities(1, 10, 5, game['layout'], game['moves'])
+        self.assertEqual(len(probabilities), 4)
+        for probability in probabilities:
+            self.assertAlmostEqual(probability, 0.5)
+
+    def test_failed_guess(self):
+        game = make_game(1.0)
+        moves = game['moves'][:2] + [('reveal_cell', 0, 9, 2.0)]
+        self.assertEqual(len(analysis.guess_probabilities(1, 10, 5, game['layout'], moves)), 1)
+
+    def test_step_limit(self):
+        # the probabilities of the guesses can not be computed exactly without steps
+        game = make_game(1.0)
+        self.assertEqual(analysis.guess_probabilities(1, 10, 5, game['layout'], game['moves'], max_steps=0), [])
+
+    def test_marked_cells_are_not_guesses(self):
+        game = make_game(1.0)
+        moves = [game['moves'][0], ('mark_cell', 0, 2, 1.0), ('reveal_cell', 0, 2, 2.0)]
+        self.assertEqual(analysis.guess_probabilities(1, 10, 5, game['layout'], moves), [])
+
+    def test_analyze_game(self):
+        result = analysis.analyze_game(make_game(1.0))
+        self.assertFalse(result['suspicious'])
+        self.assertEqual(result['moves'], 5)
+        self.assertEqual(result['duration'], 4.0)
+        self.assertAlmostEqual(result['survival_probability'], 0.0625)
+
+        result = analysis.analyze_game(make_game(1.0), min_survival=0.1)
+        self.assertEqual(result['reasons'], ['lucky_guesses'])
+        result = analysis.analyze_game(make_game(0.01))
+        self.assertEqual(result['reasons'], ['click_rate'])
+
+
+class TestAnalyzeFinishedBoards(TestCase):
+    def _play(self, **kwargs) -> models.Board:
+        board = models.Board.objects.create(rows=1, columns=10, mines=5, user=factories.UserFactory(),
+            board_json=[list(row) for row in LAYOUT], **kwargs)
+        for row, column in GUESSES:
+            board.reveal_cell(row, column)
+        self.assertTrue(board.finished)
+        return board
+
+    @override_settings(MINESWEEPER_ANALYSIS_MIN_SURVIVAL=0.1)
+    def test_incremental(self):
+        first = self._play()
+        run = anticheat.analyze_finished_boards(workers=0, delay=datetime.timedelta(0))
+        self.assertEqual(run.boards, 1)
+        self.assertEqual((run.last_board_id, run.last_finished_at), (first.pk, first.finished_at))
+        self.assertIsNotNone(run.completed)
+        self.assertEqual(first.analysis.moves, 5)
+        self.assertTrue(first.analysis.suspicious)
+
+        second = self._play()
+        factories.BoardModelFactory()
+        run = anticheat.analyze_finished_boards(workers=0, delay=datetime.timedelta(0))
+        self.assertEqual(run.boards, 1)
+        self.assertEqual(run.last_board_id, second.pk)
+        self.assertEqual(models.BoardAnalysis.objects.count(), 2)
+
+        run = anticheat.analyze_finished_boards(workers=0, delay=datetime.timedelta(0))
+        self.assertEqual(run.boards, 0)
+        self.assertEqual(run.last_board_id, second.pk)
+
+    def test_delay(self):
+        self._play()
+        run = anticheat.analyze_finished_boards(workers=0)
+        self.assertEqual(run.boards, 0)
+        self.assertIsNone(run.last_board_id)
+
+    def test_cooperative_boards(self):
+        self._play(cooperative=True)
+        run = anticheat.analyze_finished_boards(workers=0, delay=datetime.timedelta(0))
+        self.assertEqual(run.boards, 0)
+        self.assertFalse(models.BoardAnalysis.objects.exists())
+
+    def test_process_pool(self):
+        boards = [self._play() for i in range(3)]
+        run = anticheat.analyze_finished_boards(batch_size=2, workers=2, delay=datetime.timedelta(0))
+        self.assertEqual(run.boards, 3)
+        self.assertEqual(set(models.BoardAnalysis.objects.values_list('board_id', flat=True)),
+            {board.pk for board in boards})
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('analyze_boards', '--workers', '0', stdout=out)
+        self.assertIn("Analyzed 0 boards", out.getvalue())
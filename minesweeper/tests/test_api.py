@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import base64
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from rest_framework.test import APIClient
+
+from .. import api
+from .. import broadcast
+from .. import minesweeper
+from .. import models
+
+from . import factories
+
+
+class TestBoardRetrieveApi(TestCase):
+    def setUp(self):
+        self.board: models.Board = factories.BoardModelFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(self.board.user)
+        self.url = f'/api/v1/boards/{self.board.pk}/'
+
+    def test_etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertEqual(etag, f'"{self.board.pk}-{self.board.version}"')
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.put(self.url, {'row': 0, 'column': 0, 'operation': 'mark_cell'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        new_etag = response['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], new_etag)
+
+    def test_etag_other_user(self):
+        self.client.force_authenticate(factories.UserFactory())
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response)
+
+
+class TestUpdateCellApi(TestCase):
+    def setUp(self):
+        self.board: models.Board = factories.BoardModelFactory(rows=3, columns=4, mines=2)
+        self.client = APIClient()
+        self.client.force_authenticate(self.board.user)
+        self.url = f'/api/v1/boards/{self.board.pk}/'
+
+    def test_negative_cell(self):
+        response = self.client.put(self.url, {'row': -1, 'column': 0, 'operation': 'reveal_cell'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('row', response.data)
+        response = self.client.put(self.url, {'row': 0, 'column': -1, 'operation': 'mark_cell'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('column', response.data)
+
+    def test_cell_out_of_range(self):
+        response = self.client.put(self.url, {'row': 3, 'column': 4, 'operation': 'reveal_cell'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {'row', 'column'})
+        self.assertFalse(models.BoardMove.objects.filter(board=self.board).exists())
+
+        response = self.client.put(self.url, {'row': 2, 'column': 3, 'operation': 'mark_cell'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+
+class TestDisplayCacheApi(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.board: models.Board = factories.BoardModelFactory(rows=40, columns=40, mines=100)
+        self.client = APIClient()
+        self.client.force_authenticate(self.board.user)
+        self.url = f'/api/v1/boards/{self.board.pk}/'
+
+    def rendered_rows(self, method: str, *args, **kwargs):
+        "Returns the response of the request and the count of display rows rendered by it."
+        with mock.patch.object(minesweeper.Board, '_display_row', autospec=True,
+                side_effect=minesweeper.Board._display_row) as display_row:
+            response = getattr(self.client, method)(self.url, *args, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        return response, display_row.call_count
+
+    def test_requests_render_changed_rows(self):
+        response, rendered = self.rendered_rows('get')
+        self.assertEqual(rendered, 40)
+        response, rendered = self.rendered_rows('get')
+        self.assertEqual(rendered, 0)
+
+        response, rendered = self.rendered_rows('put', {'row': 5, 'column': 5, 'operation': 'mark_cell'},
+            format='json')
+        self.assertEqual(rendered, 1)
+        self.assertEqual(response.data['display_board'][5][5], '!')
+        response, rendered = self.rendered_rows('get')
+        self.assertEqual(rendered, 0)
+
+        board = models.Board.objects.get(pk=self.board.pk)
+        self.assertEqual(response.data['display_board'], board.get_minesweeper_board().get_display_board())
+
+
+class TestDisplayFormatApi(TestCase):
+    def setUp(self):
+        self.user = factories.UserFactory()
+        self.board = models.Board.objects.create(rows=2, columns=3, mines=1, user=self.user,
+            board_json=[[0, 0, 0], [0, 0, 1]])
+        self.board.reveal_cell(0, 0)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/v1/boards/{self.board.pk}/'
+
+    def test_grid(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['display_board'], [['0', '1', ' '], ['0', '1', ' ']])
+
+    def test_rows(self):
+        response = self.client.get(self.url, {'display_format': 'rows'})
+        self.assertEqual(response.data['display_board'], ['01 ', '01 '])
+        self.assertTrue(response['ETag'].endswith('-rows"'))
+
+    def test_rle(self):
+        response = self.client.get(self.url, {'display_format': 'rle'})
+        self.assertEqual(base64.b64decode(response.data['display_board']),
+            b'\x010\x011\x01 ' * 2)
+
+    def test_accept_header(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='application/json; display_format=rows')
+        self.assertEqual(response.data['display_board'], ['01 ', '01 '])
+
+    def test_media_type_params(self):
+        self.assertEqual(api.media_type_params('application/json; Display_Format="rle" ; q=0.9'),
+            {'display_format': 'rle', 'q': '0.9'})
+        self.assertEqual(api.media_type_params('application/json'), {})
+
+    def test_update(self):
+        response = self.client.put(self.url + '?display_format=rows',
+            {'row': 1, 'column': 2, 'operation': 'mark_cell'}, format='json')
+        self.assertEqual(response.data['display_board'], ['01 ', '01!'])
+
+    def test_list(self):
+        response = self.client.get('/api/v1/boards/', {'display_format': 'rows'})
+        self.assertEqual(response.data[0]['display_board'], ['01 ', '01 '])
+
+
+class TestWindowApi(TestCase):
+    def setUp(self):
+        self.user = factories.UserFactory()
+        self.board = models.Board.objects.create(rows=3, columns=4, mines=1, user=self.user,
+            board_json=[[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 1]])
+        self.board.reveal_cell(0, 0)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/v1/boards/{self.board.pk}/'
+
+    def test_window(self):
+        response = self.client.get(self.url, {'row': 1, 'column': 2, 'height': 5, 'width': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['display_board'], [['1'], ['1']])
+        self.assertEqual(response.data['window'], {'row': 1, 'column': 2, 'height': 2, 'width': 1})
+        self.assertTrue(response['ETag'].endswith('-1.2.5.1"'))
+
+    def test_whole_board(self):
+        response = self.client.get(self.url)
+        self.assertIsNone(response.data['window'])
+        self.assertEqual(len(response.data['display_board']), 3)
+
+    def test_window_with_format(self):
+        response = self.client.get(self.url, {'row': 0, 'column': 0, 'height': 1, 'width': 4,
+            'display_format': 'rows'})
+        self.assertEqual(response.data['display_board'], ['0000'])
+
+    def test_wrong_window(self):
+        response = self.client.get(self.url, {'height': 0})
+        self.assertEqual(response.status_code, 400)
+
+@override_settings(MINESWEEPER_SPECTATOR_STREAM_SECONDS=0)
+class TestSpectatorApi(TestCase):
+    def setUp(self):
+        self.board: models.Board = factories.BoardModelFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(self.board.user)
+        self.share_url = f'/api/v1/boards/{self.board.pk}/share/'
+
+    def test_share(self):
+        response = self.client.post(self.share_url)
+        token = response.data['share_token']
+        self.assertEqual(models.Board.objects.get(pk=self.board.pk).share_token, token)
+
+        spectator = APIClient()
+        response = spectator.get(f'/api/v1/spectate/{token}/')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['display_board'], self.board.display_board())
+        self.assertNotIn('user', data)
+
+        # updates are published to the spectators
+        self.client.put(f'/api/v1/boards/{self.board.pk}/',
+            {'row': 0, 'column': 0, 'operation': 'mark_cell'}, format='json')
+        data = json.loads(spectator.get(f'/api/v1/spectate/{token}/').content)
+        self.assertEqual(data['display_board'][0][0], '!')
+
+        response = self.client.delete(self.share_url)
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(spectator.get(f'/api/v1/spectate/{token}/').status_code, 404)
+
+    def test_events(self):
+        token = self.client.post(self.share_url).data['share_token']
+        response = APIClient().get(f'/api/v1/spectate/{token}/events/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        content = b''.join(response.streaming_content)
+        seq, message = broadcast.get_backend().get(broadcast.board_channel(self.board.pk))
+        self.assertEqual(content, b'id: %d\ndata: %s\n\n' % (seq, message))
+        # clients that already have the latest message only get new messages
+        response = APIClient().get(f'/api/v1/spectate/{token}/events/', HTTP_LAST_EVENT_ID=str(seq))
+        self.assertEqual(b''.join(response.streaming_content), b'')
+
+    def test_events_limit(self):
+        token = self.client.post(self.share_url).data['share_token']
+        with override_settings(MINESWEEPER_SPECTATOR_MAX_STREAMS=0):
+            response = APIClient().get(f'/api/v1/spectate/{token}/events/')
+            self.assertEqual(b''.join(response.streaming_content), b'retry: 15000\n\n')
+        response = APIClient().get(f'/api/v1/spectate/{token}/events/')
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'id: '))
+        self.assertEqual(api.spectator_streams.count, 0)
+
+    def test_spectate_unknown_token(self):
+        self.assertEqual(APIClient().get('/api/v1/spectate/unknown/').status_code, 404)
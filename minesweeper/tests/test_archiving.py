@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import datetime
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from .. import analysis
+from .. import anticheat
+from .. import archiving
+from .. import minesweeper
+from .. import models
+
+from . import factories
+
+
+EMPTY = minesweeper.CellType.EMPTY
+BOMB = minesweeper.CellType.BOMB
+
+
+class TestArchiving(TestCase):
+    def setUp(self):
+        self.user = factories.UserFactory()
+        self.old = timezone.now() - datetime.timedelta(days=40)
+
+    def create_board(self, finished=False, won=False, modified=None):
+        board = models.Board.objects.create(rows=1, columns=2, mines=1, user=self.user,
+            board_json=[[EMPTY, BOMB]])
+        if finished:
+            board.reveal_cell(0, 0 if won else 1)
+        models.Board.objects.filter(pk=board.pk).update(modified=modified or timezone.now())
+        return models.Board.objects.get(pk=board.pk)
+
+    def test_archive_finished_boards(self):
+        won = self.create_board(finished=True, won=True, modified=self.old)
+        lost = self.create_board(finished=True, modified=self.old)
+        recent = self.create_board(finished=True)
+        active = self.create_board(modified=self.old)
+
+        count = archiving.archive_finished_boards(datetime.timedelta(days=30), batch_size=1)
+        self.assertEqual(count, 2)
+        self.assertEqual(set(models.Board.objects.values_list('pk', flat=True)), {recent.pk, active.pk})
+
+        archived = models.ArchivedBoard.objects.get(board_id=won.pk)
+        self.assertTrue(archived.won)
+        self.assertEqual(archived.user, self.user)
+        self.assertEqual(archived.modified, won.modified)
+        self.assertEqual(archived.get_board_json(), won.board_json)
+        self.assertFalse(models.ArchivedBoard.objects.get(board_id=lost.pk).won)
+
+    def test_archive_history_and_analysis(self):
+        board = self.create_board(finished=True, won=True, modified=self.old)
+        anticheat.analyze_finished_boards(workers=0, delay=datetime.timedelta(0))
+        without_moves = models.Board.objects.create(rows=1, columns=2, mines=1, user=self.user,
+            board_json=[[EMPTY, BOMB]], finished=True)
+        models.Board.objects.filter(pk=without_moves.pk).update(modified=self.old)
+
+        archiving.archive_finished_boards(datetime.timedelta(days=30))
+        self.assertFalse(models.BoardMove.objects.exists())
+        self.assertFalse(models.BoardAnalysis.objects.exists())
+
+        archived = models.ArchivedBoard.objects.get(board_id=board.pk)
+        game = archived.get_game()
+        self.assertEqual(game['layout'], minesweeper.encode_board([[EMPTY, BOMB]]))
+        self.assertEqual([move[:3] for move in game['moves']], [['reveal_cell', 0, 0]])
+        self.assertEqual(analysis.analyze_game(game)['moves'], 1)
+        self.assertEqual(archived.analysis['moves'], 1)
+        self.assertFalse(archived.suspicious)
+
+        archived = models.ArchivedBoard.objects.get(board_id=without_moves.pk)
+        self.assertIsNone(archived.get_game())
+        self.assertIsNone(archived.analysis)
+
+    def test_archive_boards_command(self):
+        self.create_board(finished=True, won=True, modified=self.old)
+        call_command('archive_boards', days=30, stdout=io.StringIO())
+        self.assertFalse(models.Board.objects.exists())
+        self.assertEqual(models.ArchivedBoard.objects.count(), 1)
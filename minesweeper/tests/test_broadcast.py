@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from .. import broadcast
+
+
+class BroadcastBackendTests:
+    def test_publish(self):
+        self.assertIsNone(self.backend.get('channel'))
+        self.assertEqual(self.backend.publish('channel', b'first'), 1)
+        self.assertEqual(self.backend.publish('channel', b'second'), 2)
+        self.assertEqual(self.backend.get('channel'), (2, b'second'))
+        self.assertIsNone(self.backend.get('other'))
+
+    def test_wait(self):
+        self.backend.publish('channel', b'first')
+        self.assertEqual(self.backend.wait('channel', 0, 0.1), (1, b'first'))
+        self.assertIsNone(self.backend.wait('channel', 1, 0.1))
+
+    def test_wait_fan_out(self):
+        self.backend.publish('channel', b'first')
+        results = []
+        waiters = [threading.Thread(target=lambda: results.append(self.backend.wait('channel', 1, 5)))
+            for i in range(5)]
+        for waiter in waiters:
+            waiter.start()
+        self.backend.publish('channel', b'second')
+        for waiter in waiters:
+            waiter.join()
+        self.assertEqual(results, [(2, b'second')] * 5)
+
+
+class TestLocalBroadcastBackend(BroadcastBackendTests, TestCase):
+    def setUp(self):
+        self.backend = broadcast.LocalBroadcastBackend()
+
+    def test_expire_channels(self):
+        self.now = 0.0
+        self.backend.timer = lambda: self.now
+        self.backend.publish('old', b'message')
+        self.now = 3000.0
+        self.backend.publish('recent', b'message')
+        self.now = 4000.0
+        self.backend.publish('new', b'message')
+        self.assertIsNone(self.backend.get('old'))
+        self.assertEqual(self.backend.get('recent'), (1, b'message'))
+        self.assertEqual(list(self.backend._channels), ['recent', 'new'])
+
+    def test_keep_channels_with_waiters(self):
+        self.now = 0.0
+        self.backend.timer = lambda: self.now
+        self.backend.publish('channel', b'first')
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(self.backend.wait('channel', 1, 5)))
+        waiter.start()
+        while not self.backend._channels['channel'].waiters:
+            time.sleep(0.01)
+        self.now = 10000.0
+        self.backend.publish('other', b'message')
+        self.backend.publish('channel', b'second')
+        waiter.join()
+        self.assertEqual(results, [(2, b'second')])
+        self.assertEqual(self.backend._channels['channel'].waiters, 0)
+
+
+class TestCacheBroadcastBackend(BroadcastBackendTests, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.backend = broadcast.CacheBroadcastBackend()
+        self.backend.poll_interval = 0.01
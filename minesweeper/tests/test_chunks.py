@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+
+from .. import chunks
+from .. import minesweeper
+from .. import models
+
+from . import factories
+
+
+class TestChunkedBoard(TestCase):
+    def test_generate_chunk_deterministic(self):
+        chunk = chunks.generate_chunk(7, 3, -2, 16, 0.2)
+        self.assertEqual(chunk, chunks.generate_chunk(7, 3, -2, 16, 0.2))
+        self.assertNotEqual(chunk, chunks.generate_chunk(8, 3, -2, 16, 0.2))
+        self.assertEqual(len(chunk), 16)
+        self.assertTrue(any(minesweeper.CellType.BOMB in row for row in chunk))
+
+    def test_origin_without_mines(self):
+        board = chunks.ChunkedBoard(1, 0.9, 4)
+        for row in (-1, 0, 1):
+            for column in (-1, 0, 1):
+                self.assertFalse(board.has_bomb(row, column))
+
+    def test_chunks_loaded_lazily(self):
+        loaded = []
+
+        def loader(keys):
+            loaded.extend(keys)
+            return {}
+
+        board = chunks.ChunkedBoard(1, 0.2, 8, loader=loader)
+        board.mark_cell(-100, 1000)
+        self.assertEqual(loaded, [(-13, 125)])
+        self.assertEqual(board.changed_chunks, {(-13, 125)})
+        self.assertEqual(board.display_chunk((-13, 125))[4][0], '!')
+
+    def test_reveal(self):
+        board = chunks.ChunkedBoard(3, 0.15, 8)
+        revealed = board.reveal(0, 0)
+        self.assertGreater(revealed, 0)
+        self.assertTrue(board.is_revealed(0, 0))
+        self.assertEqual(board.display_cell(0, 0), '0')
+        self.assertEqual(board.reveal(0, 0), 0)
+
+    def test_reveal_limit(self):
+        board = chunks.ChunkedBoard(3, 0.01, 8)
+        self.assertEqual(board.reveal(0, 0, max_cells=50), 50)
+
+    def test_reveal_mine(self):
+        board = chunks.ChunkedBoard(3, 0.5, 8)
+        row, column = next((row, column) for row in range(8) for column in range(8) if board.has_bomb(row, column))
+        with self.assertRaises(minesweeper.MineExplossionError):
+            board.reveal(row, column)
+        self.assertEqual(board.display_cell(row, column), 'X')
+
+    def test_wrong_density(self):
+        with self.assertRaises(ValueError):
+            chunks.ChunkedBoard(1, 0, 8)
+
+
+class TestInfiniteBoardModel(TestCase):
+    def test_chunks_stored(self):
+        board = models.InfiniteBoard.objects.create(user=factories.UserFactory(), density=0.2, chunk_size=8)
+        board.reveal_cell(0, 0)
+        board.mark_cell(100, -100)
+        self.assertEqual(board.version, 2)
+        stored = set(board.chunks.values_list('row', 'column'))
+        self.assertIn((12, -13), stored)
+        self.assertIn((0, 0), stored)
+
+        board = models.InfiniteBoard.objects.get(pk=board.pk)
+        engine = board.get_chunked_board()
+        self.assertTrue(engine.is_revealed(0, 0))
+        self.assertTrue(engine.is_type(100, -100, minesweeper.CellType.FLAG))
+        self.assertGreater(board.revealed, 0)
+
+        # changed chunks are updated, not duplicated
+        board.mark_cell(100, -100)
+        self.assertEqual(board.chunks.filter(row=12, column=-13).count(), 1)
+
+    def test_viewport_chunks(self):
+        board = models.InfiniteBoard(density=0.2, chunk_size=8)
+        self.assertEqual(board.viewport_chunks(-1, 0, 2, 9), [(-1, 0), (-1, 1), (0, 0), (0, 1)])
+        self.assertEqual(len(board.viewport_chunks(0, 0, 64, 64, limit=64)), 64)
+        with self.assertRaises(ValueError):
+            board.viewport_chunks(0, 0, 3_000_000, 3_000_000, limit=64)
+
+
+class TestInfiniteBoardApi(TestCase):
+    def setUp(self):
+        self.user = factories.UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_play(self):
+        response = self.client.post('/api/v1/infinite-boards/', {'density': 0.2}, format='json')
+        self.assertEqual(response.status_code, 201)
+        url = f"/api/v1/infinite-boards/{response.data['id']}/"
+
+        response = self.client.put(url, {'row': 0, 'column': 0, 'operation': 'reveal_cell'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(response.data['revealed'], 0)
+        self.assertIn({'row': 0, 'column': 0}, [
+            {'row': chunk['row'], 'column': chunk['column']} for chunk in response.data['chunks']])
+
+        response = self.client.get(f'{url}chunks/', {'row': -10, 'column': -10, 'height': 20, 'width': 60})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(chunk['row'], chunk['column']) for chunk in response.data],
+            [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 0), (0, 1)])
+        origin = next(chunk for chunk in response.data if chunk['row'] == 0 and chunk['column'] == 0)
+        self.assertEqual(len(origin['display']), 32)
+        self.assertEqual(origin['display'][0][0], '0')
+
+    def test_undo(self):
+        board = models.InfiniteBoard.objects.create(user=self.user)
+        response = self.client.put(f'/api/v1/infinite-boards/{board.pk}/', {'operation': 'undo'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('operation', response.data)
+
+    def test_finished_board(self):
+        board = models.InfiniteBoard.objects.create(user=self.user, finished=True)
+        for operation in ['reveal_cell', 'mark_cell']:
+            response = self.client.put(f'/api/v1/infinite-boards/{board.pk}/',
+                {'row': 0, 'column': 0, 'operation': operation}, format='json')
+            self.assertEqual(response.status_code, 400)
+        board.refresh_from_db()
+        self.assertEqual(board.revealed, 0)
+        self.assertFalse(board.chunks.exists())
+
+    def test_wrong_density(self):
+        response = self.client.post('/api/v1/infinite-boards/', {'density': 1}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_viewport_limit(self):
+        board = models.InfiniteBoard.objects.create(user=self.user)
+        response = self.client.get(f'/api/v1/infinite-boards/{board.pk}/chunks/', {'height': 10000, 'width': 10000})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(f'/api/v1/infinite-boards/{board.pk}/chunks/', {'height': 2000, 'width': 2000})
+        self.assertEqual(response.status_code, 400)
+
+    def test_other_user(self):
+        board = models.InfiniteBoard.objects.create(user=factories.UserFactory())
+        self.assertEqual(self.client.get(f'/api/v1/infinite-boards/{board.pk}/chunks/').status_code, 404)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from .. import db
+
+
+class TestConnectionHealthChecks(TestCase):
+    def test_unusable_connection_closed(self):
+        connection.ensure_connection()
+        with mock.patch.object(connection, 'is_usable', return_value=False), \
+                mock.patch.object(connection, 'close') as close:
+            db.check_connections()
+            close.assert_not_called()
+            with override_settings(MINESWEEPER_DB_HEALTH_CHECKS=True):
+                db.check_connections()
+            close.assert_called_once_with()
+
+    @override_settings(MINESWEEPER_DB_HEALTH_CHECKS=True)
+    def test_usable_connection_kept(self):
+        connection.ensure_connection()
+        with mock.patch.object(connection, 'close') as close:
+            db.check_connections()
+        close.assert_not_called()
+
+
+class TestStatementTimeout(TestCase):
+    def _connection(self, vendor: str) -> mock.Mock:
+        return mock.Mock(vendor=vendor, cursor=mock.MagicMock())
+
+    @override_settings(MINESWEEPER_DB_STATEMENT_TIMEOUT=5000)
+    def test_postgresql(self):
+        postgresql = self._connection('postgresql')
+        db.set_statement_timeout(sender=None, connection=postgresql)
+        postgresql.cursor.return_value.__enter__.return_value.execute.assert_called_once_with(
+            'SET statement_timeout = %s', [5000])
+
+        sqlite = self._connection('sqlite')
+        db.set_statement_timeout(sender=None, connection=sqlite)
+        sqlite.cursor.assert_not_called()
+
+    def test_disabled(self):
+        postgresql = self._connection('postgresql')
+        db.set_statement_timeout(sender=None, connection=postgresql)
+        with override_settings(MINESWEEPER_DB_STATEMENT_TIMEOUT=0):
+            db.set_statement_timeout(sender=None, connection=postgresql)
+        postgresql.cursor.assert_not_called()
+
+
+class TestHealthView(TestCase):
+    def test_healthy(self):
+        response = self.client.get('/health/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': 'ok', 'databases': {'default': True}})
+
+    def test_database_error(self):
+        with mock.patch.object(db, 'database_status', return_value={'default': False}):
+            response = self.client.get('/health/')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['status'], 'error')
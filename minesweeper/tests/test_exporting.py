@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import csv
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from .. import anticheat
+from .. import exporting
+from .. import models
+
+from . import factories
+
+
+class TestExporting(TestCase):
+    def setUp(self):
+        self.boards = [factories.BoardModelFactory() for i in range(3)]
+        self.boards[0].reveal_cell(0, 0)
+
+    def test_iter_board_records(self):
+        records = list(exporting.iter_board_records(models.Board.objects.all(), chunk_size=2))
+        self.assertEqual([record['id'] for record in records], sorted(board.pk for board in self.boards))
+        record = records[0]
+        self.assertEqual(tuple(record), exporting.EXPORT_FIELDS)
+        board = models.Board.objects.get(pk=record['id'])
+        self.assertEqual(record['username'], board.user.username)
+        self.assertEqual(record['board_json'], board.board_json)
+        self.assertEqual(record['finished'], board.finished)
+
+    def test_export_jsonl(self):
+        lines = list(exporting.export_boards(models.Board.objects.all(), 'jsonl'))
+        self.assertEqual(len(lines), 3)
+        records = [json.loads(line) for line in lines]
+        self.assertEqual(records[0]['board_json'], models.Board.objects.get(pk=records[0]['id']).board_json)
+
+    def test_export_csv(self):
+        lines = list(exporting.export_boards(models.Board.objects.all(), 'csv'))
+        self.assertEqual(len(lines), 4)
+        rows = list(csv.DictReader(io.StringIO(''.join(lines))))
+        board = models.Board.objects.get(pk=rows[0]['id'])
+        self.assertEqual(json.loads(rows[0]['board_json']), board.board_json)
+
+    def test_moves(self):
+        lines = list(exporting.export_boards(models.Board.objects.all(), 'jsonl', chunk_size=2, moves=True))
+        records = {record['id']: record for record in map(json.loads, lines)}
+        self.assertEqual(tuple(records[self.boards[0].pk]), exporting.export_fields(moves=True))
+        self.assertEqual([move[:3] for move in records[self.boards[0].pk]['moves']], [['reveal_cell', 0, 0]])
+        self.assertEqual(records[self.boards[1].pk]['moves'], [])
+
+        lines = list(exporting.export_boards(models.Board.objects.all(), 'csv', moves=True))
+        rows = list(csv.DictReader(io.StringIO(''.join(lines))))
+        self.assertEqual(json.loads(rows[0]['moves'])[0][:3], ['reveal_cell', 0, 0])
+
+    def test_archived_boards(self):
+        board = models.Board.objects.get(pk=self.boards[0].pk)
+        game, = anticheat.load_games([(board.pk, board.rows, board.columns, board.mines)])
+        models.ArchivedBoard.objects.bulk_create([models.ArchivedBoard.from_board(board, game),
+            models.ArchivedBoard.from_board(self.boards[1])])
+        lines = list(exporting.export_boards(models.ArchivedBoard.objects.all(), 'jsonl', moves=True))
+        records = [json.loads(line) for line in lines]
+        self.assertEqual([record['id'] for record in records], [board.pk, self.boards[1].pk])
+        self.assertEqual(records[0]['board_json'], board.board_json)
+        self.assertEqual(records[0]['username'], board.user.username)
+        self.assertEqual(records[0]['moves'], json.loads(json.dumps(game['moves'])))
+        self.assertIsNone(records[1]['moves'])
+
+    def test_export_boards_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'boards.jsonl')
+            call_command('export_boards', output=path, finished=True)
+            with open(path) as stream:
+                records = [json.loads(line) for line in stream]
+        self.assertEqual([record['id'] for record in records],
+            list(models.Board.objects.filter(finished=True).order_by('pk').values_list('pk', flat=True)))
+
+    def test_export_boards_command_stdout(self):
+        stdout = io.StringIO()
+        call_command('export_boards', format='csv', moves=True, stdout=stdout)
+        rows = list(csv.DictReader(io.StringIO(stdout.getvalue())))
+        self.assertEqual([int(row['id']) for row in rows], sorted(board.pk for board in self.boards))
+        self.assertIn('moves', rows[0])
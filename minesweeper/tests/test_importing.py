@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import io
+import os
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from .. import exporting
+from .. import importing
+from .. import minesweeper
+from .. import models
+
+from . import factories
+
+
+class TestImporting(TestCase):
+    def setUp(self):
+        self.boards = [factories.BoardModelFactory() for i in range(3)]
+        self.boards[0].reveal_cell(0, 0)
+
+    def export(self, format):
+        return ''.join(exporting.export_boards(models.Board.objects.all(), format))
+
+    def assertImported(self, records):
+        imported = models.Board.objects.exclude(pk__in=[board.pk for board in self.boards]).order_by('pk')
+        for record, board in zip(records, imported):
+            self.assertEqual(board.user.username, record['username'])
+            self.assertEqual(board.board_json, record['board_json'])
+            self.assertEqual(board.created.isoformat(), record['created'])
+            self.assertEqual(board.modified.isoformat(), record['modified'])
+            self.assertEqual(board.finished, record['finished'])
+
+    def test_import_jsonl(self):
+        records = list(exporting.iter_board_records(models.Board.objects.all()))
+        count = importing.import_boards(importing.read_jsonl(io.StringIO(self.export('jsonl'))), batch_size=2)
+        self.assertEqual(count, 3)
+        self.assertEqual(models.Board.objects.count(), 6)
+        self.assertImported(records)
+
+    def test_import_csv(self):
+        records = list(exporting.iter_board_records(models.Board.objects.all()))
+        count = importing.import_boards(importing.read_csv(io.StringIO(self.export('csv'))))
+        self.assertEqual(count, 3)
+        self.assertImported(records)
+
+    def test_import_creates_missing_users(self):
+        record = {'username': 'imported-user', 'rows': 5, 'columns': 6, 'mines': 4}
+        importing.import_boards([record])
+        board = models.Board.objects.get(user__username='imported-user')
+        self.assertFalse(board.user.has_usable_password())
+        # the layout is generated when the record does not have one
+        self.assertEqual(len(board.board_json), 5)
+        self.assertEqual(len(board.board_json[0]), 6)
+
+    def test_import_templates(self):
+        fixture = [
+            {"model": "minesweeper.boardtemplate", "pk": 1, "fields": {"rows": 8, "columns": 8, "mines": 10}},
+            {"rows": 16, "columns": 16, "mines": 40},
+        ]
+        self.assertEqual(importing.import_templates(fixture), 2)
+        self.assertEqual(importing.import_templates(fixture), 2)
+        self.assertEqual(models.BoardTemplate.objects.count(), 2)
+
+    def test_import_boards_command(self):
+        user = factories.UserFactory()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'boards.jsonl')
+            with open(path, 'w') as stream:
+                stream.write(self.export('jsonl'))
+            call_command('import_boards', path, user=user.username, stdout=io.StringIO())
+        self.assertEqual(user.minesweeper_boards.count(), 3)
+
+    def test_import_boards_command_stdin(self):
+        stdin = io.StringIO(self.export('jsonl'))
+        with mock.patch('sys.stdin', stdin):
+            call_command('import_boards', '-', stdout=io.StringIO())
+        self.assertFalse(stdin.closed)
+        self.assertEqual(models.Board.objects.count(), 6)
+
+    def test_save_updates_modified(self):
+        records = list(exporting.iter_board_records(models.Board.objects.all()))
+        importing.import_boards(records[:1])
+        board = models.Board.objects.latest('pk')
+        self.assertEqual(board.modified.isoformat(), records[0]['modified'])
+        board.mark_cell(0, 0)
+        board.refresh_from_db()
+        self.assertGreater(board.modified.isoformat(), records[0]['modified'])
+        self.assertEqual(board.created.isoformat(), records[0]['created'])
+
+    def test_save_keeps_supplied_layout(self):
+        BOMB = minesweeper.CellType.BOMB
+        EMPTY = minesweeper.CellType.EMPTY
+        layout = [[BOMB, EMPTY], [EMPTY, EMPTY]]
+        board = models.Board.objects.create(rows=2, columns=2, mines=1, board_json=layout,
+            user=self.boards[0].user)
+        self.assertEqual(models.Board.objects.get(pk=board.pk).board_json, layout)
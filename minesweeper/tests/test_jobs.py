@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import datetime
+import io
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from .. import jobs
+from .. import models
+
+from . import factories
+
+
+@jobs.task('test_add')
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+@jobs.task('test_fail')
+def fail():
+    raise RuntimeError("failed on purpose")
+
+
+@override_settings(MINESWEEPER_JOB_BACKEND='minesweeper.jobs.ImmediateJobBackend')
+class TestJobs(TestCase):
+    def test_submit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = jobs.submit('test_add', {'a': 1, 'b': 2})
+            # the job is sent to the backend when the transaction commits
+            self.assertEqual(job.status, models.JobStatus.PENDING)
+        job.refresh_from_db()
+        self.assertEqual(job.status, models.JobStatus.DONE)
+        self.assertEqual(job.result, 3)
+        self.assertIsNotNone(job.started)
+        self.assertIsNotNone(job.finished)
+
+    def test_failed_job(self):
+        with self.assertLogs('minesweeper.jobs', 'ERROR'), self.captureOnCommitCallbacks(execute=True):
+            job = jobs.submit('test_fail')
+        job.refresh_from_db()
+        self.assertEqual(job.status, models.JobStatus.FAILED)
+        self.assertEqual(job.error, "failed on purpose")
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            jobs.submit('unknown')
+
+    def test_run_once(self):
+        job = models.Job.objects.create(kind='test_add', params={'a': 1, 'b': 1})
+        self.assertEqual(jobs.run_job(job.pk).result, 2)
+        self.assertIsNone(jobs.run_job(job.pk))
+
+    @override_settings(MINESWEEPER_JOB_BACKEND='minesweeper.jobs.DatabaseJobBackend')
+    def test_run_jobs_command(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.submit('test_add', {'a': 1, 'b': 2})
+            jobs.submit('test_add', {'a': 2, 'b': 2})
+        self.assertEqual(models.Job.objects.filter(status=models.JobStatus.PENDING).count(), 2)
+        out = io.StringIO()
+        call_command('run_jobs', '--limit', '1', stdout=out)
+        self.assertIn("Ran 1 jobs", out.getvalue())
+        self.assertEqual(models.Job.objects.get(status=models.JobStatus.DONE).result, 3)
+        call_command('run_jobs', stdout=out)
+        call_command('run_jobs', stdout=out)
+        self.assertIn("No pending jobs", out.getvalue())
+        self.assertFalse(models.Job.objects.filter(status=models.JobStatus.PENDING).exists())
+
+    @override_settings(MINESWEEPER_JOB_TIMEOUT=60)
+    def test_stale_jobs(self):
+        started = timezone.now() - datetime.timedelta(seconds=120)
+        lost = models.Job.objects.create(kind='test_add', params={'a': 1, 'b': 2}, status=models.JobStatus.RUNNING,
+            started=started, attempts=1)
+        poisoned = models.Job.objects.create(kind='test_add', params={'a': 1, 'b': 2},
+            status=models.JobStatus.RUNNING, started=started, attempts=jobs.MAX_ATTEMPTS)
+        running = models.Job.objects.create(kind='test_add', params={'a': 1, 'b': 2},
+            status=models.JobStatus.RUNNING, started=timezone.now(), attempts=1)
+        with self.assertLogs('minesweeper.jobs', 'WARNING'):
+            self.assertEqual(jobs.run_pending_jobs(), 1)
+        lost.refresh_from_db()
+        self.assertEqual((lost.status, lost.result, lost.attempts), (models.JobStatus.DONE, 3, 2))
+        poisoned.refresh_from_db()
+        self.assertEqual(poisoned.status, models.JobStatus.FAILED)
+        self.assertIsNotNone(poisoned.finished)
+        running.refresh_from_db()
+        self.assertEqual(running.status, models.JobStatus.RUNNING)
+
+    def test_thread_backend(self):
+        backend = jobs.ThreadJobBackend()
+        with mock.patch.object(jobs, 'run_job') as run_job:
+            backend.enqueue(5)
+            backend._executor.shutdown(wait=True)
+        run_job.assert_called_once_with(5)
+
+
+@override_settings(MINESWEEPER_JOB_BACKEND='minesweeper.jobs.DatabaseJobBackend',
+    MINESWEEPER_ASYNC_BOARD_CELLS=100)
+class TestPendingBoards(TestCase):
+    def setUp(self):
+        self.user = factories.UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _create(self, rows: int, columns: int) -> dict:
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/v1/boards/', {'rows': rows, 'columns': columns, 'mines': 10})
+        self.assertEqual(response.status_code, 201)
+        return response.data
+
+    def test_small_board(self):
+        data = self._create(5, 5)
+        self.assertFalse(data['pending'])
+        self.assertIsNone(data['job'])
+        self.assertEqual(len(data['display_board']), 5)
+
+    def test_pending_board(self):
+        data = self._create(10, 10)
+        self.assertTrue(data['pending'])
+        self.assertIsNone(data['display_board'])
+        url = f"/api/v1/boards/{data['id']}/"
+        self.assertEqual(self.client.get(url).data['display_board'], None)
+        response = self.client.put(url, {'row': 0, 'column': 0, 'operation': 'reveal_cell'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(url + 'probabilities/').status_code, 409)
+        self.assertEqual(self.client.post(url + 'share/').status_code, 409)
+
+        job_url = f"/api/v1/jobs/{data['job']}/"
+        self.assertEqual(self.client.get(job_url).data['status'], models.JobStatus.PENDING)
+        self.assertEqual(jobs.run_pending_jobs(), 1)
+        response = self.client.get(job_url)
+        self.assertEqual(response.data['status'], models.JobStatus.DONE)
+        self.assertEqual(response.data['result'], {'board_id': data['id']})
+
+        response = self.client.get(url)
+        self.assertFalse(response.data['pending'])
+        self.assertEqual(len(response.data['display_board']), 10)
+        self.assertEqual(sum(map(sum, models.Board.objects.get(pk=data['id']).get_layout())), 10)
+        response = self.client.put(url, {'row': 0, 'column': 0, 'operation': 'mark_cell'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_deleted_board(self):
+        data = self._create(10, 10)
+        models.Board.objects.filter(pk=data['id']).delete()
+        with self.assertLogs('minesweeper.jobs', 'ERROR'):
+            jobs.run_pending_jobs()
+        job = models.Job.objects.get(pk=data['job'])
+        self.assertEqual(job.status, models.JobStatus.FAILED)
+        self.assertFalse(models.Board.objects.filter(pk=data['id']).exists())
+
+    def test_jobs_of_other_users(self):
+        data = self._create(10, 10)
+        self.assertEqual(len(self.client.get('/api/v1/jobs/').data), 1)
+        self.client.force_authenticate(factories.UserFactory())
+        self.assertEqual(self.client.get(f"/api/v1/jobs/{data['job']}/").status_code, 404)
+        self.assertEqual(self.client.get('/api/v1/jobs/').data, [])
@@ -274,3 +274,96 @@ class TestMineSweeper(TestCase):
             [BOMB,     BOMB,     EMPTY],
         ])
 
+    def test_display_board(self):
+        # test this board:
+        # EMPTY BOMB  EMPTY
+        # EMPTY EMPTY EMPTY
+        # EMPTY EMPTY EMPTY
+        self.full_board.board = [
+            [EMPTY, BOMB, EMPTY],
+            [EMPTY, EMPTY, EMPTY],
+            [EMPTY, EMPTY, EMPTY],
+        ]
+        self.assertEqual(self.full_board.get_display_board(), [[' '] * 3] * 3)
+        self.full_board.reveal(2, 0)
+        self.assertEqual(self.full_board.get_display_board(), [
+            [' ', ' ', ' '],
+            ['1', '1', '1'],
+            ['0', '0', '0'],
+        ])
+        self.full_board.mark_cell(0, 0)
+        self.full_board.mark_cell(0, 2)
+        self.full_board.mark_cell(0, 2)
+        self.assertEqual(self.full_board.get_display_board()[0], ['!', ' ', '?'])
+        self.assertRaises(minesweeper.MineExplossionError, self.full_board.reveal, 0, 1)
+        self.assertEqual(self.full_board.get_display_board(), [
+            ['!', '**', '?'],
+            ['1', '1', '1'],
+            ['0', '0', '0'],
+        ])
+
+    def test_display_board_reuses_unchanged_rows(self):
+        board = minesweeper.Board(10, 10, 10)
+        display = board.get_display_board()
+        row = next(row for row in range(10) if not board.has_bomb(row, 0))
+        board.mark_cell(row, 0)
+        new_display = board.get_display_board()
+        for check_row in range(10):
+            if check_row == row:
+                self.assertIsNot(new_display[check_row], display[check_row])
+                self.assertEqual(new_display[check_row][0], '!')
+            else:
+                self.assertIs(new_display[check_row], display[check_row])
+
+    def test_display_board_mine_changes(self):
+        self.full_board.board = [[EMPTY] * 3 for i in range(3)]
+        self.full_board.reveal_board()
+        self.assertEqual(self.full_board.get_display_board(), [['0'] * 3] * 3)
+        # adding a mine changes the counts of the adjacent rows
+        self.full_board.add_type(0, 0, BOMB)
+        self.assertEqual(self.full_board.get_display_board(), [
+            ['*', '1', '0'],
+            ['1', '1', '0'],
+            ['0', '0', '0'],
+        ])
+
+    def test_display_board_invalidate(self):
+        self.full_board.board = [[EMPTY] * 3 for i in range(3)]
+        self.full_board.get_display_board()
+        self.full_board.board[1][1] = CellType.FLAG
+        self.full_board.invalidate_display()
+        self.assertEqual(self.full_board.get_display_board()[1], [' ', '!', ' '])
+
+    def test_display_window(self):
+        board = minesweeper.Board(20, 30, 60)
+        board.reveal_board()
+        display = board.get_display_board()
+        expected = [row[5:15] for row in display[3:7]]
+        self.assertEqual(board.get_display_window(3, 5, 4, 10), expected)
+        board.invalidate_display()
+        self.assertEqual(board.get_display_window(3, 5, 4, 10), expected)
+        # the window is clipped to the board
+        self.assertEqual(board.clip_window(-2, 25, 5, 10), (0, 25, 3, 5))
+        self.assertEqual(board.get_display_window(-2, 25, 5, 10), [row[25:] for row in display[:3]])
+        self.assertEqual(board.get_display_window(30, 0, 5, 5), [])
+
+    def test_rle(self):
+        values = [0] * 600 + [1, 8, 8]
+        encoded = minesweeper.rle_encode(values)
+        self.assertEqual(encoded, bytes([255, 0, 255, 0, 90, 0, 1, 1, 2, 8]))
+        self.assertEqual(minesweeper.rle_decode(encoded), values)
+        self.assertEqual(minesweeper.rle_decode(b''), [])
+
+    def test_encode_board(self):
+        board = minesweeper.Board(30, 40, 100)
+        board.reveal_board()
+        board.mark_cell(0, 0)
+        encoded = minesweeper.encode_board(board.board)
+        self.assertEqual(minesweeper.decode_board(encoded, 30, 40), board.board)
+        self.assertRaises(ValueError, minesweeper.decode_board, encoded, 30, 30)
+
+    def test_encode_display_rle(self):
+        display = [[' ', '!', '0', '0'], ['**', '*', '1', '?']]
+        self.assertEqual(minesweeper.display_rows(display), [' !00', 'X*1?'])
+        encoded = minesweeper.encode_display_rle(display)
+        self.assertEqual(minesweeper.decode_display_rle(encoded, 4), [' !00', 'X*1?'])
@@ -1,8 +1,11 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import copy
+import io
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.db.utils import IntegrityError
 from django.db import transaction
 
@@ -137,3 +140,80 @@ class TestBoardModel(TestCase):
         board_model.reveal_cell(0, 0)
         self.assertTrue(board_model.finished)
 
+
+class TestPregeneratedBoardModel(TestCase):
+    def setUp(self):
+        self.user = factories.UserFactory()
+        self.template = models.BoardTemplate.objects.create(rows=8, columns=8, mines=10)
+
+    def test_refill_pool(self):
+        self.assertEqual(self.template.refill_pool(3), 3)
+        self.assertEqual(self.template.pregenerated_boards.count(), 3)
+        # the pool is already full
+        self.assertEqual(self.template.refill_pool(3), 0)
+        self.assertEqual(self.template.refill_pool(5), 2)
+        self.assertEqual(self.template.pregenerated_boards.count(), 5)
+
+    def test_take(self):
+        self.assertIsNone(models.PregeneratedBoard.objects.take(8, 8, 10))
+        self.template.refill_pool(1)
+        layout = self.template.pregenerated_boards.get().board_json
+        self.assertIsNone(models.PregeneratedBoard.objects.take(8, 8, 11))
+        self.assertEqual(models.PregeneratedBoard.objects.take(8, 8, 10), layout)
+        self.assertFalse(self.template.pregenerated_boards.exists())
+
+    def test_create_board_from_pool(self):
+        self.template.refill_pool(1)
+        layout = self.template.pregenerated_boards.get().board_json
+        board_model = models.Board.objects.create(rows=8, columns=8, mines=10, user=self.user)
+        self.assertEqual(board_model.board_json, layout)
+        self.assertFalse(self.template.pregenerated_boards.exists())
+        # with an empty pool the layout is generated on save
+        board_model = models.Board.objects.create(rows=8, columns=8, mines=10, user=self.user)
+        self.assertEqual(len(board_model.board_json), 8)
+
+    def test_refill_board_pool_command(self):
+        call_command('refill_board_pool', size=2, stdout=io.StringIO())
+        self.assertEqual(self.template.pregenerated_boards.count(), 2)
+
+class TestBoardProbabilities(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = factories.UserFactory()
+        EMPTY = minesweeper.CellType.EMPTY
+        BOMB = minesweeper.CellType.BOMB
+        self.board_model: models.Board = models.Board.objects.create(
+            rows=1, columns=3, mines=1, user=self.user)
+        self.board_model.board_json = [[EMPTY, BOMB, EMPTY]]
+        self.board_model.save()
+
+    def test_version(self):
+        version = self.board_model.version
+        self.board_model.mark_cell(0, 2)
+        self.assertEqual(self.board_model.version, version + 1)
+
+    def test_mine_probabilities(self):
+        self.board_model.reveal_cell(0, 0)
+        result = self.board_model.mine_probabilities()
+        self.assertEqual(result['version'], self.board_model.version)
+        self.assertEqual(result['cells'], [{'row': 0, 'column': 1, 'probability': 1.0}])
+        self.assertEqual(result['default_probability'], 0.0)
+        # the result is cached for the version of the board
+        self.board_model.board_json = [[minesweeper.CellType.REVEALED] * 3]
+        self.assertEqual(self.board_model.mine_probabilities(), result)
+
+@override_settings(MINESWEEPER_BOARD_STORAGE='rle')
+class TestBoardRleStorage(TestCase):
+    def test_rle_storage(self):
+        board_model: models.Board = factories.BoardModelFactory()
+        layout = board_model.board_json
+        self.assertIsInstance(layout, list)
+        stored = models.Board.objects.filter(pk=board_model.pk).values_list('board_json', flat=True).get()
+        self.assertEqual(stored, {'rle': minesweeper.encode_board(layout)})
+
+        board_model = models.Board.objects.get(pk=board_model.pk)
+        self.assertEqual(board_model.get_layout(), layout)
+        board_model.mark_cell(0, 0)
+        board_model = models.Board.objects.get(pk=board_model.pk)
+        self.assertTrue(board_model.get_minesweeper_board().is_marked(0, 0))
+        self.assertEqual(board_model.display_board()[0][0], '!')
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+
+from django.test import TestCase, override_settings
+
+from rest_framework.test import APIClient
+
+from .. import models
+from .. import replay
+
+from . import factories
+
+
+LAYOUT = [
+    [0, 0, 0, 0],
+    [0, 0, 0, 0],
+    [0, 0, 0, 1],
+]
+
+
+@override_settings(MINESWEEPER_CHECKPOINT_EVERY=3)
+class TestReplay(TestCase):
+    def setUp(self):
+        self.board = models.Board.objects.create(rows=3, columns=4, mines=1, user=factories.UserFactory(),
+            board_json=[list(row) for row in LAYOUT])
+        self.displays = [self.board.display_board()]
+        for column in range(4):
+            self.board.mark_cell(0, column)
+            self.displays.append(self.board.display_board())
+        self.board.reveal_cell(2, 0)
+        self.displays.append(self.board.display_board())
+
+    def test_history(self):
+        self.assertEqual(self.board.move_count, 5)
+        self.assertEqual(list(self.board.moves.values_list('number', 'operation')), [
+            (1, 'mark_cell'), (2, 'mark_cell'), (3, 'mark_cell'), (4, 'mark_cell'), (5, 'reveal_cell'),
+        ])
+        self.assertEqual(list(self.board.checkpoints.values_list('number', flat=True)), [0, 3])
+
+    def test_state_at(self):
+        for move, display in enumerate(self.displays):
+            self.assertEqual(replay.state_at(self.board, move).get_display_board(), display)
+        with self.assertRaises(ValueError):
+            replay.state_at(self.board, 6)
+
+    def test_iter_diffs(self):
+        diffs = list(replay.iter_diffs(self.board, 2))
+        self.assertEqual(diffs[0], {'move': 2, 'display_board': ['!!  ', '    ', '    ']})
+        self.assertEqual(diffs[1], {'move': 3, 'operation': 'mark_cell', 'row': 0, 'column': 2,
+            'cells': [[0, 2, '!']]})
+        self.assertEqual([diff['move'] for diff in diffs], [2, 3, 4, 5])
+        self.assertIn([2, 0, '0'], diffs[-1]['cells'])
+
+    def test_unsaved_moves(self):
+        board = models.Board.objects.get(pk=self.board.pk)
+        board.mark_cell(1, 0, save=False)
+        board.mark_cell(1, 1, save=False)
+        self.assertEqual(self.board.moves.count(), 5)
+        # the moves of a board lost before it was saved do not take the next numbers
+        board = models.Board.objects.get(pk=self.board.pk)
+        board.mark_cell(1, 0, save=False)
+        board.save_moves()
+        board.save()
+        self.assertEqual(list(self.board.moves.values_list('number', flat=True)), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(list(self.board.checkpoints.values_list('number', flat=True)), [0, 3, 6])
+
+    def test_board_without_moves(self):
+        board = factories.BoardModelFactory()
+        self.assertEqual(replay.state_at(board, 0).board, board.get_layout())
+
+
+class TestReplayApi(TestCase):
+    def setUp(self):
+        self.board = models.Board.objects.create(rows=3, columns=4, mines=1, user=factories.UserFactory(),
+            board_json=[list(row) for row in LAYOUT])
+        self.board.mark_cell(0, 0)
+        self.board.mark_cell(0, 1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.board.user)
+        self.url = f'/api/v1/boards/{self.board.pk}/replay/'
+
+    def test_state(self):
+        response = self.client.get(self.url, {'move': 1, 'display_format': 'rows'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'move': 1, 'move_count': 2, 'finished': False,
+            'display_board': ['!   ', '    ', '    ']})
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['move'], 2)
+
+    def test_wrong_move(self):
+        response = self.client.get(self.url, {'move': 3})
+        self.assertEqual(response.status_code, 400)
+
+    def test_stream(self):
+        response = self.client.get(self.url + 'stream/', {'start': 1})
+        self.assertEqual(response.status_code, 200)
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([line['move'] for line in lines], [1, 2])
+        self.assertEqual(lines[1]['cells'], [[0, 1, '!']])
+
+    def test_other_user(self):
+        self.client.force_authenticate(factories.UserFactory())
+        self.assertEqual(self.client.get(self.url).status_code, 404)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import io
+import json
+import logging
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from .. import schema
+
+
+class TestStaticSchema(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        settings = override_settings(MINESWEEPER_SCHEMA_DIR=self.directory)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        schema.load_schema.cache_clear()
+        self.addCleanup(schema.load_schema.cache_clear)
+
+    def test_command(self):
+        # the views are introspected without the errors drf_yasg logs
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        logging.getLogger('drf_yasg').addHandler(handler)
+        self.addCleanup(logging.getLogger('drf_yasg').removeHandler, handler)
+        out = io.StringIO()
+        call_command('build_api_schema', stdout=out)
+        self.assertEqual(records, [])
+        self.assertIn("swagger.json", out.getvalue())
+        document = json.loads((self.directory / 'swagger.json').read_text())
+        self.assertEqual(document['info']['title'], "MineSweeper API")
+        self.assertNotIn('host', document)
+        self.assertIn('/boards/{id}/', document['paths'])
+        self.assertEqual(document['paths']['/boards/{id}/']['parameters'][0]['type'], 'integer')
+        self.assertTrue((self.directory / 'swagger.yaml').exists())
+
+    def test_serves_file(self):
+        (self.directory / 'swagger.json').write_bytes(b'{"swagger": "2.0"}')
+        response = self.client.get('/swagger.json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'{"swagger": "2.0"}')
+        self.assertIn('max-age=3600', response['Cache-Control'])
+        response = self.client.get('/swagger.json', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_file(self):
+        with self.assertLogs('minesweeper.schema', 'WARNING'):
+            response = self.client.get('/swagger.yaml')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/yaml')
+        self.assertIn(b'MineSweeper API', response.content)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import io
+import random
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from .. import minesweeper
+from .. import models
+from .. import simulation
+from ..minesweeper import CellType
+
+
+BOMB = CellType.BOMB
+EMPTY = CellType.EMPTY
+
+
+class TestEngine(TestCase):
+    def setUp(self):
+        self.board = minesweeper.Board(3, 4, 1)
+        self.board.board = [
+            [EMPTY, EMPTY, EMPTY, EMPTY],
+            [EMPTY, EMPTY, EMPTY, EMPTY],
+            [EMPTY, EMPTY, EMPTY, BOMB],
+        ]
+
+    def test_seeded_boards(self):
+        first = minesweeper.Board(9, 9, 10, rng=random.Random(1))
+        second = minesweeper.Board(9, 9, 10, rng=random.Random(1))
+        self.assertEqual(first.board, second.board)
+
+    def test_count_adjacent_mines(self):
+        self.assertEqual(self.board.count_adjacent_mines(1, 2), 1)
+        self.assertEqual(self.board.count_adjacent_mines(0, 0), 0)
+
+    def test_reveal_returns_cells(self):
+        self.assertEqual(self.board.reveal(1, 3), [(1, 3)])
+        cells = self.board.reveal(0, 0)
+        self.assertEqual(len(cells), 10)
+        self.assertNotIn((1, 3), cells)
+        self.assertEqual(self.board.reveal(0, 0), [])
+        self.board.mark_cell(2, 3)
+        self.assertEqual(self.board.reveal(2, 3), [])
+
+    def test_is_finished(self):
+        self.board.reveal(1, 3)
+        self.assertFalse(self.board.is_finished())
+        self.board.reveal(0, 0)
+        self.assertTrue(self.board.is_finished())
+        # assigning the layout recounts the revealed cells
+        self.board.board = [[EMPTY] * 4, [EMPTY] * 4, [EMPTY, EMPTY, EMPTY, BOMB]]
+        self.assertFalse(self.board.is_finished())
+
+
+class TestSimulation(TestCase):
+    def test_reproducible(self):
+        self.assertEqual(simulation.play_game(9, 9, 10, 'rules', 'seed'),
+            simulation.play_game(9, 9, 10, 'rules', 'seed'))
+
+    def test_workers(self):
+        inline = simulation.simulate(9, 9, 10, 20, seed=3, workers=0)
+        pooled = simulation.simulate(9, 9, 10, 20, seed=3, workers=2)
+        self.assertEqual(inline.games, 20)
+        self.assertEqual(inline[:3], pooled[:3])
+
+    def test_strategies(self):
+        random_result = simulation.simulate(9, 9, 10, 100, 'random', workers=0)
+        rules_result = simulation.simulate(9, 9, 10, 100, 'rules', workers=0)
+        self.assertGreater(rules_result.wins, random_result.wins)
+        result = simulation.simulate(5, 5, 3, 5, 'probability', workers=0)
+        self.assertEqual(result.games, 5)
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            simulation.simulate(9, 9, 10, 1, 'cheat')
+
+
+class TestSimulateCommand(TestCase):
+    def test_templates(self):
+        models.BoardTemplate.objects.create(rows=9, columns=9, mines=10)
+        out = io.StringIO()
+        call_command('simulate_games', '--games', '5', '--workers', '0', stdout=out)
+        self.assertIn("9x9 (10 mines): won", out.getvalue())
+
+    def test_size(self):
+        out = io.StringIO()
+        call_command('simulate_games', '--rows', '5', '--columns', '5', '--mines', '3', '--games', '5',
+            '--workers', '0', stdout=out)
+        self.assertIn("5x5 (3 mines)", out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('simulate_games', '--rows', '5')
+        with self.assertRaises(CommandError):
+            call_command('simulate_games', '--rows', '5', '--columns', '5', '--mines', '3', '--games', '0')
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import itertools
+import random
+import time
+
+from django.test import TestCase
+
+from .. import minesweeper
+from .. import solver
+
+
+class TestSolver(TestCase):
+    def brute_force(self, display, mines):
+        "Computes the probabilities checking every layout of the hidden cells."
+        rows = len(display)
+        columns = len(display[0])
+        hidden = [(row, col) for row in range(rows) for col in range(columns)
+            if display[row][col] in solver.HIDDEN_CELLS]
+        counts = dict.fromkeys(hidden, 0)
+        total = 0
+        numbers = [(row, col, int(display[row][col])) for row in range(rows) for col in range(columns)
+            if display[row][col].isdigit()]
+        for layout in itertools.combinations(hidden, mines):
+            valid = all(
+                sum(1 for cell in layout if abs(cell[0] - row) <= 1 and abs(cell[1] - col) <= 1) == value
+                for row, col, value in numbers
+            )
+            if valid:
+                total += 1
+                for cell in layout:
+                    counts[cell] += 1
+        return {cell: count / total for cell, count in counts.items()}
+
+    def test_combinations(self):
+        self.assertEqual(solver.combinations(5, 2), 10)
+        self.assertEqual(solver.combinations(5, 0), 1)
+        self.assertEqual(solver.combinations(5, 6), 0)
+        self.assertEqual(solver.combinations(5, -1), 0)
+
+    def test_single_constraint(self):
+        probabilities, default = solver.mine_probabilities([['1', ' ', ' ']], 1)
+        self.assertEqual(probabilities, {(0, 1): 1.0})
+        self.assertEqual(default, 0.0)
+
+    def test_shared_constraint(self):
+        probabilities, default = solver.mine_probabilities([
+            ['1', ' '],
+            [' ', ' '],
+        ], 1)
+        self.assertEqual(set(probabilities), {(0, 1), (1, 0), (1, 1)})
+        for probability in probabilities.values():
+            self.assertAlmostEqual(probability, 1 / 3)
+
+    def test_cells_outside_frontier(self):
+        probabilities, default = solver.mine_probabilities([[' ', '1', ' ', ' ']], 2)
+        self.assertEqual(probabilities, {(0, 0): 0.5, (0, 2): 0.5})
+        self.assertEqual(default, 1.0)
+
+    def test_flags_are_hidden_cells(self):
+        probabilities, default = solver.mine_probabilities([['1', '!', '?']], 1)
+        self.assertEqual(probabilities, {(0, 1): 1.0})
+        self.assertEqual(default, 0.0)
+
+    def test_inconsistent_display(self):
+        self.assertEqual(solver.mine_probabilities([['2', ' ']], 2), ({}, 0.0))
+
+    def test_against_brute_force(self):
+        random.seed(1)
+        for i in range(10):
+            board = minesweeper.Board(5, 5, 4)
+            safe_cells = [(row, col) for row in range(5) for col in range(5) if not board.has_bomb(row, col)]
+            for row, col in random.sample(safe_cells, 3):
+                board.reveal(row, col)
+            display = board.get_display_board()
+            if board.is_finished():
+                continue
+            expected = self.brute_force(display, board.mines)
+            probabilities, default = solver.mine_probabilities(display, board.mines)
+            for cell, probability in expected.items():
+                self.assertAlmostEqual(probabilities.get(cell, default), probability)
+
+    def test_component_longer_than_recursion_limit(self):
+        # a row of numbers over a hidden row with a mine every third column
+        columns = 3000
+        mines = [column % 3 == 1 for column in range(columns)]
+        numbers = [str(sum(mines[max(column - 1, 0):column + 2])) for column in range(columns)]
+        probabilities, default = solver.mine_probabilities([numbers, [' '] * columns], sum(mines))
+        self.assertEqual(len(probabilities), columns)
+        for column, has_mine in enumerate(mines):
+            self.assertEqual(probabilities[(1, column)], float(has_mine))
+
+    def test_approximation(self):
+        # without steps the components are approximated, the decided cells are exact
+        display = [
+            ['1', ' ', ' '],
+            ['1', '1', ' '],
+            [' ', ' ', ' '],
+        ]
+        probabilities, default = solver.mine_probabilities([['1', ' ', ' ']], 1, max_steps=0)
+        self.assertEqual(probabilities, {(0, 1): 1.0})
+        self.assertEqual(solver.mine_probabilities(display, 1, max_steps=0), solver.mine_probabilities(display, 1))
+        with self.assertRaises(solver.StepLimitExceeded):
+            solver.mine_probabilities(display, 1, max_steps=0, approximate=False)
+
+    def test_expert_boards_time(self):
+        # mid game boards of 16x30 with 99 mines, some of them have frontiers
+        # too big to enumerate in time
+        for seed in range(20):
+            rng = random.Random(seed)
+            board = minesweeper.Board(16, 30, 99, rng=rng)
+            safe_cells = [(row, col) for row in range(16) for col in range(30) if not board.has_bomb(row, col)]
+            for row, col in rng.sample(safe_cells, rng.randint(15, 40)):
+                board.reveal(row, col)
+            if board.is_finished():
+                continue
+            start = time.perf_counter()
+            probabilities, default = solver.mine_probabilities(board.get_display_board(), board.mines)
+            self.assertLess(time.perf_counter() - start, 0.5, f"seed {seed}")
+            self.assertTrue(probabilities)
+            self.assertTrue(all(0 <= probability <= 1 for probability in probabilities.values()))
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import io
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from rest_framework.test import APIClient
+
+from .. import startup
+
+from . import factories
+
+
+OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     django.utils.version
+import time:       300 |        420 |   django.utils
+import time:       500 |        920 | django
+import time:        80 |         80 | rest_framework
+"""
+
+
+class TestStartup(TestCase):
+    def test_parse_import_times(self):
+        imports = startup.parse_import_times(OUTPUT)
+        self.assertEqual(imports[0], startup.ImportTime('django.utils.version', 120, 120))
+        self.assertEqual(len(imports), 4)
+        report = startup.StartupReport(0.5, imports)
+        self.assertEqual(report.packages(), {'django': 920, 'rest_framework': 80})
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('startup_report', '--api-only', '--limit', '3', stdout=out)
+        self.assertIn("Started in", out.getvalue())
+        self.assertIn("django", out.getvalue())
+
+
+@override_settings(ROOT_URLCONF='minesweeper_django.api_urls')
+class TestApiOnlyUrls(TestCase):
+    def test_urls(self):
+        client = APIClient()
+        client.force_authenticate(factories.UserFactory())
+        self.assertEqual(client.get('/api/v1/boards/').status_code, 200)
+        self.assertEqual(client.get('/health/').status_code, 200)
+        self.assertEqual(client.get('/admin/').status_code, 404)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import datetime
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+from .. import models
+from .. import stats
+
+from . import factories
+
+
+LAYOUT = [
+    [0, 0, 0, 0],
+    [0, 0, 0, 0],
+    [0, 0, 0, 1],
+]
+
+
+class TestStats(TestCase):
+    def setUp(self):
+        self.user = factories.UserFactory()
+
+    def _play(self, won: bool, practice: bool = False) -> models.Board:
+        board = models.Board.objects.create(rows=3, columns=4, mines=1, user=self.user,
+            board_json=[list(row) for row in LAYOUT], practice=practice)
+        # (2, 3) has the mine
+        board.reveal_cell(*((0, 0) if won else (2, 3)))
+        self.assertTrue(board.finished)
+        return board
+
+    def test_rollups(self):
+        self._play(True)
+        self._play(True)
+        self._play(False)
+        self._play(True)
+        player = stats.player_stats(self.user)
+        self.assertEqual((player.played, player.won, player.current_streak, player.best_streak), (4, 3, 1, 2))
+        self.assertEqual(player.last_finished, models.Board.objects.latest('finished_at').finished_at)
+        sizes = stats.size_stats(self.user)
+        self.assertEqual(len(sizes), 1)
+        self.assertEqual((sizes[0]['rows'], sizes[0]['played'], sizes[0]['won']), (3, 4, 3))
+        self.assertEqual(stats.size_stats()[0]['played'], 4)
+        self.assertEqual(models.DailyStats.objects.count(), 2)
+
+    def test_practice_boards(self):
+        self._play(True, practice=True)
+        self.assertEqual(models.DailyStats.objects.count(), 0)
+        self.assertEqual(stats.player_stats(self.user).played, 0)
+
+    def test_days(self):
+        models.DailyStats.objects.create(user=self.user, date=timezone.localdate() - datetime.timedelta(days=3),
+            rows=3, columns=4, mines=1, played=5, won=1, seconds=50.0)
+        self._play(True)
+        self.assertEqual(stats.size_stats(self.user, days=3)[0]['played'], 1)
+        self.assertEqual(stats.size_stats(self.user, days=4)[0]['played'], 6)
+
+    def test_rebuild(self):
+        for won in [True, False, True, True]:
+            self._play(won)
+        fields = ('user', 'date', 'rows', 'columns', 'mines', 'played', 'won')
+        daily = list(models.DailyStats.objects.order_by('user').values_list(*fields))
+        player = models.PlayerStats.objects.values_list('played', 'won', 'current_streak', 'best_streak').get()
+        out = io.StringIO()
+        call_command('rebuild_stats', stdout=out)
+        self.assertIn("4 games", out.getvalue())
+        self.assertEqual(list(models.DailyStats.objects.order_by('user').values_list(*fields)), daily)
+        self.assertEqual(models.PlayerStats.objects.values_list(
+            'played', 'won', 'current_streak', 'best_streak').get(), player)
+
+    def test_rebuild_with_archived_boards(self):
+        for won in [True, False, True, True]:
+            self._play(won)
+        self._play(True, practice=True)
+        fields = ('user', 'date', 'rows', 'columns', 'mines', 'played', 'won')
+        daily = list(models.DailyStats.objects.order_by('user').values_list(*fields))
+        player = models.PlayerStats.objects.values_list('played', 'won', 'current_streak', 'best_streak').get()
+        # the oldest games are archived, the streak goes through both tables
+        boards = list(models.Board.objects.order_by('finished_at'))
+        models.ArchivedBoard.objects.bulk_create(
+            [models.ArchivedBoard.from_board(board) for board in boards[:2] + boards[4:]])
+        models.Board.objects.filter(pk__in=[board.pk for board in boards[:2] + boards[4:]]).delete()
+        self.assertEqual(stats.rebuild_stats(), 4)
+        self.assertEqual(list(models.DailyStats.objects.order_by('user').values_list(*fields)), daily)
+        self.assertEqual(models.PlayerStats.objects.values_list(
+            'played', 'won', 'current_streak', 'best_streak').get(), player)
+
+
+class TestStatsApi(TestCase):
+    def setUp(self):
+        self.user = factories.UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_stats(self):
+        board = models.Board.objects.create(rows=3, columns=4, mines=1, user=self.user,
+            board_json=[list(row) for row in LAYOUT])
+        board.reveal_cell(0, 0)
+        response = self.client.get('/api/v1/stats/', {'days': 7})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['days'], 7)
+        self.assertEqual(response.data['player']['played'], 1)
+        self.assertEqual(response.data['player']['best_streak'], 1)
+        self.assertEqual(response.data['sizes'][0]['won'], 1)
+        self.assertEqual(response.data['global_sizes'][0]['played'], 1)
+
+    def test_without_games(self):
+        response = self.client.get('/api/v1/stats/')
+        self.assertEqual(response.data['player']['played'], 0)
+        self.assertEqual(response.data['sizes'], [])
+
+    def test_wrong_days(self):
+        self.assertEqual(self.client.get('/api/v1/stats/', {'days': 0}).status_code, 400)
+
+
+class TestStatsAdmin(TestCase):
+    def test_changelists(self):
+        superuser = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(superuser)
+        board = models.Board.objects.create(rows=3, columns=4, mines=1, user=superuser,
+            board_json=[list(row) for row in LAYOUT])
+        board.reveal_cell(0, 0)
+        self.assertEqual(self.client.get('/admin/minesweeper/dailystats/').status_code, 200)
+        self.assertEqual(self.client.get('/admin/minesweeper/playerstats/').status_code, 200)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from rest_framework.test import APIClient
+
+from .. import throttling
+
+from . import factories
+
+
+RATES = {'cell_update_user': '2/second', 'cell_update_board': '5/minute'}
+
+
+@override_settings(REST_FRAMEWORK={'DEFAULT_THROTTLE_RATES': RATES})
+class TestCellUpdateThrottle(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.board = factories.BoardModelFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(self.board.user)
+        self.url = f'/api/v1/boards/{self.board.pk}/'
+        self.now = 1000.0
+        patcher = mock.patch.object(throttling.TokenBucketThrottle, 'timer', lambda throttle: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def put(self):
+        return self.client.put(self.url, {'row': 0, 'column': 0, 'operation': 'mark_cell'}, format='json')
+
+    def test_user_bucket(self):
+        self.assertEqual(self.put().status_code, 200)
+        self.assertEqual(self.put().status_code, 200)
+        response = self.put()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '1')
+        self.now += 0.5
+        self.assertEqual(self.put().status_code, 200)
+        self.assertEqual(self.put().status_code, 429)
+
+    def test_board_bucket(self):
+        for i in range(5):
+            self.now += 1
+            self.assertEqual(self.put().status_code, 200)
+        self.now += 1
+        self.assertEqual(self.put().status_code, 429)
+        self.client.force_authenticate(factories.UserFactory())
+        self.assertEqual(self.put().status_code, 404)
+
+    def test_board_bucket_of_other_users(self):
+        # the requests of users who cannot update the board do not take its tokens
+        self.client.force_authenticate(factories.UserFactory())
+        for i in range(10):
+            self.now += 1
+            self.assertEqual(self.put().status_code, 404)
+        self.client.force_authenticate(self.board.user)
+        self.assertEqual(self.put().status_code, 200)
+
+    def test_board_bucket_not_charged_when_user_throttled(self):
+        self.assertEqual(self.put().status_code, 200)
+        self.assertEqual(self.put().status_code, 200)
+        for i in range(5):
+            self.assertEqual(self.put().status_code, 429)
+        self.now += 1
+        for i in range(2):
+            self.assertEqual(self.put().status_code, 200)
+        self.now += 1
+        self.assertEqual(self.put().status_code, 200)
+
+    def test_reads_are_not_throttled(self):
+        for i in range(5):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    @override_settings(REST_FRAMEWORK={'DEFAULT_THROTTLE_RATES': {**RATES, 'cell_update_user': None}})
+    def test_disabled(self):
+        for i in range(5):
+            self.assertEqual(self.put().status_code, 200)
+        self.assertEqual(self.put().status_code, 429)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import base64
+import time
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APIClient
+
+from .. import tokens
+
+from . import factories
+
+
+class TestTokens(TestCase):
+    def setUp(self):
+        self.board = factories.BoardModelFactory()
+        self.user = self.board.user
+        self.user.set_password('secret')
+        self.user.save()
+        self.client = APIClient()
+
+    def _token(self) -> str:
+        credentials = base64.b64encode(f'{self.user.username}:secret'.encode()).decode()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Basic {credentials}')
+        response = self.client.post('/api/v1/token/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('expires', response.data)
+        return response.data['token']
+
+    def test_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self._token()}')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/v1/boards/{self.board.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query for query in queries if 'auth_user' in query['sql']])
+        response = self.client.put(f'/api/v1/boards/{self.board.pk}/',
+            {'row': 0, 'column': 0, 'operation': 'mark_cell'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_other_user(self):
+        token, _expires = tokens.create_token(factories.UserFactory())
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(self.client.get(f'/api/v1/boards/{self.board.pk}/').status_code, 404)
+
+    def test_invalid_token(self):
+        token = self._token()
+        for header in [f'Bearer {token[:-1]}x', 'Bearer', f'Bearer {token} more']:
+            self.client.credentials(HTTP_AUTHORIZATION=header)
+            self.assertEqual(self.client.get('/api/v1/boards/').status_code, 403)
+
+    def test_expired_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self._token()}')
+        with mock.patch('time.time', return_value=time.time() + tokens.DEFAULT_TOKEN_MAX_AGE + 1):
+            self.assertEqual(self.client.get('/api/v1/boards/').status_code, 403)
+
+    def test_token_is_not_renewed_with_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self._token()}')
+        self.assertEqual(self.client.post('/api/v1/token/').status_code, 403)
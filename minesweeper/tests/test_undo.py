@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from django.test import TestCase, override_settings
+
+from rest_framework.test import APIClient
+
+from .. import minesweeper
+from .. import models
+from .. import replay
+
+from . import factories
+
+
+LAYOUT = [
+    [0, 0, 0, 0],
+    [0, 0, 0, 0],
+    [0, 0, 0, 1],
+]
+
+
+class TestEngineChanges(TestCase):
+    def test_restore(self):
+        board = minesweeper.Board(3, 4, 1)
+        board.board = [list(row) for row in LAYOUT]
+        display = board.get_display_board()
+        board.record_changes()
+        board.reveal(0, 0)
+        board.mark_cell(2, 3)
+        changes = board.recorded_changes()
+        # each changed cell is recorded once with its first value
+        self.assertEqual(len(changes), 3 * 12)
+        board.restore_changes(changes)
+        self.assertEqual(board.board, LAYOUT)
+        self.assertEqual(board.get_display_board(), display)
+        self.assertFalse(board.is_finished())
+
+
+class TestUndo(TestCase):
+    def setUp(self):
+        self.board = models.Board.objects.create(rows=3, columns=4, mines=1, user=factories.UserFactory(),
+            board_json=[list(row) for row in LAYOUT], practice=True)
+
+    def test_undo(self):
+        self.board.mark_cell(0, 0)
+        self.board.reveal_cell(1, 3)
+        self.assertEqual(self.board.undo(), 1)
+        self.assertEqual(self.board.display_board()[1][3], ' ')
+        self.assertEqual(self.board.display_board()[0][0], '!')
+        self.assertEqual(self.board.undo(5), 1)
+        self.assertEqual(self.board.get_layout(), LAYOUT)
+        self.assertEqual(self.board.undo(), 0)
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.move_count, 4)
+        self.assertEqual(self.board.undo_history, [])
+
+    def test_undo_explosion(self):
+        self.board.reveal_cell(2, 3)
+        self.assertTrue(self.board.finished)
+        self.board.undo()
+        self.assertFalse(self.board.finished)
+        self.assertIsNone(self.board.finished_at)
+        self.assertEqual(self.board.get_layout(), LAYOUT)
+
+    @override_settings(MINESWEEPER_UNDO_DEPTH=2)
+    def test_depth(self):
+        for column in range(3):
+            self.board.mark_cell(0, column)
+        self.assertEqual(len(self.board.undo_history), 2)
+        self.assertEqual(self.board.undo(3), 2)
+        self.assertEqual(self.board.display_board()[0], ['!', ' ', ' ', ' '])
+
+    def test_not_practice(self):
+        board = factories.BoardModelFactory()
+        board.mark_cell(0, 0)
+        self.assertEqual(board.undo_history, [])
+        with self.assertRaises(ValueError):
+            board.undo()
+
+    def test_replay(self):
+        displays = [self.board.display_board()]
+        self.board.mark_cell(0, 0)
+        displays.append(self.board.display_board())
+        self.board.reveal_cell(0, 3)
+        displays.append(self.board.display_board())
+        self.board.undo()
+        displays.append(self.board.display_board())
+        self.board.mark_cell(1, 1)
+        displays.append(self.board.display_board())
+        for move, display in enumerate(displays):
+            self.assertEqual(replay.state_at(self.board, move).get_display_board(), display)
+        diffs = list(replay.iter_diffs(self.board))
+        self.assertEqual(diffs[3]['operation'], 'undo')
+        self.assertEqual(len(diffs[3]['cells']), len(diffs[2]['cells']))
+        self.assertEqual(diffs[4]['cells'], [[1, 1, '!']])
+
+
+class TestUndoApi(TestCase):
+    def setUp(self):
+        self.user = factories.UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_practice_board(self):
+        response = self.client.post('/api/v1/boards/', {'rows': 3, 'columns': 4, 'mines': 1, 'practice': True},
+            format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.data['practice'])
+        url = f"/api/v1/boards/{response.data['id']}/"
+        self.client.put(url, {'row': 0, 'column': 0, 'operation': 'mark_cell'}, format='json')
+        response = self.client.put(url, {'operation': 'undo'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['display_board'][0][0], ' ')
+
+    def test_errors(self):
+        board = factories.BoardModelFactory(user=self.user)
+        url = f'/api/v1/boards/{board.pk}/'
+        response = self.client.put(url, {'operation': 'undo'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('operation', response.data)
+        response = self.client.put(url, {'row': 0, 'operation': 'reveal_cell'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('column', response.data)
@@ -0,0 +1,92 @@
+"""
+Token bucket throttles stored in the Django cache.
+
+A bucket holds as many requests as the count of the rate of its scope and is
+refilled at that rate, so clients can make short bursts but not exceed the
+rate for long. The rates are the `DEFAULT_THROTTLE_RATES` of the
+`REST_FRAMEWORK` setting in the format of DRF, for example `10/second`, and
+`None` disables the throttle of a scope.
+
+Each check is one cache read and, when the request is allowed, one cache
+write; the database is not used. Requests of the same bucket handled at the
+same time by different processes can take the same token, so the limit is
+approximate, like the limits of the DRF throttles.
+"""
+import math
+import time
+from typing import Optional, Tuple
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+class TokenBucketThrottle(BaseThrottle):
+    scope = ''
+    timer = time.time
+
+    def __init__(self):
+        try:
+            rate = api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(f"No throttle rate set for the scope '{self.scope}'")
+        self.capacity, self.refill = self.parse_rate(rate)
+        self.wait_seconds: Optional[float] = None
+
+    def parse_rate(self, rate: Optional[str]) -> Tuple[int, float]:
+        "Returns the capacity of the bucket and the tokens added each second."
+        if rate is None:
+            return 0, 0.0
+        count, period = rate.split('/')
+        return int(count), int(count) / PERIODS[period[0]]
+
+    def get_cache_key(self, request, view) -> Optional[str]:
+        "Returns the key of the bucket of the request, `None` to allow it."
+        raise NotImplementedError
+
+    def allow_request(self, request, view) -> bool:
+        if not self.capacity:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+        now = self.timer()
+        tokens, updated = cache.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - updated) * self.refill)
+        if tokens < 1:
+            self.wait_seconds = (1 - tokens) / self.refill
+            return False
+        # the bucket is full again when the key expires
+        cache.set(key, (tokens - 1, now), math.ceil(self.capacity / self.refill))
+        return True
+
+    def wait(self) -> Optional[float]:
+        return self.wait_seconds
+
+
+class UserCellUpdateThrottle(TokenBucketThrottle):
+    "Limits the cell updates of each user, or of each address for anonymous requests."
+    scope = 'cell_update_user'
+
+    def get_cache_key(self, request, view) -> Optional[str]:
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return f'minesweeper:throttle:{self.scope}:{ident}'
+
+
+class BoardCellUpdateThrottle(TokenBucketThrottle):
+    "Limits the cell updates of each board, shared by all the players of cooperative boards."
+    scope = 'cell_update_board'
+
+    def get_cache_key(self, request, view) -> Optional[str]:
+        pk = view.kwargs.get('pk')
+        if pk is None:
+            return None
+        return f'minesweeper:throttle:{self.scope}:{pk}'
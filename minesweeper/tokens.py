@@ -0,0 +1,69 @@
+"""
+Signed bearer tokens of the API.
+
+A token is the id of the user and the time it was issued, signed with HMAC
+using the `SECRET_KEY` of the project (`django.core.signing`). Checking a token
+only checks its signature and age: the user is not read from the database and
+no password is hashed, so clients calling the API often, like bots, should
+authenticate with a token instead of basic authentication.
+
+The request user of a token is an unsaved user instance with only its id, its
+other fields are not loaded. Tokens can not be revoked: they are valid until
+they expire, even when the user is deactivated or changes the password.
+Changing the `SECRET_KEY` invalidates all the tokens.
+"""
+import datetime
+from typing import Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+
+TOKEN_SALT = 'minesweeper.tokens'
+
+DEFAULT_TOKEN_MAX_AGE = 24 * 3600
+
+
+def token_max_age() -> int:
+    "Seconds a token is valid."
+    return getattr(settings, 'MINESWEEPER_TOKEN_MAX_AGE', DEFAULT_TOKEN_MAX_AGE)
+
+
+def create_token(user) -> Tuple[str, datetime.datetime]:
+    "Returns a new token of the user and its expiration date."
+    token = signing.dumps({'id': user.pk}, salt=TOKEN_SALT)
+    return token, timezone.now() + datetime.timedelta(seconds=token_max_age())
+
+
+def read_token(token: str) -> int:
+    """
+    Returns the id of the user of the token. Raises `signing.BadSignature`
+    when the token is not valid or expired.
+    """
+    return signing.loads(token, salt=TOKEN_SALT, max_age=token_max_age())['id']
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    "Authenticates the requests with an `Authorization: Bearer <token>` header."
+    keyword = b'bearer'
+
+    def authenticate(self, request):
+        header = get_authorization_header(request).split()
+        if not header or header[0].lower() != self.keyword:
+            return None
+        if len(header) != 2:
+            raise AuthenticationFailed(_("Invalid token header."))
+        try:
+            user_id = read_token(header[1].decode())
+        except (signing.BadSignature, UnicodeError, KeyError, TypeError):
+            raise AuthenticationFailed(_("Invalid or expired token."))
+        return get_user_model()(pk=user_id), header[1]
+
+    def authenticate_header(self, request) -> str:
+        return 'Bearer realm="api"'
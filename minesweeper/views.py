@@ -1,7 +1,18 @@
-from django.template.base import Template
-from django.views.generic import TemplateView
+from django.http import JsonResponse
+from django.views.generic import TemplateView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
 
+from . import db
+
 
 class IndexView(LoginRequiredMixin, TemplateView):
     template_name = 'minesweeper/index.html'
+
+
+class HealthView(View):
+    "Health check for load balancers. Answers 503 when a database does not answer a query."
+    def get(self, request, *args, **kwargs):
+        databases = db.database_status()
+        healthy = all(databases.values())
+        return JsonResponse({'status': 'ok' if healthy else 'error', 'databases': databases},
+            status=200 if healthy else 503)
@@ -0,0 +1,15 @@
+"""minesweeper_django URL Configuration of the API only profile
+
+Used when the `MINESWEEPER_API_ONLY` environment variable is 1. Only the game
+API and the health check are served, the web site, the admin and the API
+documentation are served by the processes started with the full profile.
+"""
+from django.urls import path, include
+
+from minesweeper.views import HealthView
+
+
+urlpatterns = [
+    path('api/v1/', include('minesweeper.apiurls')),
+    path('health/', HealthView.as_view(), name='health'),
+]
@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/3.1/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.1/ref/settings/
 """
+import os
 from pathlib import Path
 from django.urls import reverse_lazy
 
@@ -95,6 +96,51 @@ DATABASES = {
     }
 }
 
+# Production database, configured with environment variables. Without
+# MINESWEEPER_DB_NAME the SQLite database above is used.
+#
+# * MINESWEEPER_DB_NAME, MINESWEEPER_DB_USER, MINESWEEPER_DB_PASSWORD,
+#   MINESWEEPER_DB_HOST, MINESWEEPER_DB_PORT: PostgreSQL connection.
+# * MINESWEEPER_DB_CONN_MAX_AGE: seconds a connection is reused between
+#   requests (0 closes it after each request, empty keeps it open forever).
+#   Each process keeps its own connections, this is connection reuse and not
+#   pooling: use a pooler to share the connections between the processes.
+# * MINESWEEPER_DB_CONNECT_TIMEOUT: seconds to wait for a new connection.
+# * MINESWEEPER_DB_STATEMENT_TIMEOUT: milliseconds a query of the web server
+#   can run (0 disables it). The processes not started from wsgi.py or asgi.py,
+#   like migrate and the other management commands, have no limit.
+# * MINESWEEPER_DB_POOLER: set it to 1 when connecting through a transaction
+#   pooler like PgBouncer, server side cursors do not work with it. Poolers
+#   reject the startup options, so the statement timeout is set with a SET
+#   query when each connection is created (minesweeper.db).
+# * MINESWEEPER_DB_HEALTH_CHECKS: set it to 1 to check the reused connections
+#   at the start of the requests, which costs a query per request.
+if os.environ.get('MINESWEEPER_DB_NAME'):
+    _conn_max_age = os.environ.get('MINESWEEPER_DB_CONN_MAX_AGE', '600')
+    _statement_timeout = 0
+    if os.environ.get('MINESWEEPER_WEB_PROCESS') == '1':
+        _statement_timeout = int(os.environ.get('MINESWEEPER_DB_STATEMENT_TIMEOUT', '5000'))
+    _pooler = os.environ.get('MINESWEEPER_DB_POOLER') == '1'
+    _options = {'connect_timeout': int(os.environ.get('MINESWEEPER_DB_CONNECT_TIMEOUT', '5'))}
+    if not _pooler:
+        _options['options'] = '-c statement_timeout={}'.format(_statement_timeout)
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ['MINESWEEPER_DB_NAME'],
+            'USER': os.environ.get('MINESWEEPER_DB_USER', ''),
+            'PASSWORD': os.environ.get('MINESWEEPER_DB_PASSWORD', ''),
+            'HOST': os.environ.get('MINESWEEPER_DB_HOST', ''),
+            'PORT': os.environ.get('MINESWEEPER_DB_PORT', ''),
+            'CONN_MAX_AGE': int(_conn_max_age) if _conn_max_age else None,
+            'DISABLE_SERVER_SIDE_CURSORS': _pooler,
+            'OPTIONS': _options,
+        }
+    }
+    # milliseconds, set by minesweeper.db on the connections created through the pooler
+    MINESWEEPER_DB_STATEMENT_TIMEOUT = _statement_timeout if _pooler else 0
+    MINESWEEPER_DB_HEALTH_CHECKS = os.environ.get('MINESWEEPER_DB_HEALTH_CHECKS', '0') == '1'
+
 
 AUTHENTICATION_BACKENDS = (
     'django.contrib.auth.backends.ModelBackend',
@@ -112,6 +158,35 @@ ACCOUNT_EMAIL_VERIFICATION = 'none'
 ACCOUNT_LOGOUT_ON_GET = True
 
 
+# API only profile. With MINESWEEPER_API_ONLY=1 the process serves only the
+# game API at /api/v1/ and the health check at /health/, without the web site,
+# the admin, the accounts and the documentation, so it imports less code and
+# starts faster. Users authenticate with their username, the email login of
+# allauth is only available in the full profile. Migrations and the other
+# management commands should be run with the full profile.
+MINESWEEPER_API_ONLY = os.environ.get('MINESWEEPER_API_ONLY') == '1'
+if MINESWEEPER_API_ONLY:
+    INSTALLED_APPS = [
+        'django.contrib.auth',
+        'django.contrib.contenttypes',
+        'django.contrib.sessions',
+        'rest_framework',
+        'minesweeper',
+    ]
+    MIDDLEWARE = [
+        'django.middleware.security.SecurityMiddleware',
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+    ]
+    ROOT_URLCONF = 'minesweeper_django.api_urls'
+    AUTHENTICATION_BACKENDS = (
+        'django.contrib.auth.backends.ModelBackend',
+    )
+    # the index page is not served by this profile
+    LOGIN_REDIRECT_URL = '/'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
 
@@ -171,6 +246,97 @@ CREATE_REACT_APP = {
 }
 
 
+# The cell updates of the boards are throttled with token buckets stored in
+# the cache, per user and per board. The count of a rate is also the size of
+# the bursts allowed. Use a cache shared by all the processes in production.
+REST_FRAMEWORK = {
+    'DEFAULT_THROTTLE_RATES': {
+        'cell_update_user': '10/second',
+        'cell_update_board': '20/second',
+    },
+}
+
+
+# The user interfaces of the API documentation load the schema from the JSON
+# endpoint, served from the files of MINESWEEPER_SCHEMA_DIR outside debug mode.
+SWAGGER_SETTINGS = {
+    'SPEC_URL': '/swagger.json',
+}
+REDOC_SETTINGS = {
+    'SPEC_URL': '/swagger.json',
+}
+
+
+# Minesweeper
+
+# Count of pregenerated boards kept for each board template by the
+# `refill_board_pool` command.
+MINESWEEPER_BOARD_POOL_SIZE = 20
+
+# Finished boards not modified in this count of days are moved to the
+# archived boards table by the `archive_boards` command.
+MINESWEEPER_ARCHIVE_AFTER_DAYS = 30
+
+# Storage of the board cells: 'grid' keeps a list of rows in the JSON column,
+# 'rle' keeps the cells encoded as run lengths. Both can be read at any time.
+MINESWEEPER_BOARD_STORAGE = 'grid'
+
+# Backend used to fan out the updates of shared boards to spectators. Use
+# 'minesweeper.broadcast.CacheBroadcastBackend' with a shared cache when the
+# application runs in several processes.
+MINESWEEPER_BROADCAST_BACKEND = 'minesweeper.broadcast.LocalBroadcastBackend'
+
+# Seconds a spectator event stream is kept open before the client reconnects,
+# and count of streams a process keeps open at once. Each stream holds a
+# thread of the server.
+MINESWEEPER_SPECTATOR_STREAM_SECONDS = 300
+MINESWEEPER_SPECTATOR_MAX_STREAMS = 100
+
+# Cooperative boards are played through an in-process actor that keeps the
+# board in memory when MINESWEEPER_BOARD_ACTORS is enabled, which requires
+# routing all the requests for a board to the same process. Otherwise the
+# moves wait for the lock of the board row. The board of an actor is saved
+# every count of moves, every count of seconds with unsaved moves and when
+# the actor stops after the idle seconds or the process exits.
+MINESWEEPER_BOARD_ACTORS = False
+MINESWEEPER_ACTOR_SNAPSHOT_EVERY = 20
+MINESWEEPER_ACTOR_SNAPSHOT_SECONDS = 5
+MINESWEEPER_ACTOR_IDLE_SECONDS = 60
+
+# The moves of the boards are recorded with the state of the board every
+# count of moves, used as the starting point of the replays.
+MINESWEEPER_CHECKPOINT_EVERY = 50
+
+# The `analyze_boards` command flags finished games faster than this count of
+# moves per second or whose guesses had a lower probability of not failing.
+MINESWEEPER_ANALYSIS_MAX_CLICK_RATE = 10.0
+MINESWEEPER_ANALYSIS_MIN_SURVIVAL = 0.001
+
+# Count of moves of the practice boards that can be undone. The cells changed
+# by each move are kept in the board.
+MINESWEEPER_UNDO_DEPTH = 20
+
+# Seconds a token returned by /api/v1/token/ is valid. Tokens can not be
+# revoked, they are valid until they expire.
+MINESWEEPER_TOKEN_MAX_AGE = 24 * 3600
+
+# Directory of the OpenAPI schema written by the `build_api_schema` command.
+MINESWEEPER_SCHEMA_DIR = BASE_DIR / 'schema'
+
+# Backend running the jobs and count of threads of `ThreadJobBackend`. Use
+# 'minesweeper.jobs.DatabaseJobBackend' to run the jobs in a worker process
+# started with `run_jobs --loop`.
+MINESWEEPER_JOB_BACKEND = 'minesweeper.jobs.ThreadJobBackend'
+MINESWEEPER_JOB_WORKERS = 2
+
+# Seconds a job can run before `run_jobs` considers its worker lost and runs
+# it again. Keep it above the duration of the slowest job.
+MINESWEEPER_JOB_TIMEOUT = 600
+
+# Boards with this count of cells or more are created pending and their
+# layout is generated by a job.
+MINESWEEPER_ASYNC_BOARD_CELLS = 40_000
+
 
 try:
     from localsettings import *
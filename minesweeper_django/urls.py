@@ -13,30 +13,33 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include, re_path
 
 from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 
-from minesweeper.views import IndexView
+from minesweeper.views import HealthView, IndexView
 from minesweeper.api import SessionAuthentication, BasicAuthentication
+from minesweeper.schema import API_INFO, StaticSchemaView
 
 
 
 schema_view = get_schema_view(
-    openapi.Info(
-        title="MineSweeper API",
-        default_version='v1',
-        description="REST endpoint for playing minesweeper games",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="kverdecia@gmail.com"),
-        license=openapi.License(name="MIT License"),
-    ),
+    API_INFO,
     public=True,
     authentication_classes=(SessionAuthentication, BasicAuthentication)
 )
 
+# outside debug mode the schema is read from the files written by the
+# build_api_schema command and the pages of the user interfaces are cached.
+if settings.DEBUG:
+    schema_json_view = schema_view.without_ui(cache_timeout=0)
+    ui_cache_timeout = 0
+else:
+    schema_json_view = StaticSchemaView.as_view()
+    ui_cache_timeout = 24 * 3600
+
 
 
 urlpatterns = [
@@ -46,9 +49,10 @@ urlpatterns = [
     path('<int:boardId>', IndexView.as_view()),
     path('new', IndexView.as_view()),
     path('accounts/', include('allauth.urls')),
+    path('health/', HealthView.as_view(), name='health'),
 
 
-   re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-   re_path(r'^swagger/$', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-   re_path(r'^redoc/$', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+   re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_json_view, name='schema-json'),
+   re_path(r'^swagger/$', schema_view.with_ui('swagger', cache_timeout=ui_cache_timeout), name='schema-swagger-ui'),
+   re_path(r'^redoc/$', schema_view.with_ui('redoc', cache_timeout=ui_cache_timeout), name='schema-redoc'),
 ]
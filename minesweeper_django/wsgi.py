@@ -12,5 +12,7 @@ import os
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'minesweeper_django.settings')
+# the statement timeout only applies to the connections of the web server
+os.environ.setdefault('MINESWEEPER_WEB_PROCESS', '1')
 
 application = get_wsgi_application()